@@ -0,0 +1,402 @@
+"""
+Bounded in-process cache of live orchestrators, with Redis-lease ownership.
+
+Each worker keeps at most SWARM_SESSION_CACHE_SIZE sessions (least recently
+used are evicted first) and evicts sessions idle for SWARM_SESSION_IDLE_TTL
+seconds. Evicted sessions are flushed to Redis, so the next request reloads them.
+
+Ownership protocol (only when Redis is reachable):
+  session_owner:{id}    worker id of the single owner, with a short TTL that the
+                        owner renews every SESSION_RENEW_INTERVAL seconds
+  session_handoff:{id}  worker id asking the owner to hand the session over
+
+A worker that needs a session owned elsewhere posts a handoff request and waits.
+On its next tick the owner flushes the session, releases the lease and drops its
+copy; the requester then claims the lease and loads fresh state from Redis. A
+dead owner's lease simply expires. If the owner doesn't answer within
+SESSION_HANDOFF_TIMEOUT the requester takes the lease over, and the old owner
+drops its copy as soon as it notices the lease is gone.
+
+A session with a turn in flight (see in_turn) is never evicted or handed over;
+the handoff is answered on the first tick after the turn. Saves are fenced by
+owns(): a copy that lost its lease (forced takeover) must not overwrite the new
+owner's state. All Redis calls go through AsyncRedisClient: while Redis is
+down (or a lease command fails) the registry falls back to local-only ownership
+at once instead of waiting on the connection pool.
+"""
+import os
+import sys
+import time
+import uuid
+import socket
+import inspect
+import asyncio
+import logging
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, List
+
+logger = logging.getLogger(__name__)
+
+SWARM_SESSION_CACHE_SIZE = int(os.getenv("SWARM_SESSION_CACHE_SIZE", 500))
+SWARM_SESSION_IDLE_TTL = int(os.getenv("SWARM_SESSION_IDLE_TTL", 1800))
+SESSION_LEASE_TTL = int(os.getenv("SESSION_LEASE_TTL", 30))
+SESSION_RENEW_INTERVAL = float(os.getenv("SESSION_RENEW_INTERVAL", 5))
+SESSION_HANDOFF_TIMEOUT = float(os.getenv("SESSION_HANDOFF_TIMEOUT", 12))
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def lease_key(session_id: str) -> str:
+    return f"session_owner:{session_id}"
+
+
+def handoff_key(session_id: str) -> str:
+    return f"session_handoff:{session_id}"
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate memory held by a JSON-like structure (dicts, lists, scalars)"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "last_access", "lease_checked_at", "turns")
+
+    def __init__(self, value):
+        self.value = value
+        self.last_access = time.time()
+        self.lease_checked_at = time.time()
+        self.turns = 0  # turns in flight; a busy session is never evicted
+
+
+class SessionRegistry:
+    """
+    LRU/idle-bounded session cache. Values need `session_id` and `save_state_async()`;
+    an optional `memory_footprint()` feeds the memory metrics.
+
+    Behaves like a read-only dict for the debug endpoints (len, in, [], items).
+    """
+
+    def __init__(self, client=None, use_redis: bool = True, max_sessions: int = SWARM_SESSION_CACHE_SIZE,
+                 idle_ttl: float = SWARM_SESSION_IDLE_TTL, lease_ttl: int = SESSION_LEASE_TTL,
+                 renew_interval: float = SESSION_RENEW_INTERVAL,
+                 handoff_timeout: float = SESSION_HANDOFF_TIMEOUT, worker_id: str = WORKER_ID):
+        self._client = client
+        self._redis = None
+        self.use_redis = use_redis
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.lease_ttl = lease_ttl
+        self.renew_interval = renew_interval
+        self.handoff_timeout = handoff_timeout
+        self.worker_id = worker_id
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._counters = {
+            "loads": 0, "evicted_lru": 0, "evicted_idle": 0, "handed_off": 0,
+            "lost_ownership": 0, "handoffs_requested": 0, "forced_takeovers": 0
+        }
+
+    @property
+    def redis(self):
+        """AsyncRedisClient for the leases (wrapping an injected client); None keeps the registry local-only"""
+        if not self.use_redis:
+            return None
+        if self._redis is None:
+            try:
+                from app.services.redis_service import AsyncRedisClient, get_async_redis_client
+                self._redis = AsyncRedisClient(self._client) if self._client is not None else get_async_redis_client()
+            except Exception as e:
+                logger.error(f"Session registry Redis unavailable: {e}")
+                return None
+        return self._redis
+
+    async def _commands(self, queue: Callable[[Any], Any]) -> Optional[list]:
+        """
+        Send the commands queue(pipe) adds as one round-trip. None while Redis is
+        down or when they fail: callers then act as if there were no lease service.
+        """
+        redis = self.redis
+        pipe = redis.pipeline() if redis else None
+        if pipe is None:
+            return None
+        queue(pipe)
+        return await redis.execute(pipe)
+
+    # ------------------------------------------------------------------
+    # dict-like access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def __getitem__(self, session_id: str):
+        return self._entries[session_id].value
+
+    def items(self):
+        return [(sid, entry.value) for sid, entry in self._entries.items()]
+
+    # ------------------------------------------------------------------
+    # Acquire / insert / remove
+    # ------------------------------------------------------------------
+
+    async def acquire(self, session_id: str, loader: Callable[[str], Any]):
+        """
+        Return this worker's copy of a session, taking ownership (and loading it
+        from Redis with `loader`, sync or async) if needed. None if the session isn't stored anywhere.
+        """
+        await self._evict_idle()
+        entry = self._entries.get(session_id)
+        if entry:
+            if await self._confirm_lease(session_id, entry):
+                entry.last_access = time.time()
+                self._entries.move_to_end(session_id)
+                return entry.value
+            # Another worker owns it now and holds newer state
+            self._drop(session_id, "lost_ownership")
+
+        await self._claim(session_id)
+        value = loader(session_id)
+        if inspect.isawaitable(value):
+            value = await value
+        if value is None:
+            await self._release(session_id)
+            return None
+        self._counters["loads"] += 1
+        await self._insert(session_id, value)
+        return value
+
+    async def put(self, value):
+        """Register a session created on this worker."""
+        session_id = value.session_id
+        await self._commands(lambda pipe: pipe.set(lease_key(session_id), self.worker_id, ex=self.lease_ttl))
+        await self._insert(session_id, value)
+
+    async def remove(self, session_id: str):
+        """Forget a finished session and give up its lease (no flush)."""
+        if self._entries.pop(session_id, None) is not None:
+            await self._release(session_id)
+
+    @contextmanager
+    def in_turn(self, session_id: str):
+        """Mark a turn in flight: the session stays here (no eviction or handoff) until it ends."""
+        entry = self._entries.get(session_id)
+        if entry:
+            entry.turns += 1
+        try:
+            yield
+        finally:
+            if entry:
+                entry.turns -= 1
+                entry.last_access = time.time()
+
+    async def owns(self, session_id: str) -> bool:
+        """
+        Whether this worker may write the session's state: it holds the lease, or
+        nobody does (lapsed or released). False once another worker has taken it.
+        """
+        replies = await self._commands(lambda pipe: pipe.get(lease_key(session_id)))
+        if replies is None:
+            return True
+        return replies[0] is None or replies[0] == self.worker_id
+
+    # ------------------------------------------------------------------
+    # Periodic maintenance
+    # ------------------------------------------------------------------
+
+    async def tick(self):
+        """Evict idle sessions, renew leases and answer handoff requests."""
+        await self._evict_idle()
+        if not self._entries:
+            return
+        session_ids = list(self._entries)
+
+        def queue(pipe):
+            for session_id in session_ids:
+                pipe.get(lease_key(session_id))
+                pipe.get(handoff_key(session_id))
+
+        replies = await self._commands(queue)
+        if replies is None:
+            return
+
+        now = time.time()
+        for i, session_id in enumerate(session_ids):
+            entry = self._entries.get(session_id)
+            if entry is None:
+                continue
+            owner, requester = replies[2 * i], replies[2 * i + 1]
+            if owner is not None and owner != self.worker_id:
+                self._drop(session_id, "lost_ownership")
+            elif requester and requester != self.worker_id and not entry.turns:
+                # Requester clears the handoff key once it holds the lease
+                await self._evict(session_id, "handed_off")
+            elif owner is None:
+                # Lease lapsed but nobody claimed it; take it back
+                claimed = await self._commands(
+                    lambda pipe: pipe.set(lease_key(session_id), self.worker_id, nx=True, ex=self.lease_ttl))
+                if claimed is None:
+                    return
+                if claimed[0]:
+                    entry.lease_checked_at = now
+                else:
+                    self._drop(session_id, "lost_ownership")
+            else:
+                # Ours (a pending handoff waits for the turn in flight to finish)
+                if await self._commands(lambda pipe: pipe.expire(lease_key(session_id), self.lease_ttl)) is None:
+                    return
+                entry.lease_checked_at = now
+
+    def start_sweeper(self):
+        """Run tick() every renew interval on the current event loop (idempotent)."""
+        if self._sweeper and not self._sweeper.done():
+            return
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Session sweeper error: {e}")
+
+    async def flush_all(self):
+        """Persist and release every held session (worker shutdown)."""
+        for session_id in list(self._entries):
+            await self._evict(session_id, None)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        sessions: List[Dict[str, Any]] = []
+        for session_id, entry in self._entries.items():
+            footprint = getattr(entry.value, "memory_footprint", None)
+            sessions.append({
+                "session_id": session_id,
+                "approx_bytes": footprint() if callable(footprint) else None,
+                "idle_seconds": round(now - entry.last_access, 1)
+            })
+        sizes = [s["approx_bytes"] for s in sessions if s["approx_bytes"] is not None]
+        return {
+            "worker_id": self.worker_id,
+            "ownership": "redis_lease" if self.redis is not None and self.redis.healthy else "local_only",
+            "sessions": len(sessions),
+            "max_sessions": self.max_sessions,
+            "idle_ttl": self.idle_ttl,
+            "approx_bytes_total": sum(sizes),
+            "approx_bytes_per_session": round(sum(sizes) / len(sizes)) if sizes else 0,
+            "counters": dict(self._counters),
+            "per_session": sorted(sessions, key=lambda s: s["approx_bytes"] or 0, reverse=True)
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _insert(self, session_id: str, value):
+        self._entries[session_id] = _Entry(value)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            # Least recently used first; sessions mid-turn are skipped
+            victim = next((sid for sid, entry in self._entries.items() if not entry.turns and sid != session_id), None)
+            if victim is None:
+                break
+            await self._evict(victim, "evicted_lru")
+
+    async def _evict_idle(self):
+        if not self.idle_ttl:
+            return
+        cutoff = time.time() - self.idle_ttl
+        for session_id in [sid for sid, entry in self._entries.items() if entry.last_access < cutoff and not entry.turns]:
+            await self._evict(session_id, "evicted_idle")
+
+    async def _evict(self, session_id: str, reason: Optional[str]):
+        """Flush to Redis, give up the lease and drop the local copy."""
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return
+        try:
+            await entry.value.save_state_async()
+        except Exception as e:
+            logger.error(f"Failed to flush session {session_id} on eviction: {e}")
+        await self._release(session_id)
+        if reason:
+            self._counters[reason] += 1
+
+    def _drop(self, session_id: str, reason: str):
+        """Drop the local copy without flushing (another worker owns newer state)."""
+        if self._entries.pop(session_id, None) is not None:
+            self._counters[reason] += 1
+
+    async def _confirm_lease(self, session_id: str, entry: _Entry) -> bool:
+        if time.time() - entry.lease_checked_at < self.renew_interval:
+            return True
+        key = lease_key(session_id)
+        replies = await self._commands(lambda pipe: pipe.get(key))
+        if replies is None:
+            return True
+        owner = replies[0]
+        if owner is None:
+            claimed = await self._commands(lambda pipe: pipe.set(key, self.worker_id, nx=True, ex=self.lease_ttl))
+            if claimed is None:
+                return True
+            if not claimed[0]:
+                return False
+        elif owner != self.worker_id:
+            return False
+        else:
+            await self._commands(lambda pipe: pipe.expire(key, self.lease_ttl))
+        entry.lease_checked_at = time.time()
+        return True
+
+    async def _claim(self, session_id: str):
+        """Take the lease, asking the current owner to hand over first (local-only if Redis fails)."""
+        key = lease_key(session_id)
+        deadline = time.time() + self.handoff_timeout
+        requested = False
+        while True:
+            replies = await self._commands(
+                lambda pipe: pipe.set(key, self.worker_id, nx=True, ex=self.lease_ttl).get(key))
+            if replies is None:
+                return
+            claimed, owner = replies
+            if claimed:
+                break
+            if owner == self.worker_id:
+                await self._commands(lambda pipe: pipe.expire(key, self.lease_ttl))
+                break
+            if not requested:
+                self._counters["handoffs_requested"] += 1
+                requested = True
+                await self._commands(lambda pipe: pipe.set(handoff_key(session_id), self.worker_id, ex=self.lease_ttl))
+            if time.time() >= deadline:
+                logger.warning(f"Session {session_id}: owner did not hand over in time, taking over")
+                await self._commands(lambda pipe: pipe.set(key, self.worker_id, ex=self.lease_ttl))
+                self._counters["forced_takeovers"] += 1
+                break
+            # The owner answers on its next tick; nothing here blocks the event loop
+            await asyncio.sleep(min(0.1, self.renew_interval))
+        if requested:
+            await self.redis.compare_and_delete(handoff_key(session_id), self.worker_id)
+
+    async def _release(self, session_id: str):
+        if self.redis is not None:
+            await self.redis.compare_and_delete(lease_key(session_id), self.worker_id)
@@ -0,0 +1,125 @@
+"""
+Stage Graph - declarative dependency graph for per-turn agent execution.
+
+Each stage names the stages whose outputs it needs. Stages with no unmet
+dependencies run concurrently; a stage's gate can abort the whole turn and
+cancel any work still in flight.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class StageAborted(Exception):
+    """Raised when a stage gate rejects its output and the turn must stop."""
+    def __init__(self, stage: str, reason: str):
+        self.stage = stage
+        self.reason = reason
+        self.timings: Dict[str, Any] = {}
+        super().__init__(f"{stage}: {reason}")
+
+
+@dataclass
+class Stage:
+    """
+    A single node in the turn pipeline.
+
+    run receives the outputs of all completed stages (keyed by stage name).
+    gate, if set, inspects this stage's output and returns a reason string to abort.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    gate: Optional[Callable[[Any], Optional[str]]] = None
+
+
+class StageGraph:
+    """Executes a set of stages honoring their declared dependencies."""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {s.name: s for s in stages}
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage graph has a cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every stage and return {"outputs": {...}, "timings": {...}}.
+
+        Raises StageAborted (after cancelling in-flight stages) when a gate trips;
+        any other stage error cancels the remaining stages and propagates.
+        """
+        outputs: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        turn_start = time.perf_counter()
+
+        async def run_stage(stage: Stage):
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+            started = time.perf_counter()
+            output = await stage.run(outputs)
+            finished = time.perf_counter()
+            outputs[stage.name] = output
+            timings[stage.name] = {
+                "start_ms": round((started - turn_start) * 1000, 2),
+                "end_ms": round((finished - turn_start) * 1000, 2),
+                "duration_ms": round((finished - started) * 1000, 2)
+            }
+            if stage.gate:
+                reason = stage.gate(output)
+                if reason:
+                    raise StageAborted(stage.name, reason)
+            return output
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException as e:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            if isinstance(e, StageAborted):
+                e.timings = self.summarize(timings, turn_start)
+            raise
+
+        return {"outputs": outputs, "timings": self.summarize(timings, turn_start)}
+
+    def summarize(self, timings: Dict[str, Dict[str, float]], turn_start: float) -> Dict[str, Any]:
+        """Attach total wall time and the critical path (latest-finishing dependency chain)."""
+        critical_path: List[str] = []
+        if timings:
+            current = max(timings, key=lambda name: timings[name]["end_ms"])
+            while current:
+                critical_path.insert(0, current)
+                deps = [d for d in self.stages[current].depends_on if d in timings]
+                current = max(deps, key=lambda name: timings[name]["end_ms"]) if deps else None
+
+        return {
+            "stages": timings,
+            "total_ms": round((time.perf_counter() - turn_start) * 1000, 2),
+            "critical_path": critical_path
+        }
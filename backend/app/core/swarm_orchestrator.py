@@ -1,7 +1,9 @@
+import os
 import uuid
+import asyncio
 import logging
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable
 from datetime import datetime
 
 # Swarm Consolidated Agents
@@ -11,11 +13,20 @@ from ..engine.agents.evaluator import get_evaluator_agent
 from ..engine.agents.observer import get_observer_agent
 from ..engine.agents.critique import get_critique_agent
 from ..engine.agents.monitor import get_monitor_agent
-from ..engine.protocol.base import AgentContext
-from ..services.redis_service import get_redis_client
+from ..engine.protocol.base import AgentContext, ContextView
+from ..engine.protocol.context_window import ContextWindow
+from ..engine.intelligence.dispatch import get_intelligence_dispatch
+from .stage_graph import Stage, StageGraph, StageAborted
+from ..services.redis_service import get_redis_client, get_async_redis_client
+from ..services.session_store import SessionStore, legacy_key
+from .session_registry import SessionRegistry, deep_sizeof
 
 logger = logging.getLogger(__name__)
 
+# Speculative mode: reply with the Executioner draft immediately and let Critique
+# run afterwards, sending a correction only if it demands a fix.
+SPECULATIVE_CRITIQUE = os.getenv("SWARM_SPECULATIVE_CRITIQUE", "false").lower() == "true"
+
 class SwarmOrchestrator:
     """
     Optimized 6-Agent Swarm Orchestrator.
@@ -38,6 +49,10 @@ class SwarmOrchestrator:
         self.last_candidate_answer = None
         self.last_response = None
         self.redis = get_redis_client()
+        self.store = SessionStore(self.session_id)
+        self._amended_turns: set = set()
+        self._summary_task: Optional[asyncio.Task] = None
+        self._critique_tasks: set = set()
         
         # Agents
         self.strategy = get_strategy_agent()
@@ -68,63 +83,58 @@ class SwarmOrchestrator:
         # 2. Monitor: Audit Setup
         await self.monitor.process(self._build_context({"monitor_task": "health_check"}))
 
-        self.save_state()
+        await self.save_state_async()
         return {
             "session_id": self.session_id,
             "config": strategy_output.action_data
         }
 
-    async def process_candidate_input(self, text: str) -> Dict[str, Any]:
-        """Unified 6-Agent workflow for processing candidate responses."""
+    async def process_candidate_input(
+        self,
+        text: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_correction: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        speculative: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Unified 6-Agent workflow for processing candidate responses.
+        
+        on_token: if given, Executioner output is streamed chunk by chunk through it.
+        speculative: return the Executioner draft without waiting for Critique; Critique
+                     then runs in the background and on_correction fires only on a fix.
+        """
+        if speculative is None:
+            speculative = SPECULATIVE_CRITIQUE
+
         if not self.start_time:
             self.start_time = datetime.now()
             
         self.last_candidate_answer = text
-        self.context.history.append({"role": "candidate", "text": text, "timestamp": datetime.now().isoformat()})
-
-        # 1. Monitor: Decoding Signal
-        monitor_output = await self.monitor.process(self._build_context({
-            "monitor_task": "decode_input",
-            "raw_input": text
-        }))
-        
-        # 2. Observer: Security & Pattern Integrity
-        observer_output = await self.observer.process(self._build_context({
-            "security_check": True,
-            "last_input": text
-        }))
-        if not observer_output.action_data.get("safe", True):
-             return {"type": "security_alert", "message": observer_output.action_data.get("reason", "Security Alert")}
-
-        # 3. Evaluator: Deep Analysis
-        evaluator_output = await self.evaluator.process(self._build_context({
-            "evaluator_task": "evaluate_response",
-            "last_answer": text
-        }))
-
-        # 4. Strategy: Adaptive Trajectory
-        strategy_output = await self.strategy.process(self._build_context({
-            "strategy_task": "update_plan"
-        }))
-        self.current_phase = strategy_output.action_data.get("current_focus", self.current_phase)
+        self.context.add_turn({"role": "candidate", "text": text, "timestamp": datetime.now().isoformat()})
 
-        # 5. Executioner: Interaction Generation
-        executioner_output = await self.executioner.process(self._build_context({
-            "executioner_task": "speak",
-            "current_phase": self.current_phase
-        }))
-        proposed_text = executioner_output.action_data.get("text", "")
+        graph = StageGraph(self._build_turn_stages(text, on_token=on_token, include_critique=not speculative))
+        try:
+            run = await graph.run()
+        except StageAborted as e:
+            return {
+                "type": "security_alert",
+                "message": e.reason,
+                "stage_timings": e.timings
+            }
 
-        # 6. Critique: Quality Control
-        critique_output = await self.critique.process(self._build_context({
-            "proposed_action": proposed_text,
-            "subject_agent": "Executioner"
-        }))
-        final_text = critique_output.action_data.get("suggestion") if critique_output.action_data.get("fix_required") else proposed_text
+        outputs = run["outputs"]
+        evaluator_output = outputs["evaluator"]
+        self.current_phase = outputs["strategy"].action_data.get("current_focus", self.current_phase)
+        proposed_text = outputs["executioner"].action_data.get("text", "")
+        if speculative:
+            final_text = proposed_text
+        else:
+            critique_output = outputs["critique"]
+            final_text = critique_output.action_data.get("suggestion") if critique_output.action_data.get("fix_required") else proposed_text
 
         # Update Session State
         self.rounds_completed += 1
-        self.context.history.append({"role": "interviewer", "text": final_text, "timestamp": datetime.now().isoformat()})
+        self.context.add_turn({"role": "interviewer", "text": final_text, "timestamp": datetime.now().isoformat()})
         
         result = {
             "response": final_text,
@@ -134,22 +144,183 @@ class SwarmOrchestrator:
                 "rounds_completed": self.rounds_completed,
                 "total_rounds": self.total_rounds,
                 "percentage": (self.rounds_completed / self.total_rounds) * 100
-            }
+            },
+            "stage_timings": run["timings"]
         }
         self.last_response = result
-        self.save_state()
+        await self.save_state_async()
+        if speculative:
+            task = asyncio.create_task(self._speculative_critique(proposed_text, on_correction))
+            self._critique_tasks.add(task)
+            task.add_done_callback(self._critique_tasks.discard)
+        self._schedule_summary()
         return result
 
-    def _build_context(self, overrides: Dict[str, Any]) -> AgentContext:
-        """Helper for building fresh AgentContext."""
-        return AgentContext(
-            session_id=self.session_id,
-            metadata={**self.context.metadata, **overrides},
-            history=self.context.history
-        )
+    def _schedule_summary(self):
+        """Fold aged-out turns into the rolling context summary, off the request path"""
+        if self.context.window.summary_due(self.context.history) and (self._summary_task is None or self._summary_task.done()):
+            self._summary_task = asyncio.create_task(self._update_summary())
+
+    async def _update_summary(self):
+        try:
+            await self.context.window.summarize(self.context.history, self._generate_summary)
+            await self.save_state_async()
+        except Exception as e:
+            logger.error(f"Context summary update failed: {e}")
+
+    @staticmethod
+    async def _generate_summary(prompt: str) -> str:
+        return await get_intelligence_dispatch().generate_text(prompt, cache_category="context_summary")
+
+    async def _speculative_critique(
+        self,
+        draft: str,
+        on_correction: Optional[Callable[[Dict[str, Any]], Awaitable[None]]]
+    ):
+        """Audit an already-delivered draft and amend it only if Critique demands a fix."""
+        try:
+            critique_output = await self.critique.process(self._build_context({
+                "proposed_action": draft,
+                "subject_agent": "Executioner"
+            }))
+            suggestion = critique_output.action_data.get("suggestion")
+            if not critique_output.action_data.get("fix_required") or not suggestion or suggestion == draft:
+                return
+
+            # Amend the interviewer turn that carried the draft
+            history = self.context.history
+            for index in range(len(history) - 1, -1, -1):
+                turn = history[index]
+                if turn.get("role") == "interviewer":
+                    if turn.get("text") == draft:
+                        previous = dict(turn)
+                        turn["text"] = suggestion
+                        turn["corrected"] = True
+                        self.context.window.count_turn(turn, replaces=previous)
+                        self._amended_turns.add(index)
+                    break
+            if self.last_response and self.last_response.get("response") == draft:
+                self.last_response["response"] = suggestion
+            await self.save_state_async()
+
+            if on_correction:
+                await on_correction({
+                    "text": suggestion,
+                    "replaces": draft,
+                    "score": critique_output.action_data.get("score")
+                })
+        except Exception as e:
+            logger.error(f"Speculative critique failed: {e}")
+
+    def _build_turn_stages(
+        self,
+        text: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        include_critique: bool = True
+    ) -> List[Stage]:
+        """
+        Declarative DAG for one candidate turn.
+        Monitor, Observer and Evaluator only need the candidate text; Strategy only
+        reads session history, so all four start together. Executioner waits for the
+        Strategy focus and Critique audits the Executioner draft. Observer gates the
+        turn: an unsafe verdict cancels whatever downstream work is still in flight.
+        Streamed Executioner tokens are held back until Observer has passed the turn,
+        so nothing reaches the candidate for input that is then rejected.
+        """
+        held: List[str] = []
+        released = False
+
+        async def gated_token(chunk: str):
+            if released and not held:
+                await on_token(chunk)
+            else:
+                held.append(chunk)
+
+        async def release_tokens():
+            nonlocal released
+            # Tokens arriving while the backlog is flushed queue behind it, keeping order
+            while held:
+                await on_token(held.pop(0))
+            released = True
+
+        async def monitor(_):
+            # 1. Monitor: Decoding Signal
+            return await self.monitor.process(self._build_context({
+                "monitor_task": "decode_input",
+                "raw_input": text
+            }))
+
+        def observer_gate(output) -> Optional[str]:
+            if not output.action_data.get("safe", True):
+                return output.action_data.get("reason", "Security Alert")
+            return None
+
+        async def observer(_):
+            # 2. Observer: Security & Pattern Integrity
+            output = await self.observer.process(self._build_context({
+                "security_check": True,
+                "last_input": text
+            }))
+            if on_token and observer_gate(output) is None:
+                await release_tokens()
+            return output
+
+        async def evaluator(_):
+            # 3. Evaluator: Deep Analysis
+            return await self.evaluator.process(self._build_context({
+                "evaluator_task": "evaluate_response",
+                "last_answer": text
+            }))
+
+        async def strategy(_):
+            # 4. Strategy: Adaptive Trajectory
+            return await self.strategy.process(self._build_context({
+                "strategy_task": "update_plan"
+            }))
+
+        async def executioner(outputs):
+            # 5. Executioner: Interaction Generation
+            phase = outputs["strategy"].action_data.get("current_focus", self.current_phase)
+            context = self._build_context({
+                "executioner_task": "speak",
+                "current_phase": phase
+            })
+            if on_token:
+                return await self.executioner.stream(context, gated_token)
+            return await self.executioner.process(context)
+
+        async def critique(outputs):
+            # 6. Critique: Quality Control
+            return await self.critique.process(self._build_context({
+                "proposed_action": outputs["executioner"].action_data.get("text", ""),
+                "subject_agent": "Executioner"
+            }))
+
+        stages = [
+            Stage("monitor", monitor),
+            Stage("observer", observer, gate=observer_gate),
+            Stage("evaluator", evaluator),
+            Stage("strategy", strategy),
+            Stage("executioner", executioner, depends_on=["strategy"]),
+        ]
+        if include_critique:
+            stages.append(Stage("critique", critique, depends_on=["executioner"]))
+        return stages
+
+    def _build_context(self, overrides: Dict[str, Any]) -> ContextView:
+        """Per-call context: overrides layered over the session context, nothing copied or re-validated."""
+        return self.context.view(overrides)
 
     async def generate_final_report(self) -> Dict[str, Any]:
         """Generate summary report using Evaluator Agent."""
+        # The report reads the whole interview: let pending corrections land and
+        # bring the rolling summary up to date first
+        if self._critique_tasks:
+            await asyncio.gather(*self._critique_tasks, return_exceptions=True)
+        if self._summary_task and not self._summary_task.done():
+            await self._summary_task
+        if self.context.window.summary_due(self.context.history):
+            await self._update_summary()
         eval_output = await self.evaluator.process(self._build_context({
             "evaluator_task": "generate_report"
         }))
@@ -166,62 +337,130 @@ class SwarmOrchestrator:
         }))
         return result.action_data["text"]
 
+    def memory_footprint(self) -> int:
+        """Approximate bytes held by this session's own state (agents are shared singletons)."""
+        return deep_sizeof([self.context.metadata, self.context.history, self.last_response])
+
+    def _state_fields(self) -> Dict[str, Any]:
+        """Flat scalar state for the session hash; metadata keys get a "meta:" prefix."""
+        fields = {
+            "session_id": self.session_id,
+            "current_phase": self.current_phase,
+            "rounds_completed": self.rounds_completed,
+            "total_rounds": self.total_rounds,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "last_response": self.last_response,
+            "last_candidate_answer": self.last_candidate_answer,
+            "context_window": self.context.window.model_dump(),
+        }
+        for key, value in self.context.metadata.items():
+            fields[f"meta:{key}"] = value
+        return fields
+
+    def _apply_state(self, state: Dict[str, Any]):
+        self.current_phase = state.get("current_phase", "General Tech")
+        self.rounds_completed = state.get("rounds_completed", 0)
+        self.total_rounds = state.get("total_rounds", 5)
+        if state.get("start_time"):
+            self.start_time = datetime.fromisoformat(state["start_time"])
+        self.last_response = state.get("last_response")
+        self.last_candidate_answer = state.get("last_candidate_answer")
+        self.context.window = ContextWindow(**(state.get("context_window") or {}))
+
     def save_state(self):
-        """Persist state to Redis."""
+        """Persist what changed since the last save (see SessionStore). Sync; used on eviction."""
         try:
-            state = {
-                "session_id": self.session_id,
-                "current_phase": self.current_phase,
-                "rounds_completed": self.rounds_completed,
-                "total_rounds": self.total_rounds,
-                "start_time": self.start_time.isoformat() if self.start_time else None,
-                "last_response": self.last_response,
-                "last_candidate_answer": self.last_candidate_answer,
-                "context": self.context.metadata,
-                "history": self.context.history
-            }
-            self.redis.set(f"session:{self.session_id}", json.dumps(state))
+            if self.store.save(self._state_fields(), self.context.history, amended=self._amended_turns):
+                self._amended_turns.clear()
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
+    async def save_state_async(self):
+        """save_state over the async Redis pool, for request paths."""
+        try:
+            if not await _sessions.owns(self.session_id):
+                # Handed over mid-turn (forced takeover): the new owner's state wins
+                logger.warning(f"Session {self.session_id} is owned by another worker; not saving this copy")
+                return
+            amended = set(self._amended_turns)
+            if await self.store.save_async(self._state_fields(), self.context.history, amended=amended):
+                self._amended_turns -= amended
+        except Exception as e:
+            logger.error(f"Failed to save state: {e}")
+
+    @classmethod
+    def _from_store(cls, session_id: str, loaded) -> 'SwarmOrchestrator':
+        fields, history, store = loaded
+        orch = cls(session_id=session_id)
+        orch.store = store
+        orch._apply_state(fields)
+        orch.context.metadata = {
+            name[len("meta:"):]: value for name, value in fields.items() if name.startswith("meta:")
+        }
+        orch.context.history = history
+        return orch
+
+    @classmethod
+    def _from_legacy(cls, session_id: str, state: Any) -> 'SwarmOrchestrator':
+        """Sessions saved in the old single-key format (JSON string, encoded twice)"""
+        if isinstance(state, str):
+            state = json.loads(state)
+        orch = cls(session_id=session_id)
+        orch._apply_state(state)
+        orch.context.metadata = state.get("context", {})
+        orch.context.history = state.get("history", [])
+        return orch
+
     @classmethod
     def load_from_redis(cls, session_id: str) -> Optional['SwarmOrchestrator']:
         """Reconstruct from Redis."""
+        loaded = SessionStore.load(session_id)
+        if loaded:
+            return cls._from_store(session_id, loaded)
+
+        # Old single-key format: load once, then migrate
         redis = get_redis_client()
-        state_json = redis.get(f"session:{session_id}")
-        if not state_json:
+        state = redis.get(legacy_key(session_id))
+        if not state:
             return None
-        
-        state = json.loads(state_json)
-        orch = cls(session_id=session_id)
-        orch.current_phase = state.get("current_phase", "General Tech")
-        orch.rounds_completed = state.get("rounds_completed", 0)
-        orch.total_rounds = state.get("total_rounds", 5)
-        if state.get("start_time"):
-            orch.start_time = datetime.fromisoformat(state["start_time"])
-        orch.last_response = state.get("last_response")
-        orch.last_candidate_answer = state.get("last_candidate_answer")
-        orch.context.metadata = state.get("context", {})
-        orch.context.history = state.get("history", [])
+        orch = cls._from_legacy(session_id, state)
+        orch.save_state()
+        if orch.store.saves:
+            redis.delete(legacy_key(session_id))
         return orch
 
-# Session cache
-_sessions: Dict[str, SwarmOrchestrator] = {}
+    @classmethod
+    async def load_from_redis_async(cls, session_id: str) -> Optional['SwarmOrchestrator']:
+        """load_from_redis over the async Redis pool."""
+        loaded = await SessionStore.load_async(session_id)
+        if loaded:
+            return cls._from_store(session_id, loaded)
 
-def get_or_create_orchestrator(session_id: Optional[str] = None) -> SwarmOrchestrator:
+        redis = get_async_redis_client()
+        state = await redis.get(legacy_key(session_id))
+        if not state:
+            return None
+        orch = cls._from_legacy(session_id, state)
+        await orch.save_state_async()
+        if orch.store.saves:
+            await redis.delete(legacy_key(session_id))
+        return orch
+
+# Session cache: bounded per worker, one owning worker per live session (see SessionRegistry)
+_sessions = SessionRegistry()
+
+async def get_or_create_orchestrator(session_id: Optional[str] = None) -> SwarmOrchestrator:
     if session_id:
-        if session_id in _sessions:
-            return _sessions[session_id]
-        
-        orch = SwarmOrchestrator.load_from_redis(session_id)
+        orch = await _sessions.acquire(session_id, SwarmOrchestrator.load_from_redis_async)
         if orch:
-            _sessions[session_id] = orch
             return orch
     
     orch = SwarmOrchestrator(session_id=session_id)
-    _sessions[orch.session_id] = orch
+    await _sessions.put(orch)
     return orch
 
-def delete_session(session_id: str):
-    if session_id in _sessions:
-        del _sessions[session_id]
+async def delete_session(session_id: str):
+    await _sessions.remove(session_id)
+
+def get_session_registry() -> SessionRegistry:
+    return _sessions
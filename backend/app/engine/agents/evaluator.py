@@ -7,10 +7,14 @@ Responsible for:
 3. Post-interview synthesis and reporting
 """
 
+import os
 from ..protocol.base import BaseAgent, AgentContext, InferenceOutput
 from ..intelligence.dispatch import get_intelligence_dispatch
 from typing import Dict, Any, List, Optional
 
+# Token budget for the history section of this agent's prompt (see ContextWindow)
+REPORT_HISTORY_TOKENS = int(os.getenv("CONTEXT_BUDGET_REPORT", 3000))
+
 class EvaluatorAgent(BaseAgent):
     """
     The Evaluator scoring candidate responses and analyzing overall performance.
@@ -53,8 +57,8 @@ class EvaluatorAgent(BaseAgent):
         return f"Compare the JD and Resume. Calculate a match score.\nJD: {jd}\nResume: {resume}"
 
     def _build_synthesis_prompt(self, context: AgentContext) -> str:
-        history = context.history
-        return f"You are the Evaluator Agent. Synthesize the entire interview and provide a final report.\nHistory: {history}"
+        history = context.history_for_prompt(REPORT_HISTORY_TOKENS)
+        return f"You are the Evaluator Agent. Synthesize the entire interview and provide a final report.\nHistory:\n{history}"
 
 # Singleton
 _evaluator = None
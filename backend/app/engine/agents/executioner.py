@@ -9,7 +9,7 @@ Responsible for:
 
 from ..protocol.base import BaseAgent, AgentContext, InferenceOutput
 from ..intelligence.dispatch import get_intelligence_dispatch
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 
 class ExecutionerAgent(BaseAgent):
     """
@@ -35,7 +35,30 @@ class ExecutionerAgent(BaseAgent):
             prompt = self._build_dialogue_prompt(context)
             prompt += "\n\nCRITICAL: Respond in JSON: " + '{"thought": "...", "action_type": "speak", "action_data": {"text": "...", "transition": "...", "can_advance": true}}'
             
-        output = await self.intelligence_provider.generate_structured(prompt)
+        output = await self.intelligence_provider.generate_structured(prompt, cache_category="dialogue")
+        self._log_thought(context.session_id, output.thought)
+        return output
+
+    async def stream(self, context: AgentContext, on_token: Callable[[str], Awaitable[None]]) -> InferenceOutput:
+        """
+        Streaming 'speak': forwards each generated chunk to on_token as it arrives
+        and returns the assembled utterance in the usual InferenceOutput shape.
+        """
+        prompt = self._build_dialogue_prompt(context)
+        prompt += "\n\nCRITICAL: Respond with ONLY the words you say to the candidate. No JSON, no labels."
+
+        chunks = []
+        async for chunk in self.intelligence_provider.stream_text(prompt):
+            chunks.append(chunk)
+            await on_token(chunk)
+
+        text = "".join(chunks).strip()
+        output = InferenceOutput(
+            thought="Streamed dialogue generation.",
+            action_type="speak",
+            action_data={"text": text, "can_advance": True},
+            raw_response=text
+        )
         self._log_thought(context.session_id, output.thought)
         return output
 
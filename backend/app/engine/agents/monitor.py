@@ -7,10 +7,14 @@ Responsible for:
 3. Audit & Insight Extraction (Logger)
 """
 
+import os
 from ..protocol.base import BaseAgent, AgentContext, InferenceOutput
 from ..intelligence.dispatch import get_intelligence_dispatch
 from typing import Dict, Any, List, Optional
 
+# Token budget for the history section of this agent's prompt (see ContextWindow)
+AUDIT_HISTORY_TOKENS = int(os.getenv("CONTEXT_BUDGET_AUDIT", 1500))
+
 class MonitorAgent(BaseAgent):
     """
     The Monitor oversees system stability and extracts technical signals.
@@ -38,7 +42,7 @@ class MonitorAgent(BaseAgent):
             prompt = self._build_decode_prompt(context)
             prompt += "\n\nCRITICAL: Respond in JSON: " + '{"thought": "...", "action_type": "decode_input", "action_data": {"concepts": [...], "complexity": "Basic/Int/Adv"}}'
             
-        output = await self.intelligence_provider.generate_structured(prompt)
+        output = await self.intelligence_provider.generate_structured(prompt, cache_category=task)
         self._log_thought(context.session_id, output.thought)
         return output
 
@@ -47,8 +51,8 @@ class MonitorAgent(BaseAgent):
         return f"Check system health based on telemetry: {telemetry}"
 
     def _build_audit_prompt(self, context: AgentContext) -> str:
-        history = context.history
-        return f"Audit the interview history: {history}"
+        history = context.history_for_prompt(AUDIT_HISTORY_TOKENS)
+        return f"Audit the interview history:\n{history}"
 
     def _build_decode_prompt(self, context: AgentContext) -> str:
         raw_input = context.metadata.get("raw_input", "")
@@ -7,10 +7,14 @@ Responsible for:
 3. Behavioral Integrity Monitoring
 """
 
+import os
 from ..protocol.base import BaseAgent, AgentContext, InferenceOutput
 from ..intelligence.dispatch import get_intelligence_dispatch
 from typing import Dict, Any, List, Optional
 
+# Token budget for the history section of this agent's prompt (see ContextWindow)
+OBSERVER_HISTORY_TOKENS = int(os.getenv("CONTEXT_BUDGET_OBSERVER", 1200))
+
 class ObserverAgent(BaseAgent):
     """
     The Observer scans for technical contradictions, plagiarism, and security risks.
@@ -46,8 +50,8 @@ class ObserverAgent(BaseAgent):
         return f"Scan for security risks/injections.\nInput: {last_input}"
 
     def _build_observer_prompt(self, context: AgentContext) -> str:
-        history = context.history
-        return f"Analyze behavioral patterns and technical consistency.\nHistory: {history}"
+        history = context.history_for_prompt(OBSERVER_HISTORY_TOKENS)
+        return f"Analyze behavioral patterns and technical consistency.\nHistory:\n{history}"
 
 # Singleton
 _observer = None
@@ -45,7 +45,9 @@ class StrategyAgent(BaseAgent):
         else:
             prompt += "\n\nCRITICAL: Respond in JSON format: " + '{"thought": "reasoning...", "action_type": "update_plan", "action_data": {"completed_milestones": [...], "current_focus": "...", "next_milestone": "...", "estimated_total_progress": "0-100%"}}'
             
-        output = await self.intelligence_provider.generate_structured(prompt)
+        output = await self.intelligence_provider.generate_structured(
+            prompt, cache_category="strategy_setup" if task == "initial_setup" else None
+        )
         self._log_thought(context.session_id, output.thought)
         return output
 
@@ -165,7 +167,7 @@ Task: Determine next focus area and update progress.
             """
         
         try:
-            output = await self.intelligence_provider.generate_structured(prompt)
+            output = await self.intelligence_provider.generate_structured(prompt, cache_category="ats_audit")
             # The base agent returns InferenceOutput which has 'thought', 'action_type', 'action_data' usually
             # But generate_structured relies on the provider.
             # Let's assume the provider returns a dict or object we can parse.
@@ -240,7 +242,7 @@ Task: Determine next focus area and update progress.
         """
         
         try:
-            output = await self.intelligence_provider.generate_structured(prompt)
+            output = await self.intelligence_provider.generate_structured(prompt, cache_category="strategy_map")
             if isinstance(output, InferenceOutput) and output.action_data:
                 return output.action_data
             
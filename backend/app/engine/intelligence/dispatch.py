@@ -5,7 +5,9 @@ Standardizes outputs into the InferenceOutput model.
 """
 
 import json
-from typing import Dict, Optional, Any
+import asyncio
+import hashlib
+from typing import Dict, Optional, Any, AsyncIterator
 from ..protocol.base import InferenceOutput
 from ...llm.llm_router import get_llm_router
 
@@ -15,18 +17,64 @@ class IntelligenceDispatch:
     Ensures all responses are parsed into the standardized InferenceOutput format.
     """
     
-    def __init__(self):
-        self.router = get_llm_router()
+    def __init__(self, router=None):
+        self.router = router or get_llm_router()
+        # Single-flight: identical prompts already in flight share one LLM call
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.leader_calls = 0
+        self.coalesced_calls = 0
 
-    async def generate_structured(self, prompt: str, generation_config: Optional[Dict] = None) -> InferenceOutput:
+    async def generate_structured(self, prompt: str, generation_config: Optional[Dict] = None,
+                                  cache_category: Optional[str] = None) -> InferenceOutput:
         """
         Generates content and attempts to parse it into a structured InferenceOutput.
         If structured format is not enforced by the model, it uses a parser.
+        cache_category selects the response cache TTL; only categories with a TTL (ats_audit, strategy_*, health_check) are cached.
+        
+        Concurrent calls with an identical prompt and config wait on the first
+        caller's request instead of issuing their own; each gets its own copy.
         """
+        key = self._flight_key(prompt, generation_config, cache_category)
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leader_calls += 1
+            task = asyncio.ensure_future(self._generate_structured(prompt, generation_config, cache_category))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._land(key, done))
+        else:
+            self.coalesced_calls += 1
+        # Shield so one waiter being cancelled doesn't cancel the shared call for the rest
+        output = await asyncio.shield(task)
+        return output.model_copy(deep=True)
+
+    def get_flight_stats(self) -> Dict[str, Any]:
+        """Single-flight counters: how many generate_structured calls shared another's request"""
+        total = self.leader_calls + self.coalesced_calls
+        return {
+            "in_flight": len(self._in_flight),
+            "leader_calls": self.leader_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "coalesce_rate": round(self.coalesced_calls / total, 4) if total else 0.0
+        }
+
+    def _land(self, key: str, task: asyncio.Task):
+        """Drop a finished call from the in-flight table"""
+        self._in_flight.pop(key, None)
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _flight_key(prompt: str, generation_config, cache_category: Optional[str]) -> str:
+        payload = json.dumps([prompt, generation_config, cache_category], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _generate_structured(self, prompt: str, generation_config: Optional[Dict],
+                                   cache_category: Optional[str]) -> InferenceOutput:
         # Note: In a production version, we would use JSON mode or specific prompt engineering
         # to ensure the model returns { "thought": "...", "action_type": "...", "action_data": "..." }
         
-        response = self.router.generate_content(prompt, generation_config)
+        response = await self.router.generate_content_async(prompt, generation_config, cache_category=cache_category)
         raw_text = response.text.strip()
         
         try:
@@ -53,6 +101,20 @@ class IntelligenceDispatch:
             raw_response=raw_text
         )
 
+    async def generate_text(self, prompt: str, cache_category: Optional[str] = None) -> str:
+        """
+        Free-form generation returning plain text (no structured parsing, no single-flight).
+        """
+        response = await self.router.generate_content_async(prompt, cache_category=cache_category)
+        return response.text.strip()
+
+    async def stream_text(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Streams raw text chunks for free-form generations (no structured parsing).
+        """
+        async for chunk in self.router.generate_content_stream(prompt, generation_config):
+            yield chunk
+
 # Singleton
 _dispatch = None
 
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping
 from pydantic import BaseModel, Field
+from .context_window import ContextWindow
 
 class InferenceOutput(BaseModel):
     """
@@ -19,6 +22,38 @@ class AgentContext(BaseModel):
     session_id: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
     history: List[Dict[str, Any]] = Field(default_factory=list)
+    window: ContextWindow = Field(default_factory=ContextWindow)
+
+    def add_turn(self, turn: Dict[str, Any]):
+        """Append a turn to the history (and count it once for the window's metrics)"""
+        self.history.append(turn)
+        self.window.count_turn(turn)
+
+    def history_for_prompt(self, budget: int) -> str:
+        """Rolling summary + recent turns of the history, within `budget` tokens (see ContextWindow)"""
+        return self.window.render(self.history, budget)
+
+    def view(self, overrides: Optional[Dict[str, Any]] = None) -> 'ContextView':
+        """Read-only per-call context with `overrides` layered over metadata (nothing copied)"""
+        return ContextView(self, overrides or {})
+
+class ContextView:
+    """
+    What agents receive per call: the session's AgentContext plus call-specific
+    metadata, without validating or copying either. metadata is a read-only
+    ChainMap (overrides first), history and window are the session's own objects,
+    so reads see the live state and agents must not mutate them.
+    """
+    __slots__ = ("session_id", "metadata", "history", "window")
+
+    def __init__(self, context: AgentContext, overrides: Mapping[str, Any]):
+        self.session_id = context.session_id
+        self.metadata = MappingProxyType(ChainMap(overrides, context.metadata))
+        self.history = context.history
+        self.window = context.window
+
+    def history_for_prompt(self, budget: int) -> str:
+        return self.window.render(self.history, budget)
 
 class BaseAgent(ABC):
     """
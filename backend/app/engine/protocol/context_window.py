@@ -0,0 +1,165 @@
+"""
+Bounded conversation context for agent prompts.
+
+Prompts that used to embed the whole `context.history` (its Python repr) now get
+a window of it instead:
+
+  - the turns not yet summarized, verbatim (at least the last CONTEXT_RECENT_TURNS)
+  - a rolling summary of everything older, folded forward every
+    CONTEXT_SUMMARY_EVERY turns (an LLM call off the request path, with an
+    extractive fallback), so the summary is regenerated rarely and incrementally
+  - all of it trimmed to the token budget the prompt builder asks for
+
+The window state lives on AgentContext and is persisted with the session. It also
+counts the prompt tokens it saved against embedding the full history.
+"""
+import os
+import logging
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_RECENT_TURNS = int(os.getenv("CONTEXT_RECENT_TURNS", 6))
+CONTEXT_SUMMARY_EVERY = int(os.getenv("CONTEXT_SUMMARY_EVERY", 4))
+CONTEXT_SUMMARY_MAX_TOKENS = int(os.getenv("CONTEXT_SUMMARY_MAX_TOKENS", 400))
+# Words kept per turn by the extractive fallback summary
+CONTEXT_SUMMARY_TURN_WORDS = int(os.getenv("CONTEXT_SUMMARY_TURN_WORDS", 30))
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token for English and code)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _clip(text: str, tokens: int, keep: str = "head") -> str:
+    limit = max(0, tokens) * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    if keep == "tail":
+        return "..." + text[len(text) - limit + 3:] if limit > 3 else ""
+    return text[:limit - 3] + "..." if limit > 3 else ""
+
+
+def format_turn(turn: Dict[str, Any]) -> str:
+    marker = " (corrected)" if turn.get("corrected") else ""
+    return f"[{turn.get('role', 'unknown')}{marker}] {turn.get('text', '')}"
+
+
+def extractive_summary(previous: str, turns: List[Dict[str, Any]]) -> str:
+    """Summary without an LLM: the opening words of each turn, appended to the previous summary"""
+    lines = [previous] if previous else []
+    for turn in turns:
+        words = str(turn.get("text", "")).split()
+        text = " ".join(words[:CONTEXT_SUMMARY_TURN_WORDS]) + (" ..." if len(words) > CONTEXT_SUMMARY_TURN_WORDS else "")
+        lines.append(f"- {turn.get('role', 'unknown')}: {text}")
+    # Oldest lines give way first once the summary outgrows its budget
+    return _clip("\n".join(lines), CONTEXT_SUMMARY_MAX_TOKENS, keep="tail")
+
+
+def summary_prompt(previous: str, turns: List[Dict[str, Any]]) -> str:
+    new_turns = "\n".join(format_turn(turn) for turn in turns)
+    return f"""Update the running summary of a technical interview.
+Previous summary: {previous or "None (interview just started)"}
+New turns:
+{new_turns}
+Task: Return the updated summary only, at most {CONTEXT_SUMMARY_MAX_TOKENS * 3 // 4} words. Keep topics covered, \
+the candidate's claims and code, strengths, gaps and any integrity concerns."""
+
+
+def _assemble(summary: str, omitted: int, lines: List[str]) -> str:
+    parts = []
+    if summary:
+        parts.append(f"Earlier (summary): {summary}")
+    if omitted:
+        parts.append(f"({omitted} earlier turns omitted)")
+    if lines:
+        parts.append("Recent turns:\n" + "\n".join(lines))
+    return "\n".join(parts) if parts else "Start"
+
+
+class ContextWindow(BaseModel):
+    """Rolling summary + recent turns of a session's history, and what that saved"""
+    summary: str = ""
+    summarized_turns: int = 0     # history[:summarized_turns] is folded into summary
+    summaries_generated: int = 0
+    prompts_built: int = 0
+    tokens_full: int = 0          # what embedding the full history would have cost
+    tokens_sent: int = 0
+    # Size of the full history, kept current by count_turn (None: not counted yet, e.g. older saved state)
+    history_tokens: Optional[int] = None
+
+    def count_turn(self, turn: Dict[str, Any], replaces: Optional[Dict[str, Any]] = None):
+        """Account for a turn appended to the history (or edited in place, with its previous version)"""
+        if self.history_tokens is None:
+            return
+        self.history_tokens += estimate_tokens(str(turn))
+        if replaces is not None:
+            self.history_tokens -= estimate_tokens(str(replaces))
+
+    def render(self, history: List[Dict[str, Any]], budget: int) -> str:
+        """History section for a prompt, at most `budget` tokens"""
+        recent = history[min(self.summarized_turns, len(history)):]
+        lines = [format_turn(turn) for turn in recent]
+        summary = self.summary if self.summarized_turns else ""
+
+        # Oldest verbatim turns go first, then the summary shrinks; the newest turn always stays
+        omitted = 0
+        text = _assemble(summary, omitted, lines)
+        while estimate_tokens(text) > budget and len(lines) > 1:
+            lines.pop(0)
+            omitted += 1
+            text = _assemble(summary, omitted, lines)
+        excess = estimate_tokens(text) - budget
+        if excess > 0 and summary:
+            summary = _clip(summary, estimate_tokens(summary) - excess - 1, keep="tail")
+            text = _assemble(summary, omitted, lines)
+            excess = estimate_tokens(text) - budget
+        if excess > 0 and lines:
+            lines[0] = _clip(lines[0], estimate_tokens(lines[0]) - excess - 1, keep="tail")
+            text = _assemble(summary, omitted, lines)
+        text = _clip(text, budget, keep="tail")
+
+        if self.history_tokens is None:
+            self.history_tokens = sum(estimate_tokens(str(turn)) for turn in history)
+        self.prompts_built += 1
+        self.tokens_full += self.history_tokens
+        self.tokens_sent += estimate_tokens(text)
+        return text
+
+    def summary_due(self, history: List[Dict[str, Any]]) -> bool:
+        """Enough turns have aged out of the recent window to fold them into the summary"""
+        return len(history) - CONTEXT_RECENT_TURNS - self.summarized_turns >= CONTEXT_SUMMARY_EVERY
+
+    async def summarize(self, history: List[Dict[str, Any]],
+                        generate: Optional[Callable[[str], Awaitable[str]]] = None):
+        """Fold the turns older than the recent window into the rolling summary"""
+        through = len(history) - CONTEXT_RECENT_TURNS
+        if through <= self.summarized_turns:
+            return
+        turns = history[self.summarized_turns:through]
+        summary = None
+        if generate:
+            try:
+                summary = (await generate(summary_prompt(self.summary, turns))).strip()
+            except Exception as e:
+                logger.warning(f"Context summary generation failed, using extractive summary: {e}")
+        if summary:
+            summary = _clip(summary, CONTEXT_SUMMARY_MAX_TOKENS)
+        else:
+            summary = extractive_summary(self.summary, turns)
+        self.summary = summary
+        self.summarized_turns = through
+        self.summaries_generated += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "summarized_turns": self.summarized_turns,
+            "summaries_generated": self.summaries_generated,
+            "prompts_built": self.prompts_built,
+            "prompt_tokens_full": self.tokens_full,
+            "prompt_tokens_sent": self.tokens_sent,
+            "prompt_tokens_saved": self.tokens_full - self.tokens_sent,
+        }
@@ -2,7 +2,7 @@
 import json
 import google.generativeai as genai
 import os
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, AsyncIterator
 from app.prompts.prompt_service import get_prompt_service
 
 class Config:
@@ -83,6 +83,47 @@ class GeminiClient:
                 
             return self.model.generate_content(prompt, generation_config=config)
 
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Any] = None) -> Any:
+        """
+        Non-blocking counterpart of generate_content for async callers.
+        """
+        if self.use_router:
+            return await self.model.generate_content_async(prompt, generation_config)
+
+        config = generation_config
+        if isinstance(config, dict):
+            config = genai.types.GenerationConfig(**config)
+
+        if hasattr(self.model, 'generate_content_async'):
+            return await self.model.generate_content_async(prompt, generation_config=config)
+
+        # Older SDKs have no async API: keep the call off the event loop
+        from app.llm.llm_router import run_blocking
+        return await run_blocking(lambda: self.model.generate_content(prompt, generation_config=config))
+
+    async def generate_content_stream(self, prompt: str, generation_config: Optional[Any] = None) -> AsyncIterator[str]:
+        """
+        Stream generated text chunks as the model produces them.
+        """
+        if self.use_router:
+            async for chunk in self.model.generate_content_stream(prompt, generation_config):
+                yield chunk
+            return
+
+        config = generation_config
+        if isinstance(config, dict):
+            config = genai.types.GenerationConfig(**config)
+
+        response = await self.model.generate_content_async(prompt, generation_config=config, stream=True)
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. safety-only updates)
+                continue
+            if text:
+                yield text
+
     def analyze_language(self, jd_text: str, resume_text: str) -> Dict:
         """
         Analyze JD and Resume to determine required language (Java/Python) using PromptService
@@ -141,7 +182,7 @@ class GeminiClient:
         context: Dict
     ) -> str:
         """Generate natural follow-up question using LLM with expert-learned examples"""
-        from app.utils.logger import Logger
+        from app.utils.example_store import get_example_store
         
         # Extract strategy guidance text (the actual instruction, not the meta description)
         strategy_instruction = strategy_guidance.get("strategy_guidance", "")
@@ -160,11 +201,13 @@ class GeminiClient:
         # === EVOLUTIONARY LEARNING: Get expert-approved examples ===
         expert_examples_section = ""
         try:
-            logger = Logger()
-            # Get examples for this strategy first, then general examples
-            examples = logger.get_successful_examples(strategy_id=strategy_id, limit=2)
+            store = get_example_store()
+            # Get examples for this strategy first, then general examples;
+            # prefer the ones closest to the current question and answer
+            query = f'{question.get("text", "")} {response}'
+            examples = store.get_examples(strategy_id=strategy_id, limit=2, query=query)
             if not examples:
-                examples = logger.get_successful_examples(limit=2)
+                examples = store.get_examples(limit=2, query=query)
             
             if examples:
                 expert_examples_section = "\n\nExpert-Approved Examples (learn from these):\n"
@@ -0,0 +1,231 @@
+"""
+Compiled matcher behind LLMGuardrails.
+
+Rules are compiled once, when the guardrails are built:
+
+  - every literal the rules need goes into one LiteralMatcher: the blocked phrases
+    themselves, plus the literal each regex rule must start with (its anchor,
+    derived from the pattern, e.g. "ignore" for r"ignore\\s+(all\\s+)?previous"),
+    found with C-level substring search per literal. Patterns with a top-level
+    alternation get no anchor and always run.
+  - each regex rule is compiled once. A rule is only run when one of its anchors
+    occurs in the text, so clean text costs one literal scan per rule class.
+  - each rule class also gets one combined alternation (a named group per rule),
+    which defines redaction: every rule of the class replaced in a single pass.
+    The spans are normally found by the individual rules on the normalized text
+    (CPython's re scans far faster for a single pattern than for an alternation).
+
+Text is normalized once (lower() plus the two non-ASCII letters re.IGNORECASE
+treats as ASCII: dotless i and long s), so the rules run without IGNORECASE.
+Matches report which rule fired.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Characters re.IGNORECASE matches against ASCII letters that lower() leaves alone
+_CASE_FIXES = str.maketrans({"ı": "i", "ſ": "s"})
+_META = set("\\.^$*+?{}[]()|")
+
+
+def normalize(text: str) -> str:
+    return text.lower().translate(_CASE_FIXES)
+
+
+@dataclass
+class GuardrailMatch:
+    """Which rule matched, and where (input checks report offsets into the normalized text)"""
+    rule_class: str
+    rule: str
+    start: int
+    end: int
+    text: str
+
+
+def _leading_literal(pattern: str) -> str:
+    """The literal characters every match of `pattern` starts with ("" if none)"""
+    literal = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                char, step = pattern[i + 1], 2   # escaped punctuation, e.g. \]
+            else:
+                break                            # class escape: \s, \d, \b ...
+        elif ch in _META:
+            break
+        else:
+            char, step = ch, 1
+        following = pattern[i + step:i + step + 1]
+        if following and following in "?*{":
+            break                                # optional / counted: not required
+        literal.append(char)
+        i += step
+        if following == "+":
+            break
+    return "".join(literal)
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether `pattern` has a | outside every group and character class"""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if in_class:
+            if ch == "]":
+                in_class = False
+        elif ch == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1                           # "]" first in a class is literal
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def rule_anchors(pattern: str) -> Optional[List[str]]:
+    """
+    Literals one of which must occur wherever `pattern` matches: its leading
+    literal, or the leading literal of each branch of a leading (a|b|c) group.
+    None when no such literal can be derived (the rule then always runs), which
+    includes every pattern with a top-level alternation ("a|b" can match on b alone).
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+    literal = _leading_literal(pattern)
+    if literal:
+        return [literal]
+    if pattern.startswith("(") and not pattern.startswith("(?"):
+        close = pattern.find(")")
+        body = pattern[1:close]
+        if close < 0 or "(" in body or pattern[close + 1:close + 2] in ("?", "*", "{"):
+            return None
+        anchors = [_leading_literal(branch) for branch in body.split("|")]
+        if all(anchors):
+            return anchors
+    return None
+
+
+class LiteralMatcher:
+    """Finds which of a fixed set of literals occur in a text (first position of each)"""
+
+    def __init__(self, literals: List[str]):
+        self.literals = list(dict.fromkeys(literal for literal in literals if literal))
+
+    def find(self, text: str) -> Dict[str, int]:
+        hits: Dict[str, int] = {}
+        for literal in self.literals:
+            position = text.find(literal)
+            if position >= 0:
+                hits[literal] = position
+        return hits
+
+
+class _Rule:
+    __slots__ = ("pattern", "regex", "anchors")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        # Rules are matched against normalized (lowercase) text; only mixed-case rules need IGNORECASE
+        uppercase = any(c.isupper() for c in re.sub(r"\\.", "", pattern))
+        self.regex = re.compile(pattern, re.IGNORECASE if uppercase else 0)
+        anchors = rule_anchors(pattern)
+        self.anchors = [normalize(a) for a in anchors] if anchors and not uppercase else None
+
+
+class RuleSet:
+    """One class of regex rules (e.g. injection), compiled once"""
+
+    def __init__(self, rule_class: str, patterns: List[str]):
+        self.rule_class = rule_class
+        self.rules = [_Rule(pattern) for pattern in patterns]
+        self.combined = re.compile(
+            "|".join(f"(?P<r{i}>{rule.pattern})" for i, rule in enumerate(self.rules)), re.IGNORECASE
+        ) if self.rules else None
+
+    def anchors(self) -> List[str]:
+        return [anchor for rule in self.rules for anchor in (rule.anchors or [])]
+
+    def _candidates(self, hits: Dict[str, int]) -> List[_Rule]:
+        return [rule for rule in self.rules if rule.anchors is None or any(a in hits for a in rule.anchors)]
+
+    def first_match(self, normalized: str, hits: Dict[str, int]) -> Optional[GuardrailMatch]:
+        """The first rule (in rule order) matching anywhere in the normalized text"""
+        for rule in self._candidates(hits):
+            match = rule.regex.search(normalized)
+            if match:
+                return GuardrailMatch(self.rule_class, rule.pattern, match.start(), match.end(), match.group())
+        return None
+
+    def redact(self, text: str, normalized: str, hits: Dict[str, int], replacement: str) -> Tuple[str, List[GuardrailMatch]]:
+        """
+        Replace every match of every rule, as one substitution with the combined
+        alternation would. Spans are found on the normalized text by the rules that
+        actually match; only when they overlap (or lower() changed the length) does
+        the combined IGNORECASE pattern run over the original text.
+        """
+        matches: List[GuardrailMatch] = []
+        matching = [rule for rule in self._candidates(hits) if rule.regex.search(normalized)]
+        if not matching:
+            return text, matches
+        spans = sorted((match.start(), order, match.end())
+                       for order, rule in enumerate(matching) for match in rule.regex.finditer(normalized))
+        disjoint = len(normalized) == len(text) and all(start < end for start, _, end in spans) and all(
+            spans[n][0] >= spans[n - 1][2] for n in range(1, len(spans)))
+        if disjoint:
+            parts, position = [], 0
+            for start, order, end in spans:
+                parts.append(text[position:start])
+                parts.append(replacement)
+                position = end
+                matches.append(GuardrailMatch(self.rule_class, matching[order].pattern, start, end, text[start:end]))
+            parts.append(text[position:])
+            return "".join(parts), matches
+
+        def replace(match):
+            rule = self.rules[int(match.lastgroup[1:])]
+            matches.append(GuardrailMatch(self.rule_class, rule.pattern, match.start(), match.end(), match.group()))
+            return replacement
+
+        return self.combined.sub(replace, text), matches
+
+
+class GuardrailMatcher:
+    """Injection rules + blocked phrases for inputs, unsafe-content rules for outputs"""
+
+    def __init__(self, injection_patterns: List[str], blocked_phrases: List[str], unsafe_patterns: List[str]):
+        self.injection = RuleSet("injection", injection_patterns)
+        self.unsafe = RuleSet("unsafe_content", unsafe_patterns)
+        self.blocked_phrases = [(phrase, normalize(phrase)) for phrase in blocked_phrases]
+        self.input_literals = LiteralMatcher(self.injection.anchors() + [p for _, p in self.blocked_phrases])
+        self.unsafe_literals = LiteralMatcher(self.unsafe.anchors())
+
+    def check_input(self, prompt: str) -> Optional[GuardrailMatch]:
+        """First injection rule, else first blocked phrase, found in the prompt (None if clean)"""
+        normalized = normalize(prompt)
+        hits = self.input_literals.find(normalized)
+        match = self.injection.first_match(normalized, hits)
+        if match:
+            return match
+        for phrase, literal in self.blocked_phrases:
+            if literal in hits:
+                start = hits[literal]
+                return GuardrailMatch("blocked_phrase", phrase, start, start + len(literal), literal)
+        return None
+
+    def redact_unsafe(self, text: str, replacement: str = "[REDACTED]") -> Tuple[str, List[GuardrailMatch]]:
+        normalized = normalize(text)
+        return self.unsafe.redact(text, normalized, self.unsafe_literals.find(normalized), replacement)
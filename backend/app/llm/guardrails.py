@@ -7,16 +7,23 @@ to minimize hallucinations and ensure professional, on-topic responses.
 
 import re
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from app.llm.guardrail_matcher import GuardrailMatch, GuardrailMatcher
+
+# Sanitization applied to every accepted input
+SCRIPT_TAG_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+JAVASCRIPT_URL_RE = re.compile(r'javascript:', re.IGNORECASE)
+
 
 class GuardrailViolation(Exception):
     """Exception raised when a guardrail check fails"""
-    def __init__(self, message: str, violation_type: str):
+    def __init__(self, message: str, violation_type: str, rule: Optional[GuardrailMatch] = None):
         self.message = message
         self.violation_type = violation_type
+        self.rule = rule  # the rule that matched, when a pattern/phrase check failed
         super().__init__(self.message)
 
 
@@ -91,6 +98,11 @@ class LLMGuardrails:
             r"(hack|exploit|vulnerability|inject)",
             r"(inappropriate|offensive|discriminat)",
         ]
+        self.compile()
+    
+    def compile(self):
+        """(Re)build the compiled matcher; call after changing the pattern lists or blocked phrases"""
+        self.matcher = GuardrailMatcher(self.injection_patterns, self.config.blocked_phrases, self.unsafe_patterns)
     
     def validate_input(self, prompt: str, context: Dict = None) -> str:
         """
@@ -112,26 +124,19 @@ class LLMGuardrails:
         if len(prompt) > self.config.max_input_length:
             prompt = prompt[:self.config.max_input_length]
         
-        # Check for injection attempts
-        prompt_lower = prompt.lower()
-        for pattern in self.injection_patterns:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                raise GuardrailViolation(
-                    f"Potential injection detected: {pattern}",
-                    ViolationType.INPUT_INJECTION.value
-                )
-        
-        # Check for blocked phrases
-        for phrase in self.config.blocked_phrases:
-            if phrase.lower() in prompt_lower:
-                raise GuardrailViolation(
-                    f"Blocked phrase detected: {phrase}",
-                    ViolationType.INPUT_INJECTION.value
-                )
+        # Check for injection attempts, then blocked phrases (one compiled scan)
+        match = self.matcher.check_input(prompt)
+        if match:
+            label = "Potential injection detected" if match.rule_class == "injection" else "Blocked phrase detected"
+            raise GuardrailViolation(
+                f"{label}: {match.rule}",
+                ViolationType.INPUT_INJECTION.value,
+                rule=match
+            )
         
         # Sanitize: Remove potential code execution patterns
-        prompt = re.sub(r'<script[^>]*>.*?</script>', '', prompt, flags=re.DOTALL | re.IGNORECASE)
-        prompt = re.sub(r'javascript:', '', prompt, flags=re.IGNORECASE)
+        prompt = SCRIPT_TAG_RE.sub('', prompt)
+        prompt = JAVASCRIPT_URL_RE.sub('', prompt)
         
         return prompt
     
@@ -290,12 +295,16 @@ class LLMGuardrails:
         Returns:
             Filtered text
         """
-        for pattern in self.unsafe_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                # Redact the matched content
-                text = re.sub(pattern, '[REDACTED]', text, flags=re.IGNORECASE)
+        return self.redact_unsafe(text)[0]
+    
+    def redact_unsafe(self, text: str) -> Tuple[str, List[GuardrailMatch]]:
+        """
+        Redact unsafe content in a single pass over the text.
         
-        return text
+        Returns:
+            Filtered text and the matches that were redacted (which rule, where)
+        """
+        return self.matcher.redact_unsafe(text, '[REDACTED]')
     
     def get_safe_config(self, operation: str) -> Dict:
         """
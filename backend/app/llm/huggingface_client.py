@@ -1,7 +1,7 @@
 """Hugging Face API client for LLM operations"""
 import os
-from typing import Dict, Optional, List
-from huggingface_hub import InferenceClient
+from typing import Dict, Optional, List, AsyncIterator
+from huggingface_hub import InferenceClient, AsyncInferenceClient
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,6 +22,7 @@ class HuggingFaceClient:
         
         self.model_name = model_name
         self.client = InferenceClient(token=self.api_key)
+        self.async_client = AsyncInferenceClient(token=self.api_key)
         print(f"HuggingFaceClient initialized with model: {model_name}")
     
     def generate_content(self, prompt: str, generation_config: Optional[Dict] = None) -> 'HFResponse':
@@ -38,25 +39,7 @@ class HuggingFaceClient:
         Returns:
             HFResponse object with .text property
         """
-        # Extract config parameters
-        config_dict = {}
-        if generation_config:
-            # Check for to_dict method (our own Prompt models)
-            if hasattr(generation_config, 'to_dict') and callable(generation_config.to_dict):
-                config_dict = generation_config.to_dict()
-            # Check for members/attributes (Google/Other)
-            elif hasattr(generation_config, 'temperature'):
-                config_dict = {
-                    'temperature': generation_config.temperature,
-                    'max_output_tokens': getattr(generation_config, 'max_output_tokens', 512),
-                    'top_p': getattr(generation_config, 'top_p', 0.95)
-                }
-            elif isinstance(generation_config, dict):
-                config_dict = generation_config
-            
-        temperature = config_dict.get('temperature', 0.7)
-        max_tokens = config_dict.get('max_output_tokens', 512)
-        top_p = config_dict.get('top_p', 0.95)
+        temperature, max_tokens, top_p = self._extract_config(generation_config)
         
         try:
             # Use chat completion API for instruction-tuned models
@@ -87,6 +70,93 @@ class HuggingFaceClient:
             except Exception as e2:
                 raise Exception(f"Both chat_completion and text_generation failed: {e}, {e2}")
 
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Dict] = None) -> 'HFResponse':
+        """
+        Non-blocking variant of generate_content using the async Inference API.
+        
+        Args:
+            prompt: The input prompt
+            generation_config: Optional generation configuration (same shape as generate_content)
+        
+        Returns:
+            HFResponse object with .text property
+        """
+        temperature, max_tokens, top_p = self._extract_config(generation_config)
+        
+        try:
+            messages = [{"role": "user", "content": prompt}]
+            
+            completion = await self.async_client.chat_completion(
+                messages=messages,
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p
+            )
+            
+            response_text = completion.choices[0].message.content
+            return HFResponse(response_text)
+            
+        except Exception as e:
+            try:
+                response_text = await self.async_client.text_generation(
+                    prompt,
+                    model=self.model_name,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=top_p
+                )
+                return HFResponse(response_text)
+            except Exception as e2:
+                raise Exception(f"Both chat_completion and text_generation failed: {e}, {e2}")
+    
+    async def generate_content_stream(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Stream generated text incrementally via the chat completion streaming API.
+        
+        Yields:
+            Text chunks as they are produced by the model
+        """
+        temperature, max_tokens, top_p = self._extract_config(generation_config)
+        messages = [{"role": "user", "content": prompt}]
+        
+        stream = await self.async_client.chat_completion(
+            messages=messages,
+            model=self.model_name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    
+    def _extract_config(self, generation_config) -> tuple:
+        """Normalize the supported generation_config shapes into (temperature, max_tokens, top_p)"""
+        config_dict = {}
+        if generation_config:
+            # Check for to_dict method (our own Prompt models)
+            if hasattr(generation_config, 'to_dict') and callable(generation_config.to_dict):
+                config_dict = generation_config.to_dict()
+            # Check for members/attributes (Google/Other)
+            elif hasattr(generation_config, 'temperature'):
+                config_dict = {
+                    'temperature': generation_config.temperature,
+                    'max_output_tokens': getattr(generation_config, 'max_output_tokens', 512),
+                    'top_p': getattr(generation_config, 'top_p', 0.95)
+                }
+            elif isinstance(generation_config, dict):
+                config_dict = generation_config
+            
+        temperature = config_dict.get('temperature', 0.7)
+        max_tokens = config_dict.get('max_output_tokens', 512)
+        top_p = config_dict.get('top_p', 0.95)
+        return temperature, max_tokens, top_p
+
 
 class HFResponse:
     """Response wrapper to match Gemini API interface"""
@@ -1,10 +1,39 @@
 """LLM Router with intelligent fallback logic"""
 import os
-from typing import Dict, Optional, List, Any
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Any, Callable, AsyncIterator, Tuple
 from dotenv import load_dotenv
+from app.llm.response_cache import ResponseCache, get_response_cache
+from app.llm.provider_health import ProviderHealth
+from app.llm.rate_limiter import throttle
 
 load_dotenv()
 
+# Upper bound on provider calls that may block a worker thread at once.
+# Only clients without a native async API go through this pool.
+LLM_EXECUTOR_WORKERS = int(os.getenv("LLM_EXECUTOR_WORKERS", 16))
+
+# Hedged requests: race a second provider once the first exceeds its own p95 latency
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+# Successful calls needed before a provider's p95 is trusted as a hedge trigger
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """Get or create the bounded thread pool used for blocking provider calls"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=LLM_EXECUTOR_WORKERS, thread_name_prefix="llm")
+    return _executor
+
+async def run_blocking(func: Callable, *args) -> Any:
+    """Run a blocking provider call on the bounded LLM executor without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_llm_executor(), func, *args)
+
 class LLMRouter:
     """
     Intelligent LLM router that tries multiple models with fallback logic.
@@ -13,14 +42,50 @@ class LLMRouter:
     1. Qwen 2.5 7B (Hugging Face) - Fastest, best performance
     2. LLaMA 3.2 3B (Hugging Face) - Reliable fallback
     3. Gemma 3 27B IT (Google) - Higher quota fallback
+    
+    The priority order is only the cold-start ranking: once providers have latency
+    history they are re-ranked by expected latency (EWMA inflated by error rate), and
+    a provider whose circuit breaker is open is skipped until its cooldown expires.
     """
     
-    def __init__(self):
-        """Initialize LLM router with available clients"""
-        self.clients = []
+    def __init__(self, clients: Optional[List[Dict[str, Any]]] = None, cache: Optional[ResponseCache] = None):
+        """
+        Initialize LLM router with available clients
+        
+        Args:
+            clients: Optional pre-built client entries ({"client", "name", "provider", "priority"}).
+                     When omitted, providers are discovered from the environment.
+            cache: Response cache to use; defaults to the shared cache singleton.
+        """
+        self.clients = list(clients) if clients else []
         self.active_client = None
         self.active_model_name = None
+        self.cache = cache or get_response_cache()
+        
+        if not self.clients:
+            self._discover_clients()
+        
+        if not self.clients:
+            raise ValueError("No LLM clients available! Check API keys.")
+        
+        # Sort by priority
+        self.clients.sort(key=lambda x: x["priority"])
+        
+        # Set active client to highest priority
+        self.active_client = self.clients[0]["client"]
+        self.active_model_name = self.clients[0]["name"]
+        
+        # Circuit breaker and latency tracking per provider
+        self.health: Dict[str, ProviderHealth] = {c["name"]: ProviderHealth(c["name"]) for c in self.clients}
+        self.hedging = LLM_HEDGE_ENABLED
+        self.hedges_fired = 0
+        self.hedges_won = 0
         
+        print(f"\n🚀 LLMRouter initialized with {len(self.clients)} model(s)")
+        print(f"   Primary: {self.active_model_name} ({self.clients[0]['provider']})")
+    
+    def _discover_clients(self):
+        """Register every provider whose credentials are configured"""
         # Try to initialize Hugging Face models first
         try:
             from app.llm.huggingface_client import HuggingFaceClient
@@ -67,50 +132,156 @@ class LLMRouter:
             print("✓ Gemma 3 27B IT available (fallback)")
         except Exception as e:
             print(f"✗ Gemma 3 27B IT unavailable: {e}")
-        
-        if not self.clients:
-            raise ValueError("No LLM clients available! Check API keys.")
-        
-        # Sort by priority
-        self.clients.sort(key=lambda x: x["priority"])
-        
-        # Set active client to highest priority
-        self.active_client = self.clients[0]["client"]
-        self.active_model_name = self.clients[0]["name"]
-        
-        print(f"\n🚀 LLMRouter initialized with {len(self.clients)} model(s)")
-        print(f"   Primary: {self.active_model_name} ({self.clients[0]['provider']})")
     
-    def generate_content(self, prompt: str, generation_config: Optional[Dict] = None) -> Any:
+    def generate_content(self, prompt: str, generation_config: Optional[Dict] = None,
+                         cache_category: Optional[str] = None) -> Any:
         """
         Generate content with automatic fallback
         
+        Providers are tried healthiest-first; providers with an open circuit are skipped.
+        
         Args:
             prompt: Input prompt
             generation_config: Generation configuration
+            cache_category: Prompt category used to pick the response cache TTL
         
         Returns:
             Response object (compatible with Gemini API)
         """
+        cached, ttl = self._cache_lookup(prompt, generation_config, cache_category)
+        if cached:
+            return cached
+        
         last_error = None
+        candidates, force = self._candidates()
         
-        for client_info in self.clients:
+        for client_info in candidates:
             client = client_info["client"]
             model_name = client_info["name"]
+            health = self.health[model_name]
+            if not force and not health.try_acquire():
+                continue
             
+            started = time.perf_counter()
             try:
                 # Try to generate content
                 response = client.generate_content(prompt, generation_config)
+                health.record_success(time.perf_counter() - started)
+                self._mark_active(client_info)
+                self._cache_store(client_info, prompt, generation_config, response, ttl, cache_category)
+                return response
                 
-                # Update active client if different
-                if self.active_model_name != model_name:
-                    print(f"⚠ Switched to {model_name}")
-                    self.active_client = client
-                    self.active_model_name = model_name
+            except Exception as e:
+                health.record_failure(time.perf_counter() - started)
+                last_error = e
+                print(f"✗ {model_name} failed: {str(e)[:100]}")
+                continue
+        
+        # All clients failed
+        raise Exception(f"All LLM clients failed. Last error: {last_error}")
+    
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Dict] = None,
+                                     cache_category: Optional[str] = None) -> Any:
+        """
+        Non-blocking generate_content with the same fallback order and response cache.
+        
+        Clients exposing generate_content_async are awaited directly; any other
+        client runs on the bounded LLM executor so the event loop stays free.
+        With hedging enabled, a second provider is raced once the first one has
+        been silent for longer than its own p95 latency.
+        """
+        cached, ttl = await self._cache_lookup_async(prompt, generation_config, cache_category)
+        if cached:
+            return cached
+        
+        last_error = None
+        candidates, force = self._candidates()
+        
+        while candidates:
+            client_info = candidates.pop(0)
+            if not force and not self.health[client_info["name"]].try_acquire():
+                continue
+            
+            attempts = {asyncio.ensure_future(self._call_async(client_info, prompt, generation_config)): client_info}
+            try:
+                hedge_delay = self._hedge_delay(client_info) if not force else None
+                if hedge_delay is not None and candidates:
+                    done, _ = await asyncio.wait(list(attempts), timeout=hedge_delay)
+                    if not done:
+                        backup_info = next((c for c in candidates if self.health[c["name"]].try_acquire()), None)
+                        if backup_info:
+                            candidates.remove(backup_info)
+                            self.hedges_fired += 1
+                            print(f"⏱ {client_info['name']} slower than p95 ({hedge_delay * 1000:.0f}ms), hedging to {backup_info['name']}")
+                            attempts[asyncio.ensure_future(self._call_async(backup_info, prompt, generation_config))] = backup_info
                 
-                return response
+                while attempts:
+                    done, _ = await asyncio.wait(list(attempts), return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        answered_by = attempts.pop(task)
+                        if task.exception() is not None:
+                            last_error = task.exception()
+                            print(f"✗ {answered_by['name']} failed: {str(last_error)[:100]}")
+                            continue
+                        if answered_by is not client_info:
+                            self.hedges_won += 1
+                        self._mark_active(answered_by)
+                        await self._cache_store_async(answered_by, prompt, generation_config, task.result(), ttl, cache_category)
+                        return task.result()
+            finally:
+                # Cancel the losing (or orphaned) hedge attempt
+                for task in attempts:
+                    task.cancel()
+        
+        # All clients failed
+        raise Exception(f"All LLM clients failed. Last error: {last_error}")
+    
+    async def generate_content_stream(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Stream text chunks from the first provider that answers.
+        
+        Falls back to the next provider only while nothing has been yielded yet;
+        a provider failing mid-stream raises, since its partial output is already out.
+        Providers without streaming support yield their full response as one chunk.
+        """
+        last_error = None
+        candidates, force = self._candidates()
+        
+        for client_info in candidates:
+            client = client_info["client"]
+            model_name = client_info["name"]
+            health = self.health[model_name]
+            if not force and not health.try_acquire():
+                continue
+            started = time.perf_counter()
+            first_chunk_at = None
+            
+            try:
+                if hasattr(client, "generate_content_stream"):
+                    async for chunk in client.generate_content_stream(prompt, generation_config):
+                        if chunk:
+                            if first_chunk_at is None:
+                                first_chunk_at = time.perf_counter()
+                            yield chunk
+                else:
+                    if hasattr(client, "generate_content_async"):
+                        response = await client.generate_content_async(prompt, generation_config)
+                    else:
+                        response = await run_blocking(client.generate_content, prompt, generation_config)
+                    first_chunk_at = time.perf_counter()
+                    yield response.text
+                # Time-to-first-token is what the candidate waits on
+                health.record_success((first_chunk_at or time.perf_counter()) - started)
+                self._mark_active(client_info)
+                return
                 
+            except (asyncio.CancelledError, GeneratorExit):
+                health.release()
+                raise
             except Exception as e:
+                health.record_failure(time.perf_counter() - started)
+                if first_chunk_at is not None:
+                    raise
                 last_error = e
                 print(f"✗ {model_name} failed: {str(e)[:100]}")
                 continue
@@ -118,6 +289,126 @@ class LLMRouter:
         # All clients failed
         raise Exception(f"All LLM clients failed. Last error: {last_error}")
     
+    async def _call_async(self, client_info: Dict[str, Any], prompt: str, generation_config) -> Any:
+        """One provider attempt, recorded against that provider's health"""
+        client = client_info["client"]
+        health = self.health[client_info["name"]]
+        try:
+            # Bulk jobs run under a per-provider rate limit; interactive calls pass straight through
+            await throttle(client_info["name"])
+        except asyncio.CancelledError:
+            health.release()
+            raise
+        started = time.perf_counter()
+        try:
+            if hasattr(client, "generate_content_async"):
+                response = await client.generate_content_async(prompt, generation_config)
+            else:
+                response = await run_blocking(client.generate_content, prompt, generation_config)
+        except asyncio.CancelledError:
+            # Lost a hedge race: not a failure, and the latency sample is incomplete
+            health.release()
+            raise
+        except Exception:
+            health.record_failure(time.perf_counter() - started)
+            raise
+        health.record_success(time.perf_counter() - started)
+        return response
+    
+    def _candidates(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Providers in the order to try them: healthy ones ranked by expected latency.
+        If every circuit is open, all providers are returned (force=True) so the
+        request still gets a last-resort attempt instead of failing outright.
+        """
+        ranked = sorted(self.clients, key=lambda c: self.health[c["name"]].rank_key(c["priority"]))
+        available = [c for c in ranked if self.health[c["name"]].is_available()]
+        if available:
+            return available, False
+        print("⚠ All LLM circuits open, trying every provider")
+        return ranked, True
+    
+    def _hedge_delay(self, client_info: Dict[str, Any]) -> Optional[float]:
+        """Seconds to wait before hedging away from this provider (None = don't hedge)"""
+        if not self.hedging:
+            return None
+        health = self.health[client_info["name"]]
+        if len(health.samples) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return health.percentile(95)
+    
+    def get_provider_status(self) -> Dict[str, Any]:
+        """Circuit state and latency statistics per provider, in current routing order"""
+        ranked = sorted(self.clients, key=lambda c: self.health[c["name"]].rank_key(c["priority"]))
+        providers = []
+        for rank, client_info in enumerate(ranked, start=1):
+            status = self.health[client_info["name"]].snapshot()
+            status.update({
+                "rank": rank,
+                "provider": client_info["provider"],
+                "priority": client_info["priority"],
+                "active": client_info["name"] == self.active_model_name
+            })
+            providers.append(status)
+        return {
+            "active_model": self.active_model_name,
+            "hedging": {
+                "enabled": self.hedging,
+                "min_samples": LLM_HEDGE_MIN_SAMPLES,
+                "fired": self.hedges_fired,
+                "won_by_backup": self.hedges_won
+            },
+            "providers": providers
+        }
+    
+    def _cache_keys(self, prompt: str, generation_config, cache_category: Optional[str]) -> Tuple[List[str], int]:
+        """Lookup keys (one per model) and the TTL to store a fresh response with; 0 = don't cache"""
+        ttl = self.cache.ttl_for(cache_category, generation_config)
+        if ttl <= 0:
+            self.cache.skip(cache_category)
+            return [], 0
+        return [self.cache.make_key(c["name"], prompt, generation_config) for c in self.clients], ttl
+    
+    def _cache_lookup(self, prompt: str, generation_config, cache_category: Optional[str]) -> Tuple[Optional[Any], int]:
+        """Return (cached response or None, TTL to store a fresh response with; 0 = don't cache)"""
+        keys, ttl = self._cache_keys(prompt, generation_config, cache_category)
+        return (self.cache.lookup(keys, cache_category) if ttl > 0 else None), ttl
+    
+    async def _cache_lookup_async(self, prompt: str, generation_config, cache_category: Optional[str]) -> Tuple[Optional[Any], int]:
+        """_cache_lookup without blocking the event loop on the Redis tier"""
+        keys, ttl = self._cache_keys(prompt, generation_config, cache_category)
+        return (await self.cache.lookup_async(keys, cache_category) if ttl > 0 else None), ttl
+    
+    @staticmethod
+    def _response_text(response: Any) -> Optional[str]:
+        try:
+            return response.text
+        except Exception:
+            # e.g. Gemini responses blocked by safety filters have no text
+            return None
+    
+    def _cache_store(self, client_info: Dict[str, Any], prompt: str, generation_config, response: Any,
+                     ttl: int, cache_category: Optional[str]):
+        """Cache a fresh response under the model that produced it"""
+        text = self._response_text(response) if ttl > 0 else None
+        if text:
+            key = self.cache.make_key(client_info["name"], prompt, generation_config)
+            self.cache.set(key, text, client_info["name"], ttl, cache_category)
+    
+    async def _cache_store_async(self, client_info: Dict[str, Any], prompt: str, generation_config, response: Any,
+                                 ttl: int, cache_category: Optional[str]):
+        text = self._response_text(response) if ttl > 0 else None
+        if text:
+            key = self.cache.make_key(client_info["name"], prompt, generation_config)
+            await self.cache.set_async(key, text, client_info["name"], ttl, cache_category)
+    
+    def _mark_active(self, client_info: Dict[str, Any]):
+        """Update active client if the answering client differs"""
+        if self.active_model_name != client_info["name"]:
+            print(f"⚠ Switched to {client_info['name']}")
+            self.active_client = client_info["client"]
+            self.active_model_name = client_info["name"]
+    
     def get_active_model(self) -> str:
         """Get the name of the currently active model"""
         return self.active_model_name
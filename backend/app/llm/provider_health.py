@@ -0,0 +1,157 @@
+"""Per-provider health tracking: circuit breaker, latency/error EWMAs and latency percentiles"""
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional, Any, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Consecutive failures before a provider's circuit opens
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", 3))
+# Seconds an open circuit waits before letting a single half-open probe through
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", 30))
+# Weight of the newest observation in the latency / error EWMAs
+LLM_HEALTH_EWMA_ALPHA = float(os.getenv("LLM_HEALTH_EWMA_ALPHA", 0.2))
+# Observations needed before a provider is ranked by measured latency instead of its priority
+LLM_HEALTH_MIN_SAMPLES = int(os.getenv("LLM_HEALTH_MIN_SAMPLES", 5))
+# Assumed latency (seconds) for providers without enough samples yet
+LLM_HEALTH_DEFAULT_LATENCY = float(os.getenv("LLM_HEALTH_DEFAULT_LATENCY", 2.0))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """
+    Circuit breaker plus rolling latency statistics for one LLM provider.
+
+    closed    -> requests flow; LLM_BREAKER_FAILURE_THRESHOLD consecutive failures open it
+    open      -> requests are skipped until the cooldown elapses
+    half_open -> exactly one probe request is allowed; success closes, failure re-opens
+    """
+
+    def __init__(self, name: str, failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+                 cooldown_seconds: float = LLM_BREAKER_COOLDOWN_SECONDS, alpha: float = LLM_HEALTH_EWMA_ALPHA):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.alpha = alpha
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.samples: deque = deque(maxlen=200)
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """Whether a request could be sent now (does not reserve the half-open probe)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return time.time() - self.opened_at >= self.cooldown_seconds
+            return not self.probing
+
+    def try_acquire(self) -> bool:
+        """Reserve the right to send a request; moves an expired open circuit to half-open"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.time() - self.opened_at < self.cooldown_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self.probing = False
+            if self.probing:
+                return False
+            self.probing = True
+            print(f"🔎 {self.name} circuit half-open, probing")
+            return True
+
+    def release(self):
+        """Give back a reservation whose request was cancelled before it finished"""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.successes += 1
+            self.samples.append(latency)
+            self.latency_ewma = latency if self.latency_ewma is None else \
+                self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+            self.error_ewma = (1 - self.alpha) * self.error_ewma
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                # Probe succeeded: forget the outage so the provider competes on latency again
+                self.error_ewma = 0.0
+                print(f"✓ {self.name} circuit closed")
+            self.state = CLOSED
+            self.probing = False
+
+    def record_failure(self, latency: float):
+        with self._lock:
+            self.failures += 1
+            self.error_ewma = self.alpha + (1 - self.alpha) * self.error_ewma
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"⛔ {self.name} circuit open after {self.consecutive_failures} failure(s)")
+                self.state = OPEN
+                self.opened_at = time.time()
+            self.probing = False
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile over recent successful calls (None until samples exist)"""
+        with self._lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def expected_latency(self) -> float:
+        """Latency inflated by the error rate: the expected cost of trying this provider first"""
+        if self.latency_ewma is None or len(self.samples) < LLM_HEALTH_MIN_SAMPLES:
+            latency = LLM_HEALTH_DEFAULT_LATENCY
+        else:
+            latency = self.latency_ewma
+        return latency / max(1 - self.error_ewma, 0.1)
+
+    def rank_key(self, priority: int) -> Tuple[int, float, int]:
+        """
+        Sort key: a provider due for its half-open probe goes first (otherwise a recovered
+        provider would never be retried), then closed circuits by expected latency and
+        configured priority, then providers that are still cooling down.
+        """
+        if not self.is_available():
+            tier = 2
+        elif self.state == CLOSED:
+            tier = 1
+        else:
+            tier = 0
+        return (tier, self.expected_latency(), priority)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        with self._lock:
+            retry_in = max(0.0, self.cooldown_seconds - (time.time() - self.opened_at)) if self.state == OPEN else 0.0
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "successes": self.successes,
+                "failures": self.failures,
+                "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+                "error_rate_ewma": round(self.error_ewma, 4),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "retry_in_seconds": round(retry_in, 1)
+            }
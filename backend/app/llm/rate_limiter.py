@@ -0,0 +1,82 @@
+"""Per-provider request rate limiting for background LLM workloads"""
+import time
+import asyncio
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class ProviderRateLimiter:
+    """
+    Token bucket per provider name (requests per minute).
+
+    A limiter only applies to calls made inside `limiter.applied()`: bulk jobs opt in
+    so they stay under provider quotas, while interactive traffic is never throttled.
+    """
+
+    def __init__(self, default_rpm: float, overrides: Optional[Dict[str, float]] = None):
+        self.default_rpm = default_rpm
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.throttled_seconds = 0.0
+
+    def rpm_for(self, provider: str) -> float:
+        return self.overrides.get(provider, self.default_rpm)
+
+    async def acquire(self, provider: str):
+        """Wait until a request to this provider fits its rate"""
+        rpm = self.rpm_for(provider)
+        if rpm <= 0:
+            return
+        rate = rpm / 60.0
+        capacity = max(1.0, rate)  # allow up to one second of burst
+        lock = self._locks.setdefault(provider, asyncio.Lock())
+        async with lock:
+            bucket = self._buckets.setdefault(provider, {"tokens": capacity, "updated": time.monotonic()})
+            while True:
+                now = time.monotonic()
+                bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["updated"]) * rate)
+                bucket["updated"] = now
+                if bucket["tokens"] >= 1:
+                    bucket["tokens"] -= 1
+                    return
+                wait = (1 - bucket["tokens"]) / rate
+                self.throttled_seconds += wait
+                await asyncio.sleep(wait)
+
+    def applied(self) -> "_AppliedLimiter":
+        """Context manager that routes provider calls in this task (and its children) through the limiter"""
+        return _AppliedLimiter(self)
+
+    @staticmethod
+    def parse_overrides(spec: str) -> Dict[str, float]:
+        """Parse "Qwen 2.5 7B=30;Gemma 3 27B IT=15" into {name: rpm}"""
+        overrides = {}
+        for part in (spec or "").split(";"):
+            if "=" in part:
+                name, rpm = part.rsplit("=", 1)
+                overrides[name.strip()] = float(rpm)
+        return overrides
+
+
+class _AppliedLimiter:
+    def __init__(self, limiter: ProviderRateLimiter):
+        self.limiter = limiter
+        self.token = None
+
+    def __enter__(self):
+        self.token = _active_limiter.set(self.limiter)
+        return self.limiter
+
+    def __exit__(self, *exc):
+        _active_limiter.reset(self.token)
+
+
+_active_limiter: ContextVar[Optional[ProviderRateLimiter]] = ContextVar("llm_rate_limiter", default=None)
+
+
+async def throttle(provider: str):
+    """Called by LLMRouter before each provider request; no-op outside a limited context"""
+    limiter = _active_limiter.get()
+    if limiter is not None:
+        await limiter.acquire(provider)
@@ -0,0 +1,285 @@
+"""Content-addressed cache for LLM responses (in-process LRU + optional Redis tier)"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1024))
+LLM_CACHE_USE_REDIS = os.getenv("LLM_CACHE_USE_REDIS", "true").lower() == "true"
+# Prompts without a listed category (per-turn decisions: security checks, scoring,
+# critique, plan updates) aren't cached unless this is raised
+LLM_CACHE_DEFAULT_TTL = int(os.getenv("LLM_CACHE_DEFAULT_TTL", 0))
+# Prompts sampled above this temperature are meant to vary; never serve them from cache
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", 0.8))
+
+REDIS_KEY_PREFIX = "llm_cache:"
+
+# Seconds a response stays valid per prompt category; only categories listed with a
+# TTL above 0 are cached (opt-in). Override any entry with LLM_CACHE_TTL_<CATEGORY>,
+# e.g. LLM_CACHE_TTL_ATS_AUDIT=3600
+CATEGORY_TTLS: Dict[str, int] = {
+    "ats_audit": 24 * 3600,
+    "strategy_map": 24 * 3600,
+    "strategy_setup": 6 * 3600,
+    "health_check": 60,
+    "dialogue": 0,
+    "context_summary": 0,
+}
+for _category in list(CATEGORY_TTLS):
+    _override = os.getenv(f"LLM_CACHE_TTL_{_category.upper()}")
+    if _override is not None:
+        CATEGORY_TTLS[_category] = int(_override)
+
+
+class CachedResponse:
+    """Response served from cache (exposes .text like provider responses)"""
+
+    cached = True
+
+    def __init__(self, text: str, model: str):
+        self._text = text
+        self.model = model
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+
+def _config_dict(generation_config) -> Dict[str, Any]:
+    """Normalize dicts, our Prompt GenerationConfig and SDK config objects into a plain dict"""
+    if not generation_config:
+        return {}
+    if isinstance(generation_config, dict):
+        return generation_config
+    if hasattr(generation_config, "to_dict") and callable(generation_config.to_dict):
+        return generation_config.to_dict()
+    return {
+        key: getattr(generation_config, key)
+        for key in ("temperature", "max_output_tokens", "top_p", "top_k")
+        if getattr(generation_config, key, None) is not None
+    }
+
+
+class ResponseCache:
+    """
+    Maps hash(model, prompt, generation_config) to response text.
+
+    The in-process LRU tier answers repeat prompts without I/O; the Redis tier
+    shares entries across workers and survives restarts. Hit/miss counters are
+    kept per category so the admin dashboard can tell which prompts benefit.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, use_redis: bool = LLM_CACHE_USE_REDIS,
+                 enabled: bool = LLM_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._async_redis = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(model: str, prompt: str, generation_config=None) -> str:
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "config": _config_dict(generation_config)},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, category: Optional[str], generation_config=None) -> int:
+        """TTL in seconds for this request, or 0 if it must bypass the cache"""
+        if not self.enabled:
+            return 0
+        temperature = _config_dict(generation_config).get("temperature")
+        if temperature is not None and temperature > LLM_CACHE_MAX_TEMPERATURE:
+            return 0
+        return CATEGORY_TTLS.get(category or "default", LLM_CACHE_DEFAULT_TTL)
+
+    def lookup(self, keys: List[str], category: Optional[str] = None) -> Optional[CachedResponse]:
+        """
+        Return the first live entry among keys (one key per model in fallback order).
+        Counts a single hit or miss for the whole lookup. Blocking Redis I/O: for
+        sync callers only; the async router path uses lookup_async.
+        """
+        now = time.time()
+        hit = self._lookup_local(keys, category, now)
+        if hit:
+            return hit
+
+        redis = self._get_redis()
+        if redis:
+            for key in keys:
+                data = redis.get(REDIS_KEY_PREFIX + key)
+                hit = self._redis_hit(key, data, category, now)
+                if hit:
+                    return hit
+
+        self._count(category, "misses")
+        return None
+
+    async def lookup_async(self, keys: List[str], category: Optional[str] = None) -> Optional[CachedResponse]:
+        """lookup() on the pooled async Redis client: all keys in one pipelined round-trip"""
+        now = time.time()
+        hit = self._lookup_local(keys, category, now)
+        if hit:
+            return hit
+
+        redis = self._get_async_redis()
+        pipe = redis.pipeline() if redis else None
+        if pipe is not None:
+            for key in keys:
+                pipe.get(REDIS_KEY_PREFIX + key)
+            replies = await redis.execute(pipe) or []
+            for key, raw in zip(keys, replies):
+                try:
+                    data = json.loads(raw) if raw else None
+                except ValueError:
+                    data = None
+                hit = self._redis_hit(key, data, category, now)
+                if hit:
+                    return hit
+
+        self._count(category, "misses")
+        return None
+
+    def set(self, key: str, text: str, model: str, ttl: int, category: Optional[str] = None):
+        if ttl <= 0 or not text:
+            return
+        expires_at = self._store_fresh(key, text, model, ttl, category)
+
+        redis = self._get_redis()
+        if redis:
+            redis.set(REDIS_KEY_PREFIX + key, {"text": text, "model": model, "expires_at": expires_at}, expire=ttl)
+
+    async def set_async(self, key: str, text: str, model: str, ttl: int, category: Optional[str] = None):
+        if ttl <= 0 or not text:
+            return
+        expires_at = self._store_fresh(key, text, model, ttl, category)
+
+        redis = self._get_async_redis()
+        if redis:
+            await redis.set(REDIS_KEY_PREFIX + key, {"text": text, "model": model, "expires_at": expires_at}, expire=ttl)
+
+    def _lookup_local(self, keys: List[str], category: Optional[str], now: float) -> Optional[CachedResponse]:
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if not entry:
+                    continue
+                expires_at, text, model = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._count_locked(category, "hits")
+                    return CachedResponse(text, model)
+                del self._entries[key]
+        return None
+
+    def _redis_hit(self, key: str, data: Optional[Dict[str, Any]], category: Optional[str], now: float) -> Optional[CachedResponse]:
+        if data and data.get("expires_at", 0) > now:
+            self._store_local(key, data["expires_at"], data["text"], data.get("model", ""))
+            self._count(category, "redis_hits")
+            return CachedResponse(data["text"], data.get("model", ""))
+        return None
+
+    def _store_fresh(self, key: str, text: str, model: str, ttl: int, category: Optional[str]) -> float:
+        expires_at = time.time() + ttl
+        self._store_local(key, expires_at, text, model)
+        self._count(category, "stores")
+        return expires_at
+
+    def skip(self, category: Optional[str] = None):
+        """Record a request that bypassed the cache (opted out or high temperature)"""
+        self._count(category, "bypassed")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            categories = {name: dict(counts) for name, counts in self._stats.items()}
+            size = len(self._entries)
+        totals = {"hits": 0, "redis_hits": 0, "misses": 0, "stores": 0, "bypassed": 0, "evictions": 0}
+        for counts in categories.values():
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+        lookups = totals["hits"] + totals["redis_hits"] + totals["misses"]
+        return {
+            "enabled": self.enabled,
+            "redis_tier": self._get_async_redis() is not None and self._async_redis.healthy,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hit_rate": round((totals["hits"] + totals["redis_hits"]) / lookups, 4) if lookups else 0.0,
+            "totals": totals,
+            "categories": categories,
+            "ttls": dict(CATEGORY_TTLS, default=LLM_CACHE_DEFAULT_TTL)
+        }
+
+    def _store_local(self, key: str, expires_at: float, text: str, model: str):
+        with self._lock:
+            self._entries[key] = (expires_at, text, model)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._count_locked(None, "evictions")
+
+    def _count(self, category: Optional[str], field: str):
+        with self._lock:
+            self._count_locked(category, field)
+
+    def _count_locked(self, category: Optional[str], field: str):
+        counts = self._stats.setdefault(category or "default", {})
+        counts[field] = counts.get(field, 0) + 1
+
+    def _get_redis(self):
+        """Lazily attach to the shared RedisClient; stays local-only if Redis is down"""
+        if not self.use_redis:
+            return None
+        if self._redis is None:
+            try:
+                from app.services.redis_service import get_redis_client
+                self._redis = get_redis_client()
+            except Exception as e:
+                print(f"⚠ LLM cache Redis tier unavailable: {e}")
+                self.use_redis = False
+                return None
+        return self._redis if self._redis.client else None
+
+    def _get_async_redis(self):
+        """
+        The pooled AsyncRedisClient for the event-loop paths. Its methods check availability
+        themselves (and probe for a reconnect), so this doesn't touch `client`.
+        """
+        if not self.use_redis:
+            return None
+        if self._async_redis is None:
+            try:
+                from app.services.redis_service import get_async_redis_client
+                self._async_redis = get_async_redis_client()
+            except Exception as e:
+                print(f"⚠ LLM cache Redis tier unavailable: {e}")
+                self.use_redis = False
+                return None
+        return self._async_redis
+
+
+# Singleton instance
+_cache_instance = None
+
+def get_response_cache() -> ResponseCache:
+    """Get or create singleton LLM response cache"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ResponseCache()
+    return _cache_instance
@@ -4,11 +4,16 @@ from fastapi.responses import JSONResponse
 from typing import Optional, Dict, Any, List
 import logging
 import json
-from .core.swarm_orchestrator import get_or_create_orchestrator, delete_session, _sessions
+import asyncio
+from .core.swarm_orchestrator import get_or_create_orchestrator, delete_session, get_session_registry, _sessions
 from .supabase_config import supabase_admin
 import sys
 from pathlib import Path
-from .middleware.rbac import require_permission, Permission
+from .middleware.rbac import require_permission, Permission, get_current_user, check_permission
+from .services.broadcast import get_broadcast_backend, is_missed
+from .websocket.outbound import OutboundConnection, fan_out
+from .services.typing_stream import TypingStream
+from .utils.log_archive import get_log_compactor
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Form, Depends, Request
 
 # Configure logging
@@ -66,35 +71,175 @@ app.include_router(utils_router, prefix="/api")
 app.include_router(candidates_router, prefix="/api")
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+    """
+    Sockets connected to this worker, per session. Broadcasts go through the
+    broadcast backend (Redis pub/sub across workers) and come back via deliver_local,
+    which serializes once and hands the text to each socket's outbound queue.
+    """
+    def __init__(self, backend=None):
+        self.active_connections: Dict[str, Dict[WebSocket, OutboundConnection]] = {}
+        # Sockets still receiving their replay; live messages are held back meanwhile
+        self._replaying: Dict[WebSocket, List[dict]] = {}
+        self.backend = backend or get_broadcast_backend()
+        self.backend.bind(self.deliver_local)
+        # Candidate typing per session (debounced diff frames), for candidates connected here
+        self.typing_streams: Dict[str, TypingStream] = {}
 
-    async def connect(self, websocket: WebSocket, session_id: str):
+    async def connect(self, websocket: WebSocket, session_id: str, last_seq: Optional[int] = None,
+                      epoch: Optional[str] = None):
         await websocket.accept()
+        outbound = OutboundConnection(websocket, on_close=lambda conn: self._dropped(conn, session_id))
+        outbound.start()
         if session_id not in self.active_connections:
-            self.active_connections[session_id] = []
-        self.active_connections[session_id].append(websocket)
+            self.active_connections[session_id] = {}
+            await self.backend.subscribe(session_id)
+        if last_seq is not None:
+            self._replaying[websocket] = []
+        self.active_connections[session_id][websocket] = outbound
+        if last_seq is not None:
+            await self._replay(outbound, session_id, last_seq, epoch)
+        stream = self.typing_streams.get(session_id)
+        if stream:
+            # Typing diffs only apply on top of the current version
+            outbound.send(stream.keyframe())
+
+    async def _replay(self, outbound: OutboundConnection, session_id: str, last_seq: int, epoch: Optional[str]):
+        """Queue what a reconnecting client missed, then the live messages that arrived meanwhile"""
+        websocket = outbound.websocket
+        try:
+            for message in await self.backend.replay(session_id, last_seq, epoch):
+                outbound.send(message, bounded=False)
+                epoch, last_seq = message.get("epoch"), message["seq"]
+            for message in self._replaying.get(websocket, []):
+                if is_missed(message, epoch, last_seq):
+                    outbound.send(message, bounded=False)
+        except Exception as e:
+            logger.error(f"Error replaying to connection: {e}")
+        finally:
+            self._replaying.pop(websocket, None)
+
+    def send(self, websocket: WebSocket, session_id: str, message: dict):
+        """Queue a message for one socket (behind any broadcasts already queued for it)"""
+        outbound = self.active_connections.get(session_id, {}).get(websocket)
+        if outbound:
+            outbound.send(message)
+
+    async def disconnect(self, websocket: WebSocket, session_id: str):
+        outbound = self.active_connections.get(session_id, {}).get(websocket)
+        if outbound:
+            outbound.close()
+        if self._forget(websocket, session_id):
+            await self.backend.unsubscribe(session_id)
 
-    def disconnect(self, websocket: WebSocket, session_id: str):
-        if session_id in self.active_connections:
-            self.active_connections[session_id].remove(websocket)
-            if not self.active_connections[session_id]:
-                del self.active_connections[session_id]
+    def _forget(self, websocket: WebSocket, session_id: str) -> bool:
+        """Remove a socket; True if it was the session's last one on this worker"""
+        self._replaying.pop(websocket, None)
+        connections = self.active_connections.get(session_id)
+        if connections is None:
+            return False
+        connections.pop(websocket, None)
+        if connections:
+            return False
+        del self.active_connections[session_id]
+        stream = self.typing_streams.pop(session_id, None)
+        if stream:
+            stream.close()
+        return True
+
+    def _dropped(self, outbound: OutboundConnection, session_id: str):
+        """A slow consumer was closed by its outbound queue"""
+        if self._forget(outbound.websocket, session_id):
+            asyncio.create_task(self.backend.unsubscribe(session_id))
 
     async def broadcast(self, message: dict, session_id: str):
-        if session_id in self.active_connections:
-            for connection in self.active_connections[session_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to connection: {e}")
+        try:
+            await self.backend.publish(session_id, message)
+        except Exception as e:
+            logger.error(f"Error publishing broadcast: {e}")
+
+    def typing_stream(self, session_id: str) -> TypingStream:
+        stream = self.typing_streams.get(session_id)
+        if stream is None:
+            async def publish(frame: dict):
+                await self.broadcast(frame, session_id)
+            stream = self.typing_streams[session_id] = TypingStream(publish)
+        return stream
+
+    async def deliver_local(self, session_id: str, message: dict):
+        """Write a (sequenced or ephemeral) message to this worker's sockets for the session"""
+        connections = self.active_connections.get(session_id)
+        if not connections:
+            return
+        ready = []
+        for websocket, outbound in list(connections.items()):
+            pending = self._replaying.get(websocket)
+            if pending is not None:
+                pending.append(message)
+            else:
+                ready.append(outbound)
+        fan_out(ready, message)
+
+    def stats(self) -> dict:
+        connections = [o for conns in self.active_connections.values() for o in conns.values()]
+        return {
+            "sessions": len(self.active_connections),
+            "connections": len(connections),
+            "queued_frames": sum(o.pending for o in connections),
+            "max_queue": max((o.pending for o in connections), default=0),
+            "coalesced_frames": sum(o.coalesced for o in connections),
+            "typing": {sid: stream.stats() for sid, stream in self.typing_streams.items()},
+        }
 
 manager = ConnectionManager()
 
+@app.on_event("startup")
+async def start_session_sweeper():
+    # Idle eviction and session lease renewal for this worker
+    get_session_registry().start_sweeper()
+
+@app.on_event("startup")
+async def start_prompt_refresher():
+    # Preload active prompt templates and poll for edits, so lookups don't hit Supabase
+    from .prompts.prompt_service import get_prompt_service
+    get_prompt_service().start_refresher()
+
+@app.on_event("startup")
+async def start_log_compactor():
+    # Archive finished sessions out of the event log, off the request path
+    get_log_compactor().start()
+
+@app.on_event("shutdown")
+async def flush_sessions():
+    # Hand sessions back to Redis so another worker can pick them up immediately
+    await get_session_registry().flush_all()
+    await manager.backend.close()
+    from .services.redis_service import get_async_redis_client
+    await get_async_redis_client().close()
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "version": "1.0.0-swarmhire"}
 
+@app.get("/api/llm/providers")
+async def llm_provider_status():
+    """Circuit breaker state, latency EWMA/p95 and routing order of each LLM provider"""
+    try:
+        from .llm.llm_router import get_llm_router
+        return get_llm_router().get_provider_status()
+    except Exception as e:
+        logger.error(f"Error fetching LLM provider status: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.get("/api/debug/websockets")
+async def debug_websockets():
+    """Sockets on this worker and their outbound queue depth"""
+    return manager.stats()
+
+@app.get("/api/debug/log-compaction")
+async def debug_log_compaction():
+    """Result of this worker's last event log compaction run"""
+    return get_log_compactor().last_run
+
 @app.get("/api/debug/dump")
 async def debug_dump_sessions():
     """Dump all active in-memory sessions for debugging"""
@@ -107,13 +252,22 @@ async def debug_dump_sessions():
                     "phase": orc.current_phase,
                     "rounds": f"{orc.rounds_completed}/{orc.total_rounds}",
                     "last_response": orc.last_response,
-                    "history_len": len(orc.context.history)
+                    "history_len": len(orc.context.history),
+                    "context_window": orc.context.window.stats()
                 } for sid, orc in _sessions.items()
             }
         }
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/api/debug/sessions/memory")
+async def debug_session_memory():
+    """Per-worker session cache size, eviction/ownership counters and approximate memory per session"""
+    try:
+        return get_session_registry().stats()
+    except Exception as e:
+        return {"error": str(e)}
+
 @app.get("/api/debug/session/{session_id}")
 async def debug_get_session(session_id: str):
     """Get full state of a specific session"""
@@ -253,11 +407,26 @@ def get_jds():
 
 @app.get("/api/positions/{position_id}/candidates")
 @require_permission(Permission.MANAGE_POSITION)
-async def get_position_candidates(request: Request, position_id: str, current_user: dict = None):
+async def get_position_candidates(
+    request: Request,
+    position_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    search: Optional[str] = None,
+    min_score: Optional[int] = None,
+    with_total: bool = False,
+    current_user: dict = None
+):
     """
-    Get candidates for a specific position with fast SQL-based domain filtering.
+    Get candidates for a specific position, filtered and paginated in SQL.
+    
+    Domain relevance uses the ingest-time resumes.domain_tags column, search uses the
+    full-text search_vector, and pages are keyset-paginated on (created_at, id):
+    pass the returned next_cursor back as ?cursor= for the next page.
     """
     try:
+        from .utils.domain_tags import detect_position_domain
+        
         # 1. Get Position details (org_id, title)
         pos_res = supabase_admin.table('requirements').select('org_id, title').eq('id', position_id).single().execute()
         if not pos_res.data:
@@ -265,66 +434,96 @@ async def get_position_candidates(request: Request, position_id: str, current_us
         
         org_id = pos_res.data['org_id']
         pos_title = pos_res.data['title']
+        limit = max(1, min(limit, 200))
+        # Scores are per position (ATS scoring jobs); the top-level match_score is whichever ran last.
+        # The id is spliced into a JSON path, so only a well-formed UUID is accepted.
+        import uuid
+        try:
+            score_path = f'analyst_output->position_scores->"{uuid.UUID(position_id)}"->match_score'
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid position id")
+        
+        # 2. Narrow projection: never ship parsed resume text for a list view
+        query = supabase_admin.table('resumes').select(
+            'id, candidate_name, experience_years, skills, created_at, '
+            f'match_score:{score_path}, language:analyst_output->>language',
+            count='exact' if with_total else None
+        ).eq('org_id', org_id).is_('deleted_at', 'null')
+        
+        # 3. Domain filter to prevent cross-industry noise (Marketing resume for HR role)
+        domain = detect_position_domain(pos_title)
+        if domain:
+            query = query.contains('domain_tags', [domain])
+        
+        if search:
+            query = query.text_search('search_vector', search, options={"type": "websearch", "config": "english"})
+        
+        if min_score is not None:
+            query = query.gte(score_path, min_score)
         
-        # 2. Extract domain keywords from title to prevent cross-industry noise
-        # Basic domains: Engineering, HR, Sales, Design
-        keywords = []
-        if any(term in pos_title.lower() for term in ['engineer', 'dev', 'software', 'tech', 'data']):
-            keywords = ['engineer', 'developer', 'software', 'technical']
-        elif any(term in pos_title.lower() for term in ['hr', 'recruiter', 'people', 'talent', 'staffing']):
-            keywords = ['hr', 'recruiter', 'human resources', 'talent']
-        elif any(term in pos_title.lower() for term in ['marketing', 'brand', 'content']):
-            keywords = ['marketing', 'content', 'seo', 'social media']
-        elif any(term in pos_title.lower() for term in ['sales', 'account executive', 'business development']):
-            keywords = ['sales', 'business development', 'account executive']
-
-        # 3. Query Resumes for this ORG
-        # Use simple ILIKE filter on candidate_name or parsed_text if pool is huge
-        # For now, we fetch all in org and do basic keyword filtering in Python for speed
-        resumes_res = supabase_admin.table('resumes').select('*').eq('org_id', org_id).is_('deleted_at', 'null').execute()
+        # 4. Keyset pagination (stable under concurrent inserts, O(limit) per page)
+        if cursor:
+            cursor_ts, cursor_id = _decode_candidate_cursor(cursor)
+            query = query.or_(f'created_at.lt."{cursor_ts}",and(created_at.eq."{cursor_ts}",id.lt.{cursor_id})')
+        
+        resumes_res = query.order('created_at', desc=True).order('id', desc=True).limit(limit + 1).execute()
+        rows = resumes_res.data or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         
         candidates = []
-        for row in resumes_res.data:
-            parsed_data = row.get('parsed_data') or {}
-            resume_text = parsed_data.get('text', '').lower()
-            candidate_name = row.get('candidate_name', 'Unnamed').lower()
-            
-            # Domain Filter: If keywords exist, check if name or text matches at least one
-            is_relevant = True
-            if keywords:
-                is_relevant = any(k in resume_text or k in candidate_name for k in keywords)
-            
-            # Skip only if definitely irrelevant (Marketing resume for HR role)
-            if not is_relevant:
-                continue
-                
-            match_score = None
-            # Check for existing match score in analyst_output
-            if row.get('analyst_output') and isinstance(row['analyst_output'], dict):
-                 match_score = row['analyst_output'].get('match_score')
-            
-            analyst_output = row.get('analyst_output') or {}
-            
+        for row in rows:
+            match_score = row.get('match_score')
             candidates.append({
                 "id": row['id'],
-                "name": row.get('candidate_name', 'Unknown'),
+                "name": row.get('candidate_name') or 'Unknown',
                 "experience_level": "senior" if (row.get('experience_years', 0) or 0) > 5 else "mid",
-                "skills": row.get('skills', [])[:5],
-                "language": analyst_output.get('language', 'English'),
+                "skills": (row.get('skills') or [])[:5],
+                "language": row.get('language') or 'English',
                 "match_score": match_score,
                 "status": "ready" if match_score is not None else "pending"
             })
-            
-        return {"candidates": candidates, "position_title": pos_title}
+        
+        response = {
+            "candidates": candidates,
+            "position_title": pos_title,
+            "next_cursor": _encode_candidate_cursor(rows[-1]) if has_more else None,
+            "has_more": has_more
+        }
+        if with_total:
+            response["total"] = resumes_res.count
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch position candidates: {e}")
-        return {"candidates": []}
+        return {"candidates": [], "next_cursor": None, "has_more": False}
+
+def _encode_candidate_cursor(row: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    import base64
+    raw = json.dumps([row['created_at'], row['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_candidate_cursor(cursor: str):
+    import base64
+    import uuid
+    from datetime import datetime
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        # Values are spliced into a PostgREST filter; only accept well-formed ones
+        datetime.fromisoformat(created_at)
+        return created_at, str(uuid.UUID(row_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @app.post("/api/candidates/{candidate_id}/score")
 @require_permission(Permission.START_SESSION)
 async def score_candidate(request: Request, candidate_id: str, data: Dict[str, Any] = Body(...)):
     """
     Trigger async AI scoring for a specific candidate vs JD.
+    With "position_id" the score is stored for that position (analyst_output.position_scores,
+    what the position candidate list reads), with the same JD/resume hashes bulk jobs use.
     """
     try:
         from .engine.agents.strategy import get_strategy_agent
@@ -333,6 +532,13 @@ async def score_candidate(request: Request, candidate_id: str, data: Dict[str, A
         jd_text = data.get("jd_text")
         if not jd_text:
             raise HTTPException(status_code=400, detail="JD text required")
+        position_id = data.get("position_id")
+        if position_id:
+            import uuid
+            try:
+                position_id = str(uuid.UUID(position_id))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid position id")
             
         # Get resume
         res = supabase_admin.table('resumes').select('*').eq('id', candidate_id).single().execute()
@@ -346,21 +552,111 @@ async def score_candidate(request: Request, candidate_id: str, data: Dict[str, A
         match_score = analysis.get("match_score", 0)
         
         # Save score back to DB for future use
-        analyst_output = res.data.get('analyst_output', {})
-        if not analyst_output: analyst_output = {}
-        analyst_output['match_score'] = match_score
-        analyst_output['explanation'] = analysis.get('explanation')
-        
-        supabase_admin.table('resumes').update({"analyst_output": analyst_output}).eq('id', candidate_id).execute()
+        if position_id:
+            from .services.ats_scoring import ATSScoringService, AUDIT_FAILURE_EXPLANATIONS
+            from .utils.jd_hasher import hash_jd, hash_resume
+            # A failed audit isn't stored, so the candidate stays pending and is retried
+            if analysis.get('explanation') not in AUDIT_FAILURE_EXPLANATIONS:
+                row = ATSScoringService.scored_row(res.data, analysis, hash_jd(jd_text), hash_resume(resume_text))
+                supabase_admin.rpc('apply_resume_scores', {'p_position_id': position_id, 'p_scores': [row]}).execute()
+        else:
+            analyst_output = res.data.get('analyst_output', {})
+            if not analyst_output: analyst_output = {}
+            analyst_output['match_score'] = match_score
+            analyst_output['explanation'] = analysis.get('explanation')
+            
+            supabase_admin.table('resumes').update({"analyst_output": analyst_output}).eq('id', candidate_id).execute()
         
         return {
             "match_score": match_score,
             "explanation": analysis.get("explanation")
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Candidate scoring failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/positions/{position_id}/score-all")
+@require_permission(Permission.MANAGE_POSITION)
+async def score_all_candidates(request: Request, position_id: str, data: Dict[str, Any] = Body(default={})):
+    """
+    Start a bulk ATS scoring job for every candidate of a position.
+    Resumes are pre-ranked lexically and only the best "top_k" (default ATS_PRERANK_TOP_K,
+    0 = all) get an LLM audit. Resumes already scored against the same JD (by JD and resume
+    hash) are skipped unless "force" is set. Returns the job handle; progress streams on
+    /ws/scoring-jobs/{job_id}.
+    """
+    try:
+        from .services.ats_scoring import get_ats_scoring_service
+        top_k = data.get("top_k")
+        job = get_ats_scoring_service().start_job(
+            position_id,
+            force=bool(data.get("force")),
+            top_k=int(top_k) if top_k is not None else None
+        )
+        return job.to_dict()
+    except Exception as e:
+        logger.error(f"Failed to start scoring job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _can_view_scoring_job(user: Optional[dict], job) -> bool:
+    """Same permission as starting the job (score-all), scoped to the job's position"""
+    return bool(user) and await check_permission(user, Permission.MANAGE_POSITION, job.position_id, 'position')
+
+@app.get("/api/scoring-jobs/{job_id}")
+async def get_scoring_job(request: Request, job_id: str):
+    """Current progress of a bulk scoring job"""
+    from .services.ats_scoring import get_ats_scoring_service
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    job = get_ats_scoring_service().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+    if not await _can_view_scoring_job(user, job):
+        raise HTTPException(status_code=403, detail=f"Forbidden: Missing permission '{Permission.MANAGE_POSITION}'")
+    return job.to_dict()
+
+@app.websocket("/ws/scoring-jobs/{job_id}")
+async def scoring_job_websocket(websocket: WebSocket, job_id: str):
+    """
+    Streams scoring_progress events for a bulk scoring job and closes after scoring_completed.
+    The caller is identified by X-User-ID or ?user_id= and needs MANAGE_POSITION on the job's position.
+    """
+    from .services.ats_scoring import get_ats_scoring_service
+    service = get_ats_scoring_service()
+    await websocket.accept()
+    job = service.get_job(job_id)
+    if not job:
+        await websocket.send_json({"type": "error", "message": "Scoring job not found"})
+        await websocket.close()
+        return
+    if not await _can_view_scoring_job(await get_current_user(websocket), job):
+        await websocket.send_json({"type": "error", "message": "Forbidden"})
+        await websocket.close(code=1008)
+        return
+
+    queue = service.subscribe(job_id)
+    try:
+        # Snapshot first so late subscribers see where the job is
+        done = job.status in ("completed", "failed")
+        await websocket.send_json({"type": "scoring_completed" if done else "scoring_progress", "data": job.to_dict()})
+        while not done:
+            event = await queue.get()
+            # Skip intermediate events if the client is behind; only the latest progress matters
+            while event["type"] == "scoring_progress" and not queue.empty():
+                event = queue.get_nowait()
+            await websocket.send_json(event)
+            done = event["type"] == "scoring_completed"
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Scoring job WebSocket disconnected: {job_id}")
+    except Exception as e:
+        logger.error(f"Scoring job WebSocket error: {e}")
+    finally:
+        service.unsubscribe(job_id, queue)
+
 @app.get("/api/resumes/{candidate_id}")
 async def get_resume_details(request: Request, candidate_id: str):
     """Get specific resume details for a candidate"""
@@ -575,7 +871,7 @@ async def initialize_swarm(
     """
     try:
         meta_dict = json.loads(metadata) if metadata else {}
-        orchestrator = get_or_create_orchestrator()
+        orchestrator = await get_or_create_orchestrator()
         
         # Initialize session (Analyst + Architect)
         init_result = await orchestrator.initialize_session(
@@ -599,7 +895,7 @@ async def end_interview(session_id: str, data: Dict[str, Any]):
     End an interview session and notify all participants.
     """
     try:
-        orchestrator = get_or_create_orchestrator(session_id)
+        orchestrator = await get_or_create_orchestrator(session_id)
         
         # Generate final report before ending
         final_report = await orchestrator.generate_final_report()
@@ -615,34 +911,36 @@ async def end_interview(session_id: str, data: Dict[str, Any]):
         await manager.broadcast(payload, session_id)
         
         # Clean up the orchestrator
-        delete_session(session_id)
+        await delete_session(session_id)
         
         return {"status": "success", "message": "Interview ended", "report": final_report}
     except Exception as e:
         logger.error(f"Failed to end interview: {e}")
         # Even if report generation fails, we should still try to end the session
-        delete_session(session_id)
+        await delete_session(session_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.websocket("/ws/swarm/{session_id}")
-async def swarm_websocket(websocket: WebSocket, session_id: str):
+async def swarm_websocket(websocket: WebSocket, session_id: str, last_seq: Optional[int] = None,
+                          epoch: Optional[str] = None):
     """
     WebSocket handler for real-time swarm interaction.
+    last_seq/epoch: seq (and its epoch) of the last broadcast a reconnecting client saw; missed ones are replayed.
     """
-    orchestrator = get_or_create_orchestrator(session_id)
-    await manager.connect(websocket, session_id)
+    orchestrator = await get_or_create_orchestrator(session_id)
+    await manager.connect(websocket, session_id, last_seq, epoch)
     
     try:
         # Send initial greeting or current state
         state = orchestrator.get_current_state()
         if state:
-            await websocket.send_json({
+            manager.send(websocket, session_id, {
                 "type": "swarm_response",
                 "data": state
             })
         else:
             greeting = await orchestrator.get_greeting()
-            await websocket.send_json({
+            manager.send(websocket, session_id, {
                 "type": "greeting",
                 "data": {"text": greeting}
             })
@@ -653,6 +951,10 @@ async def swarm_websocket(websocket: WebSocket, session_id: str):
             
             if message_type == "candidate_response":
                 text = data.get("text")
+                # Re-resolve each turn: the session may have been evicted or handed to another worker
+                orchestrator = await get_or_create_orchestrator(session_id)
+                # Pending typing would land after the answer and look like new typing
+                manager.typing_stream(session_id).reset()
                 
                 # Broadcast the candidate's answer to all views (especially Expert)
                 await manager.broadcast({
@@ -660,7 +962,30 @@ async def swarm_websocket(websocket: WebSocket, session_id: str):
                     "data": {"text": text}
                 }, session_id)
                 
-                result = await orchestrator.process_candidate_input(text)
+                # Stream the Executioner's reply as it is generated
+                token_index = 0
+
+                async def forward_token(chunk: str):
+                    nonlocal token_index
+                    await manager.broadcast({
+                        "type": "swarm_token",
+                        "data": {"text": chunk, "index": token_index}
+                    }, session_id)
+                    token_index += 1
+
+                async def forward_correction(correction: dict):
+                    await manager.broadcast({
+                        "type": "swarm_correction",
+                        "data": correction
+                    }, session_id)
+
+                # The session can't be handed to another worker while this turn runs
+                with get_session_registry().in_turn(session_id):
+                    result = await orchestrator.process_candidate_input(
+                        text,
+                        on_token=forward_token,
+                        on_correction=forward_correction
+                    )
                 
                 # Broadcast the swarm's response to all views
                 await manager.broadcast({
@@ -669,19 +994,20 @@ async def swarm_websocket(websocket: WebSocket, session_id: str):
                 }, session_id)
                 
             elif message_type == "candidate_typing":
-                text = data.get("text")
-                await manager.broadcast({
-                    "type": "candidate_typing",
-                    "data": {"text": text}
-                }, session_id)
+                # Debounced and sent to viewers as diffs against the previous frame
+                manager.typing_stream(session_id).update(data.get("text"))
                 
     except WebSocketDisconnect:
-        manager.disconnect(websocket, session_id)
+        await manager.disconnect(websocket, session_id)
         logger.info(f"WebSocket disconnected for session: {session_id}")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        manager.disconnect(websocket, session_id)
-        await websocket.close()
+        await manager.disconnect(websocket, session_id)
+        try:
+            await websocket.close()
+        except Exception:
+            # Already closed (e.g. dropped as a slow consumer)
+            pass
 
 # ============================================================================
 # PAYMENT ENDPOINTS
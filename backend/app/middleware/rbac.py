@@ -9,9 +9,11 @@ Implements Role-Based Access Control with 5 roles:
 """
 
 from functools import wraps
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, WebSocket
+from starlette.requests import HTTPConnection
 from typing import Optional, List
 from app.supabase_config import supabase_admin
+from app.middleware.rbac_cache import get_rbac_cache
 
 # ============================================================================
 # PERMISSION CONSTANTS
@@ -80,15 +82,31 @@ ROLE_PERMISSIONS = {
 # USER CONTEXT
 # ============================================================================
 
-async def get_current_user(request: Request) -> Optional[dict]:
-    """Extract current user from request headers"""
+async def get_current_user(request: HTTPConnection) -> Optional[dict]:
+    """
+    Extract current user from request headers (served from the RBAC cache when possible).
+    WebSockets may pass ?user_id= instead, since browsers can't set handshake headers.
+    """
     user_id = request.headers.get('X-User-ID')
+    if not user_id and isinstance(request, WebSocket):
+        user_id = request.query_params.get('user_id')
     
     if not user_id:
         return None
     
+    cache = get_rbac_cache()
+    user_data = await cache.get_user_async(user_id)
+    if user_data is not None:
+        return user_data
+    
+    user_data = _load_user_context(user_id)
+    if user_data is not None:
+        await cache.set_user_async(user_id, user_data)
+    return user_data
+
+def _load_user_context(user_id: str) -> Optional[dict]:
+    """Build the user context from profiles / user_tenant_roles / user_account_assignments"""
     try:
-        from app.supabase_config import supabase_admin
         # Get user profile
         profile = supabase_admin.table('profiles').select('*').eq('id', user_id).single().execute()
         if not profile.data:
@@ -119,6 +137,30 @@ async def get_current_user(request: Request) -> Optional[dict]:
         print(f"Error fetching user: {e}")
         return None
 
+# ============================================================================
+# RESOURCE OWNERSHIP
+# ============================================================================
+
+# Only the columns access checks need, per resource row
+OWNERSHIP_COLUMNS = {
+    'interview_sessions': 'candidate_id, expert_id, position_id',
+    'positions': 'account_id',
+    'accounts': 'tenant_id',
+}
+
+async def _get_owner_row(table: str, resource_id: Optional[str]) -> Optional[dict]:
+    """Ownership columns of one row, cached (these rarely change owner)"""
+    if not resource_id:
+        return None
+    cache = get_rbac_cache()
+    row = await cache.get_resource_async(table, resource_id)
+    if row is not None:
+        return row
+    res = supabase_admin.table(table).select(OWNERSHIP_COLUMNS[table]).eq('id', resource_id).single().execute()
+    if res.data:
+        await cache.set_resource_async(table, resource_id, res.data)
+    return res.data
+
 # ============================================================================
 # PERMISSION CHECKS
 # ============================================================================
@@ -136,7 +178,7 @@ async def check_permission(
         user: User object from get_current_user
         permission: Permission constant from Permission class
         resource_id: Optional resource ID for scoped checks
-        resource_type: Optional resource type ('tenant', 'account', 'session')
+        resource_type: Optional resource type ('tenant', 'account', 'position', 'session')
     """
     # Super admin has all permissions
     if user.get('is_super_admin'):
@@ -176,8 +218,24 @@ async def check_resource_access(user: dict, resource_type: str, resource_id: str
             
             # tenant_admin can access accounts in their tenant
             if user_role == 'tenant_admin':
-                account = supabase_admin.table('accounts').select('tenant_id').eq('id', resource_id).single().execute()
-                return account.data and account.data.get('tenant_id') == tenant_id
+                account = await _get_owner_row('accounts', resource_id)
+                return bool(account) and account.get('tenant_id') == tenant_id
+            
+            return False
+        
+        elif resource_type == 'position':
+            # account_admin can access positions of assigned accounts
+            # tenant_admin can access positions of accounts in their tenant
+            position = await _get_owner_row('positions', resource_id)
+            if not position:
+                return False
+            
+            if user_role == 'account_admin':
+                return position.get('account_id') in user.get('managed_accounts', [])
+            
+            if user_role == 'tenant_admin':
+                account = await _get_owner_row('accounts', position.get('account_id'))
+                return bool(account) and account.get('tenant_id') == tenant_id
             
             return False
         
@@ -186,28 +244,28 @@ async def check_resource_access(user: dict, resource_type: str, resource_id: str
             # tenant_admin can access sessions in their tenant
             # account_admin can access sessions for their accounts
             # candidate can access their own sessions
-            session = supabase_admin.table('interview_sessions').select('*').eq('id', resource_id).single().execute()
-            if not session.data:
+            session = await _get_owner_row('interview_sessions', resource_id)
+            if not session:
                 return False
             
             if user_role == 'candidate':
-                return session.data.get('candidate_id') == user_id
+                return session.get('candidate_id') == user_id
             
             if user_role == 'HITL_expert':
-                return session.data.get('expert_id') == user_id
+                return session.get('expert_id') == user_id
             
             if user_role == 'account_admin':
-                position = supabase_admin.table('positions').select('account_id').eq('id', session.data.get('position_id')).single().execute()
-                if position.data:
+                position = await _get_owner_row('positions', session.get('position_id'))
+                if position:
                     managed_accounts = user.get('managed_accounts', [])
-                    return position.data.get('account_id') in managed_accounts
+                    return position.get('account_id') in managed_accounts
             
             if user_role == 'tenant_admin':
                 # Check if session's account belongs to user's tenant
-                position = supabase_admin.table('positions').select('account_id').eq('id', session.data.get('position_id')).single().execute()
-                if position.data:
-                    account = supabase_admin.table('accounts').select('tenant_id').eq('id', position.data.get('account_id')).single().execute()
-                    return account.data and account.data.get('tenant_id') == tenant_id
+                position = await _get_owner_row('positions', session.get('position_id'))
+                if position:
+                    account = await _get_owner_row('accounts', position.get('account_id'))
+                    return bool(account) and account.get('tenant_id') == tenant_id
             
             return False
     
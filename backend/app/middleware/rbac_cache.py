@@ -0,0 +1,247 @@
+"""
+Cache for RBAC lookups (in-process TTL tier + optional Redis tier)
+
+get_current_user needs 2-3 Supabase queries per request and resource checks
+up to three more. Both answers change rarely: user contexts only when a
+super_admin reassigns roles (which invalidates them explicitly), ownership
+rows (session -> position -> account -> tenant) practically never.
+
+The in-process tier is kept short-lived because other workers only see an
+invalidation through the Redis tier.
+"""
+import os
+import copy
+import time
+import threading
+from typing import Dict, Optional, Any, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RBAC_CACHE_ENABLED = os.getenv("RBAC_CACHE_ENABLED", "true").lower() == "true"
+RBAC_CACHE_USE_REDIS = os.getenv("RBAC_CACHE_USE_REDIS", "true").lower() == "true"
+# Seconds an entry lives in this process / in Redis
+RBAC_CACHE_LOCAL_TTL = int(os.getenv("RBAC_CACHE_LOCAL_TTL", 30))
+RBAC_CACHE_REDIS_TTL = int(os.getenv("RBAC_CACHE_REDIS_TTL", 300))
+RBAC_CACHE_MAX_ENTRIES = int(os.getenv("RBAC_CACHE_MAX_ENTRIES", 5000))
+
+REDIS_KEY_PREFIX = "rbac:"
+
+
+class RBACCache:
+    """
+    Two namespaces:
+      user:<user_id>               -> user context built by get_current_user
+      res:<resource_type>:<id>     -> ownership columns of a session/position/account row
+
+    Values are deep-copied on the way in and out, since callers mutate user dicts.
+    """
+
+    def __init__(self, local_ttl: int = RBAC_CACHE_LOCAL_TTL, redis_ttl: int = RBAC_CACHE_REDIS_TTL,
+                 use_redis: bool = RBAC_CACHE_USE_REDIS, enabled: bool = RBAC_CACHE_ENABLED,
+                 max_entries: int = RBAC_CACHE_MAX_ENTRIES):
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        self._async_redis = None
+        self._stats = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    # ------------------------------------------------------------------
+    # User contexts
+    # ------------------------------------------------------------------
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self._get(f"user:{user_id}")
+
+    def set_user(self, user_id: str, user_data: dict):
+        self._set(f"user:{user_id}", user_data)
+
+    async def get_user_async(self, user_id: str) -> Optional[dict]:
+        """get_user for the request path: the Redis tier is read with the async client"""
+        return await self._get_async(f"user:{user_id}")
+
+    async def set_user_async(self, user_id: str, user_data: dict):
+        await self._set_async(f"user:{user_id}", user_data)
+
+    def invalidate_user(self, user_id: str):
+        """Call after changing a user's profile, tenant role or account assignments"""
+        self._delete(f"user:{user_id}")
+
+    # ------------------------------------------------------------------
+    # Resource ownership
+    # ------------------------------------------------------------------
+
+    def get_resource(self, resource_type: str, resource_id: str) -> Optional[dict]:
+        return self._get(f"res:{resource_type}:{resource_id}")
+
+    def set_resource(self, resource_type: str, resource_id: str, row: dict):
+        self._set(f"res:{resource_type}:{resource_id}", row)
+
+    async def get_resource_async(self, resource_type: str, resource_id: str) -> Optional[dict]:
+        """get_resource for the request path: the Redis tier is read with the async client"""
+        return await self._get_async(f"res:{resource_type}:{resource_id}")
+
+    async def set_resource_async(self, resource_type: str, resource_id: str, row: dict):
+        await self._set_async(f"res:{resource_type}:{resource_id}", row)
+
+    def invalidate_resource(self, resource_type: str, resource_id: str):
+        """Call after moving a session/position/account to a different owner"""
+        self._delete(f"res:{resource_type}:{resource_id}")
+
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats["hits"] + stats["redis_hits"] + stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "redis_tier": self._get_async_redis() is not None and self._async_redis.healthy,
+            "entries": size,
+            "local_ttl": self.local_ttl,
+            "redis_ttl": self.redis_ttl,
+            "hit_rate": round((stats["hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0,
+            **stats
+        }
+
+    def _get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self._get_local(key)
+        if value is not None:
+            return value
+
+        redis = self._get_redis()
+        if redis:
+            value = redis.get(REDIS_KEY_PREFIX + key)
+            if value is not None:
+                return self._redis_hit(key, value)
+
+        self._count("misses")
+        return None
+
+    async def _get_async(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self._get_local(key)
+        if value is not None:
+            return value
+
+        redis = self._get_async_redis()
+        if redis:
+            value = await redis.get(REDIS_KEY_PREFIX + key)
+            if value is not None:
+                return self._redis_hit(key, value)
+
+        self._count("misses")
+        return None
+
+    def _set(self, key: str, value: Any):
+        if not self.enabled or value is None:
+            return
+        self._store_local(key, copy.deepcopy(value))
+        redis = self._get_redis()
+        if redis:
+            redis.set(REDIS_KEY_PREFIX + key, value, expire=self.redis_ttl)
+
+    async def _set_async(self, key: str, value: Any):
+        if not self.enabled or value is None:
+            return
+        self._store_local(key, copy.deepcopy(value))
+        redis = self._get_async_redis()
+        if redis:
+            await redis.set(REDIS_KEY_PREFIX + key, value, expire=self.redis_ttl)
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._stats["hits"] += 1
+                    return copy.deepcopy(entry[1])
+                del self._entries[key]
+        return None
+
+    def _redis_hit(self, key: str, value: Any) -> Any:
+        # The caller gets the freshly decoded value; the local tier keeps its own copy
+        self._store_local(key, copy.deepcopy(value))
+        self._count("redis_hits")
+        return value
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._stats["invalidations"] += 1
+        redis = self._get_redis()
+        if redis:
+            redis.delete(REDIS_KEY_PREFIX + key)
+
+    def _store_local(self, key: str, value: Any):
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop expired entries first, then the oldest insertion
+                now = time.time()
+                for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                    del self._entries[stale]
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.time() + self.local_ttl, value)
+
+    def _get_redis(self):
+        """Lazily attach to the shared RedisClient; stays local-only if Redis is down"""
+        if not self.use_redis:
+            return None
+        if self._redis is None:
+            try:
+                from app.services.redis_service import get_redis_client
+                self._redis = get_redis_client()
+            except Exception as e:
+                print(f"⚠ RBAC cache Redis tier unavailable: {e}")
+                self.use_redis = False
+                return None
+        return self._redis if self._redis.client else None
+
+    def _get_async_redis(self):
+        """
+        The pooled AsyncRedisClient for the request path. Its methods check availability
+        themselves (and probe for a reconnect), so this doesn't touch `client`.
+        """
+        if not self.use_redis:
+            return None
+        if self._async_redis is None:
+            try:
+                from app.services.redis_service import get_async_redis_client
+                self._async_redis = get_async_redis_client()
+            except Exception as e:
+                print(f"⚠ RBAC cache Redis tier unavailable: {e}")
+                self.use_redis = False
+                return None
+        return self._async_redis
+
+
+# Singleton instance
+_rbac_cache = None
+
+def get_rbac_cache() -> RBACCache:
+    """Get or create singleton RBAC cache"""
+    global _rbac_cache
+    if _rbac_cache is None:
+        _rbac_cache = RBACCache()
+    return _rbac_cache
@@ -194,6 +194,9 @@ class Prompt:
     updated_at: Optional[str] = None
     notes: Optional[str] = None
     
+    # Compiled template (see template_plan.compile_prompt); not part of the stored prompt
+    render_plan: Any = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now().isoformat()
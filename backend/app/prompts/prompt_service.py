@@ -3,14 +3,21 @@ Prompt Service - Supabase-backed service for managing and rendering prompts.
 
 Provides:
 - Loading prompts from Supabase 'prompt_templates' table
-- Variable interpolation with truncation
+- Variable interpolation with truncation (templates precompiled into render plans)
 - Runtime override of generation config and knobs
-- Caching for performance
+- Caching for performance: every active template is preloaded and kept current by
+  polling for rows whose updated_at is past the last one seen, so get_prompt and
+  render never wait on Supabase while the cache is fresh (PROMPT_CACHE_TTL).
+  Edits are only seen if they bump updated_at (trigger from migration 015)
 """
 
+import os
 import json
 import re
-from typing import Dict, List, Optional, Any
+import time
+import asyncio
+import threading
+from typing import Dict, List, Optional, Any, Tuple
 from app.supabase_config import supabase_admin
 
 from app.prompts.models import (
@@ -20,6 +27,14 @@ from app.prompts.models import (
     PromptKnobs,
     PromptVariable
 )
+from app.prompts.template_plan import compile_prompt, truncation_limits
+
+# How long cached lookups are trusted without a successful poll (then get_prompt queries again)
+PROMPT_CACHE_TTL = float(os.getenv("PROMPT_CACHE_TTL", 300))
+# How often the background refresher polls prompt_templates for changed rows
+PROMPT_POLL_INTERVAL = float(os.getenv("PROMPT_POLL_INTERVAL", 30))
+# Full reload period (catches deleted rows, which the watermark can't see)
+PROMPT_FULL_RELOAD_INTERVAL = float(os.getenv("PROMPT_FULL_RELOAD_INTERVAL", 3600))
 
 
 class PromptService:
@@ -29,13 +44,30 @@ class PromptService:
     Prompts are stored in the 'prompt_templates' table.
     """
     
-    def __init__(self):
+    def __init__(self, admin=None, ttl: float = PROMPT_CACHE_TTL, poll_interval: float = PROMPT_POLL_INTERVAL,
+                 full_reload_interval: float = PROMPT_FULL_RELOAD_INTERVAL):
         """Initialize the PromptService with Supabase admin client."""
-        self.admin = supabase_admin
+        self.admin = admin or supabase_admin
         self.table_name = "prompt_templates"
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.full_reload_interval = full_reload_interval
         
         # Cache loaded prompts
         self._cache: Dict[str, Prompt] = {}
+        # (category, variant, version or None for latest) -> (active prompt or None, cached at)
+        self._lookups: Dict[Tuple[str, str, Optional[str]], Tuple[Optional[Prompt], float]] = {}
+        # Active prompts per (category, variant): version -> prompt
+        self._active: Dict[Tuple[str, str], Dict[str, Prompt]] = {}
+        self._active_keys: Dict[str, Tuple[str, str, str]] = {}   # prompt id -> where it sits in _active
+        self._preloaded = False
+        self._validated_at = float("-inf")   # last time the whole cache was checked against the table
+        self._last_full_reload = float("-inf")
+        self._watermark: Optional[str] = None  # newest updated_at seen
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.cache_hits = 0
+        self.queries = 0
     
     def get_prompt(
         self,
@@ -44,8 +76,27 @@ class PromptService:
         version: Optional[str] = None
     ) -> Optional[Prompt]:
         """
-        Get a prompt by category and variant from Supabase.
+        Get an active prompt by category and variant (the latest version unless `version`).
+        Served from the (category, variant, version) cache while it is fresh; queries
+        Supabase only on a miss before preload, or once the cache has outlived its TTL.
         """
+        category = getattr(category, "value", category)
+        key = (category, variant, version)
+        now = time.monotonic()
+        entry = self._lookups.get(key)
+        if entry is not None and now - max(entry[1], self._validated_at) < self.ttl:
+            self.cache_hits += 1
+            return entry[0]
+        if entry is None and self._preloaded and now - self._validated_at < self.ttl:
+            # Every active row is loaded and was checked recently: not there means not active
+            self.cache_hits += 1
+            self._lookups[key] = (None, now)
+            return None
+        return self._query_prompt(category, variant, version)
+    
+    def _query_prompt(self, category: str, variant: str, version: Optional[str]) -> Optional[Prompt]:
+        """One lookup straight from Supabase; the result (or its absence) is cached"""
+        self.queries += 1
         query = self.admin.table(self.table_name).select('*').eq('category', category).eq('variant', variant).eq('status', 'active')
         
         if version:
@@ -55,10 +106,115 @@ class PromptService:
             
         response = query.execute()
         
-        if response.data:
-            return self._cache_and_return_prompt(response.data[0])
-        
-        return None
+        prompt = self._cache_and_return_prompt(response.data[0]) if response.data else None
+        self._lookups[(category, variant, version)] = (prompt, time.monotonic())
+        return prompt
+    
+    def preload(self) -> int:
+        """Load every active template in one query and index it (replaces the lookup cache)"""
+        self.queries += 1
+        response = self.admin.table(self.table_name).select('*').eq('status', 'active').execute()
+        rows = response.data or []
+        now = time.monotonic()
+        with self._lock:
+            self._active, self._active_keys = {}, {}
+            for row in rows:
+                self._index_row(row)
+            lookups = {}
+            for key in self._active:
+                lookups.update(self._key_lookups(key, now))
+            self._lookups = lookups
+            self._watermark = max((row['updated_at'] for row in rows if row.get('updated_at')), default=self._watermark)
+            self._preloaded = True
+            self._validated_at = self._last_full_reload = now
+        return len(rows)
+    
+    def poll_changes(self) -> int:
+        """
+        Apply rows changed since the updated_at watermark (new versions, edits,
+        deprecations). Returns how many rows changed; the cache counts as validated.
+        """
+        if not self._preloaded or time.monotonic() - self._last_full_reload >= self.full_reload_interval:
+            return self.preload()
+        self.queries += 1
+        query = self.admin.table(self.table_name).select('*')
+        if self._watermark:
+            # gte: rows sharing the watermark timestamp may have committed after we read it
+            query = query.gte('updated_at', self._watermark)
+        rows = query.execute().data or []
+        now = time.monotonic()
+        with self._lock:
+            changed = set()
+            for row in rows:
+                previous = self._active_keys.get(row['id'])
+                current = self._cache.get(row['id'])
+                if current is not None and current.updated_at == row.get('updated_at') \
+                        and bool(previous) == (row.get('status', 'active') == 'active'):
+                    continue  # the watermark row itself, already applied
+                if previous:
+                    changed.add(previous[:2])
+                changed.add((row['category'], row['variant']))
+                self._index_row(row)
+            for key in changed:
+                # list() copies atomically; get_prompt may be adding keys from the event loop thread
+                for lookup in [k for k in list(self._lookups) if k[:2] == key]:
+                    self._lookups.pop(lookup, None)
+                self._lookups.update(self._key_lookups(key, now))
+            self._watermark = max((row['updated_at'] for row in rows if row.get('updated_at')), default=self._watermark)
+            self._validated_at = now
+        return len(changed)
+    
+    def _index_row(self, row: Dict[str, Any]):
+        """Cache a row by id and place it in (or drop it from) the active index"""
+        previous = self._active_keys.pop(row['id'], None)
+        if previous:
+            versions = self._active.get(previous[:2], {})
+            if versions.get(previous[2]) is not None and versions[previous[2]].id == row['id']:
+                del versions[previous[2]]
+        prompt = self._cache_and_return_prompt(row)
+        if row.get('status', 'active') == 'active':
+            key = (row['category'], row['variant'], row['version'])
+            self._active.setdefault(key[:2], {})[key[2]] = prompt
+            self._active_keys[row['id']] = key
+    
+    def _key_lookups(self, key: Tuple[str, str], now: float) -> Dict[Tuple[str, str, Optional[str]], Tuple[Optional[Prompt], float]]:
+        versions = self._active.get(key) or {}
+        lookups = {(*key, version): (prompt, now) for version, prompt in versions.items()}
+        if versions:
+            # Same order as the query path: order('version', desc=True)
+            lookups[(*key, None)] = (versions[max(versions)], now)
+        return lookups
+    
+    def start_refresher(self):
+        """Preload, then keep polling for changes in the background (idempotent; needs a running loop)"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+    
+    async def _refresh_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                preloaded = self._preloaded
+                changed = await loop.run_in_executor(None, self.poll_changes)
+                if not preloaded:
+                    print(f"[PromptService] Preloaded {changed} active prompt template(s)")
+                elif changed:
+                    print(f"[PromptService] Refreshed prompt templates in {changed} category/variant(s)")
+            except Exception as e:
+                print(f"[PromptService] Prompt refresh failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "preloaded": self._preloaded,
+            "active_prompts": len(self._active_keys),
+            "cached_lookups": len(self._lookups),
+            "cache_hits": self.cache_hits,
+            "queries": self.queries,
+            "watermark": self._watermark,
+            "validated_seconds_ago": round(time.monotonic() - self._validated_at, 1) if self._preloaded else None,
+        }
     
     def get_prompt_by_id(self, prompt_id: str) -> Optional[Prompt]:
         """Get a prompt by its unique ID from Supabase."""
@@ -90,6 +246,7 @@ class PromptService:
             created_at=data.get('created_at'),
             updated_at=data.get('updated_at')
         )
+        compile_prompt(prompt)
         self._cache[prompt.id] = prompt
         return prompt
     
@@ -132,18 +289,13 @@ class PromptService:
             final_config = prompt.generation_config.merge(config_overrides)
         
         final_knobs = prompt.knobs
+        limits = None
         if knob_overrides:
             final_knobs = prompt.knobs.merge(knob_overrides)
+            limits = truncation_limits(prompt.variables, final_knobs)
         
-        # Process variables with truncation
-        processed_vars = self._process_variables(
-            variables,
-            prompt.variables,
-            final_knobs
-        )
-        
-        # Render template
-        rendered_prompt = self._interpolate(prompt.template, processed_vars)
+        # Defaults, truncation and interpolation in one pass over the compiled template
+        rendered_prompt = compile_prompt(prompt).render(variables, limits)
         
         return {
             "rendered_prompt": rendered_prompt,
@@ -159,7 +311,7 @@ class PromptService:
         definitions: List[PromptVariable],
         knobs: PromptKnobs
     ) -> Dict[str, Any]:
-        """Process variables: validate, apply defaults, truncate."""
+        """Process variables: validate, apply defaults, truncate. (Uncompiled path; render() uses the plan.)"""
         result = {}
         var_defs = {v.name: v for v in definitions}
         
@@ -190,7 +342,7 @@ class PromptService:
         return result
     
     def _interpolate(self, template: str, variables: Dict[str, Any]) -> str:
-        """Interpolate variables into template."""
+        """Interpolate variables into template. (Uncompiled path; render() uses the plan.)"""
         def replace_var(match):
             full_match = match.group(1)
             if ':' in full_match:
@@ -214,8 +366,14 @@ class PromptService:
         return re.sub(pattern, replace_var, template)
     
     def reload(self) -> None:
-        """Clear cache (Supabase is source of truth)."""
-        self._cache.clear()
+        """Clear cache (Supabase is source of truth); the refresher reloads it on its next poll."""
+        with self._lock:
+            self._cache.clear()
+            self._lookups = {}
+            self._active, self._active_keys = {}, {}
+            self._preloaded = False
+            self._validated_at = float("-inf")
+            self._watermark = None
         print("[PromptService] Cache cleared")
 
 # Singleton instance
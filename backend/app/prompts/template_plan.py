@@ -0,0 +1,101 @@
+"""
+Precompiled render plans for prompt templates.
+
+A template is parsed once (same `{name}` / `{name:default}` syntax and the same
+regex as PromptService._interpolate) into literal segments and slots. Per slot the
+plan resolves up front what the per-render path used to work out on every call:
+the fallback text, the variable's declared default (already formatted) and its
+truncation limit under the prompt's knobs. Rendering is then one pass over the
+slots and a single join.
+
+Output is identical to _process_variables + _interpolate, including their quirks
+(unknown `{...}` groups such as JSON braces render as their fallback text).
+"""
+import re
+import json
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.prompts.models import Prompt, PromptKnobs, PromptVariable
+
+PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+
+_MISSING = object()
+
+
+def format_value(value: Any) -> str:
+    """How an interpolated value is written into the prompt"""
+    if isinstance(value, list):
+        return ', '.join(str(v) for v in value)
+    elif isinstance(value, dict):
+        return json.dumps(value, indent=2)
+    return str(value)
+
+
+def truncation_limits(definitions: List[PromptVariable], knobs: PromptKnobs) -> Dict[str, int]:
+    """Max length per string variable (knobs win for question/response, as in _process_variables)"""
+    limits = {v.name: v.max_length for v in definitions if v.max_length}
+    if knobs.truncate_question_length:
+        limits["question"] = knobs.truncate_question_length
+    if knobs.truncate_response_length:
+        limits["response"] = knobs.truncate_response_length
+    return limits
+
+
+class RenderPlan:
+    """A template compiled into literals and slots, for one Prompt (see compile_prompt)"""
+
+    __slots__ = ("template", "literals", "slots", "defaults", "required", "limits", "knobs")
+
+    def __init__(self, template: str, definitions: List[PromptVariable], knobs: PromptKnobs):
+        self.template = template
+        self.literals: List[str] = []
+        # (variable name, text used when the value is missing)
+        self.slots: List[Tuple[str, str]] = []
+        position = 0
+        for match in PLACEHOLDER_RE.finditer(template):
+            self.literals.append(template[position:match.start()])
+            body = match.group(1)
+            if ':' in body:
+                name, fallback = body.split(':', 1)
+            else:
+                name, fallback = body, match.group(0)
+            self.slots.append((name, fallback))
+            position = match.end()
+        self.literals.append(template[position:])
+
+        # Declared defaults are filled in only for variables not provided at all
+        self.defaults: Dict[str, str] = {v.name: format_value(v.default) for v in definitions if v.default is not None}
+        self.required = [v.name for v in definitions if v.required and v.default is None]
+        self.knobs = knobs
+        self.limits = truncation_limits(definitions, knobs)
+
+    def render(self, variables: Dict[str, Any], limits: Optional[Dict[str, int]] = None) -> str:
+        """Fill the slots; `limits` replaces the compiled truncation limits (knob overrides)"""
+        limits = self.limits if limits is None else limits
+        for name in self.required:
+            if name not in variables:
+                print(f"[PromptService] Warning: Required variable '{name}' not provided")
+        literals = self.literals
+        parts = [literals[0]]
+        for index, (name, fallback) in enumerate(self.slots, 1):
+            value = variables.get(name, _MISSING)
+            if value is _MISSING:
+                text = self.defaults.get(name, fallback)
+            elif value is None:
+                text = fallback
+            elif isinstance(value, str):
+                limit = limits.get(name)
+                text = value[:limit] if limit and len(value) > limit else value
+            else:
+                text = format_value(value)
+            parts.append(text)
+            parts.append(literals[index])
+        return ''.join(parts)
+
+
+def compile_prompt(prompt: Prompt) -> RenderPlan:
+    """The prompt's render plan, compiled on first use and kept on the Prompt"""
+    plan = prompt.render_plan
+    if plan is None or plan.template is not prompt.template:
+        plan = prompt.render_plan = RenderPlan(prompt.template, prompt.variables, prompt.knobs)
+    return plan
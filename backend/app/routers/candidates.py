@@ -5,6 +5,7 @@ from datetime import datetime
 import logging
 
 from ..middleware.rbac import require_permission, Permission
+from ..utils.domain_tags import detect_resume_domains
 
 router = APIRouter(
     prefix="/candidates",
@@ -72,6 +73,8 @@ async def create_candidate(request: Request, candidate: CandidateCreate):
             "experience_years": candidate.experience_years,
             "file_name": candidate.file_name,
             "org_id": candidate.org_id,
+            # Precomputed so position candidate lists can filter by domain in SQL
+            "domain_tags": detect_resume_domains(candidate.resume_text, candidate.name),
             "created_at": datetime.utcnow().isoformat()
         }
         
@@ -233,6 +236,17 @@ async def update_candidate(request: Request, candidate_id: str, updates: Candida
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
+        # Name or text changes can change the domain tags
+        if updates.name is not None or updates.resume_text is not None:
+            name, resume_text = updates.name, updates.resume_text
+            if name is None or resume_text is None:
+                current = supabase.table("resumes").select("candidate_name, parsed_data").eq("id", candidate_id).execute()
+                if current.data:
+                    name = name if name is not None else current.data[0].get("candidate_name")
+                    if resume_text is None:
+                        resume_text = (current.data[0].get("parsed_data") or {}).get("text", "")
+            update_data["domain_tags"] = detect_resume_domains(resume_text or "", name or "")
+        
         result = supabase.table("resumes").update(update_data).eq("id", candidate_id).execute()
         
         if not result.data:
@@ -63,7 +63,7 @@ async def create_session(request: Request, data: CreateSessionRequest = Body(...
                 pass 
                 
         # 3. Initialize Swarm Session
-        orchestrator = get_or_create_orchestrator(session_id)
+        orchestrator = await get_or_create_orchestrator(session_id)
         
         # Provide context to Swarm
         metadata = {
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from typing import List, Optional, Dict, Any
 from app.supabase_config import supabase_admin
+from app.middleware.rbac_cache import get_rbac_cache
 import logging
 
 router = APIRouter(prefix="/super-admin", tags=["super-admin"])
@@ -253,6 +254,9 @@ async def assign_user_to_tenant(
 
         # Update Profile's main tenant binding
         supabase_admin.table('profiles').update(profile_update).eq('id', target_user_id).execute()
+        # Cached RBAC contexts of everyone touched by this assignment must be rebuilt
+        rbac_cache = get_rbac_cache()
+        rbac_cache.invalidate_user(target_user_id)
 
         # If it's a global super admin with no tenant, we stop here (no tenant role to insert)
         if not db_tenant_id:
@@ -264,12 +268,14 @@ async def assign_user_to_tenant(
             print(f"DEBUG: Enforcing Single Admin constraint for Tenant {tenant_id}")
             try:
                 # Update any existing tenant_admin for this tenant to 'member'
-                supabase_admin.table('user_tenant_roles')\
+                demoted = supabase_admin.table('user_tenant_roles')\
                     .update({"role": "member"})\
                     .eq('tenant_id', tenant_id)\
                     .eq('role', 'tenant_admin')\
                     .neq('user_id', target_user_id)\
                     .execute()
+                for row in demoted.data or []:
+                    rbac_cache.invalidate_user(row['user_id'])
             except Exception as e:
                 print(f"DEBUG: Error demoting existing tenant admins: {e}")
 
@@ -297,7 +303,9 @@ async def assign_user_to_tenant(
             print(f"DEBUG: Enforcing Single Account Admin for Account {account_id}")
             try:
                 # In our schema, we'll just remove existing assignments to ensure single source of truth for 'Head'
-                supabase_admin.table('user_account_assignments').delete().eq('account_id', account_id).neq('user_id', target_user_id).execute()
+                removed = supabase_admin.table('user_account_assignments').delete().eq('account_id', account_id).neq('user_id', target_user_id).execute()
+                for row in removed.data or []:
+                    rbac_cache.invalidate_user(row['user_id'])
             except Exception as e:
                  print(f"DEBUG: Error clearing existing account admins: {e}")
 
@@ -313,6 +321,9 @@ async def assign_user_to_tenant(
             except Exception as acct_err:
                  print(f"DEBUG: Error upserting account assignment: {acct_err}")
 
+        # Writes above are done; drop the target again in case a request re-cached it mid-assignment
+        rbac_cache.invalidate_user(target_user_id)
+
         return {"status": "success", "message": f"User assigned to {tenant_id} as {role}"}
 
     except Exception as e:
@@ -320,3 +331,53 @@ async def assign_user_to_tenant(
         # Return success anyway if it partially worked? No, better to fail loud.
         # However, for debugging, let's return JSON error
         return {"status": "error", "detail": str(e)}
+
+@router.get("/rbac/cache")
+async def get_rbac_cache_stats(user_id: str = Depends(verify_super_admin)):
+    """RBAC user-context / resource-ownership cache counters"""
+    try:
+        return get_rbac_cache().stats()
+    except Exception as e:
+        logger.error(f"Failed to fetch RBAC cache stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rbac/cache/clear")
+async def clear_rbac_cache(user_id: str = Depends(verify_super_admin)):
+    """Drop the in-process RBAC cache (Redis entries expire after RBAC_CACHE_REDIS_TTL)"""
+    try:
+        get_rbac_cache().clear()
+        return {"status": "success"}
+    except Exception as e:
+        logger.error(f"Failed to clear RBAC cache: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/llm/cache")
+async def get_llm_cache_stats(user_id: str = Depends(verify_super_admin)):
+    """LLM response cache hit/miss counters, per prompt category"""
+    try:
+        from app.llm.response_cache import get_response_cache
+        return get_response_cache().stats()
+    except Exception as e:
+        logger.error(f"Failed to fetch LLM cache stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/llm/cache/clear")
+async def clear_llm_cache(user_id: str = Depends(verify_super_admin)):
+    """Drop the in-process LLM response cache and reset its counters (Redis entries expire on their own)"""
+    try:
+        from app.llm.response_cache import get_response_cache
+        get_response_cache().clear()
+        return {"status": "success"}
+    except Exception as e:
+        logger.error(f"Failed to clear LLM cache: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/llm/coalescing")
+async def get_llm_coalescing_stats(user_id: str = Depends(verify_super_admin)):
+    """Single-flight counters for IntelligenceDispatch (identical in-flight prompts sharing one call)"""
+    try:
+        from app.engine.intelligence.dispatch import get_intelligence_dispatch
+        return get_intelligence_dispatch().get_flight_stats()
+    except Exception as e:
+        logger.error(f"Failed to fetch LLM coalescing stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
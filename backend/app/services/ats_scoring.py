@@ -0,0 +1,260 @@
+"""
+Bulk ATS scoring for every candidate of a position.
+
+A job ranks all resumes in the position's org lexically (BM25 + skill coverage),
+sends only the top-K to the LLM audit with bounded concurrency and per-provider
+rate limits, skips resumes whose JD and resume hashes match the last stored
+score, and writes results back in batches through the apply_resume_scores RPC
+(migration 014), which touches only the scoring keys of live rows.
+Progress is published to subscribers (the /ws/scoring-jobs WebSocket).
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set
+
+from app.utils.jd_hasher import hash_jd, hash_resume
+from app.llm.rate_limiter import ProviderRateLimiter
+from app.services.lexical_ranker import get_org_index
+
+logger = logging.getLogger(__name__)
+
+ATS_SCORING_CONCURRENCY = int(os.getenv("ATS_SCORING_CONCURRENCY", 8))
+ATS_SCORING_UPSERT_BATCH = int(os.getenv("ATS_SCORING_UPSERT_BATCH", 50))
+ATS_SCORING_PAGE_SIZE = int(os.getenv("ATS_SCORING_PAGE_SIZE", 500))
+# Only the K best lexical matches get an LLM audit (0 = audit every resume)
+ATS_PRERANK_TOP_K = int(os.getenv("ATS_PRERANK_TOP_K", 100))
+# Requests per minute per LLM provider for bulk scoring; override per provider with
+# ATS_SCORING_PROVIDER_RPM_OVERRIDES="Qwen 2.5 7B=30;Gemma 3 27B IT=15"
+ATS_SCORING_PROVIDER_RPM = float(os.getenv("ATS_SCORING_PROVIDER_RPM", 60))
+ATS_SCORING_PROVIDER_RPM_OVERRIDES = os.getenv("ATS_SCORING_PROVIDER_RPM_OVERRIDES", "")
+
+# audit_match swallows LLM errors and returns these explanations with a 0 score
+AUDIT_FAILURE_EXPLANATIONS = {"Failed to generate analysis.", "System error during analysis."}
+
+
+@dataclass
+class ScoringJob:
+    job_id: str
+    position_id: str
+    status: str = "queued"  # queued, running, completed, failed
+    total: int = 0
+    scored: int = 0
+    skipped: int = 0
+    failed: int = 0
+    prefiltered: int = 0  # ranked below top_k, no LLM audit
+    force: bool = False
+    top_k: int = ATS_PRERANK_TOP_K
+    prerank_ms: Optional[float] = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+
+    @property
+    def processed(self) -> int:
+        return self.scored + self.skipped + self.failed + self.prefiltered
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["processed"] = self.processed
+        data["percentage"] = round(self.processed / self.total * 100, 1) if self.total else 0.0
+        return data
+
+
+class ATSScoringService:
+    """Runs and tracks bulk scoring jobs (in-process; jobs don't survive a restart)."""
+
+    def __init__(self, db=None, strategy=None):
+        self._db = db
+        self._strategy = strategy
+        self.jobs: Dict[str, ScoringJob] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def db(self):
+        if self._db is None:
+            from app.supabase_config import supabase_admin
+            self._db = supabase_admin
+        return self._db
+
+    @property
+    def strategy(self):
+        if self._strategy is None:
+            from app.engine.agents.strategy import get_strategy_agent
+            self._strategy = get_strategy_agent()
+        return self._strategy
+
+    def start_job(self, position_id: str, force: bool = False, top_k: Optional[int] = None) -> ScoringJob:
+        """Start scoring a position's candidates; returns immediately with the job handle."""
+        # One job per position at a time: a second request just gets the running job
+        for job in self.jobs.values():
+            if job.position_id == position_id and job.status in ("queued", "running"):
+                return job
+
+        job = ScoringJob(job_id=str(uuid.uuid4()), position_id=position_id, force=force,
+                         top_k=ATS_PRERANK_TOP_K if top_k is None else top_k)
+        self.jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ScoringJob]:
+        return self.jobs.get(job_id)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        self._subscribers.get(job_id, set()).discard(queue)
+
+    def _publish(self, job: ScoringJob, event_type: str = "scoring_progress"):
+        event = {"type": event_type, "data": job.to_dict()}
+        for queue in self._subscribers.get(job.job_id, set()):
+            queue.put_nowait(event)
+
+    async def _run(self, job: ScoringJob):
+        job.status = "running"
+        self._publish(job)
+        try:
+            pos_res = await asyncio.to_thread(
+                lambda: self.db.table('requirements').select('org_id, description, skills').eq('id', job.position_id).single().execute()
+            )
+            if not pos_res.data:
+                raise ValueError("Position not found")
+            jd_text = pos_res.data.get('description') or ''
+            if not jd_text:
+                raise ValueError("Position has no JD text")
+            jd_hash = hash_jd(jd_text)
+
+            org_id = pos_res.data['org_id']
+            rows = await self._fetch_resumes(org_id)
+            job.total = len(rows)
+            rows = self._prerank(job, org_id, rows, jd_text, pos_res.data.get('skills') or [])
+            self._publish(job)
+
+            limiter = ProviderRateLimiter(
+                ATS_SCORING_PROVIDER_RPM,
+                ProviderRateLimiter.parse_overrides(ATS_SCORING_PROVIDER_RPM_OVERRIDES)
+            )
+            semaphore = asyncio.Semaphore(ATS_SCORING_CONCURRENCY)
+            pending_writes: List[Dict[str, Any]] = []
+
+            async def score(row: Dict[str, Any]):
+                resume_text = (row.get('parsed_data') or {}).get('text', '')
+                resume_hash = hash_resume(resume_text)
+                analyst_output = row.get('analyst_output') or {}
+                previous = (analyst_output.get('position_scores') or {}).get(job.position_id) or {}
+
+                if not job.force and previous.get('jd_hash') == jd_hash and previous.get('resume_hash') == resume_hash:
+                    job.skipped += 1
+                    self._publish(job)
+                    return
+
+                async with semaphore:
+                    with limiter.applied():
+                        analysis = await self.strategy.audit_match(resume_text, jd_text)
+
+                if analysis.get('explanation') in AUDIT_FAILURE_EXPLANATIONS:
+                    # Not persisted, so the next run retries it
+                    job.failed += 1
+                else:
+                    pending_writes.append(self.scored_row(row, analysis, jd_hash, resume_hash))
+                    job.scored += 1
+                    if len(pending_writes) >= ATS_SCORING_UPSERT_BATCH:
+                        await self._flush(pending_writes, job.position_id)
+                self._publish(job)
+
+            tasks = [asyncio.create_task(score(row)) for row in rows]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # A failed flush fails the job: stop auditing the rest
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            await self._flush(pending_writes, job.position_id)
+
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Scoring job {job.job_id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            self._tasks.pop(job.job_id, None)
+            self._publish(job, "scoring_completed")
+
+    def _prerank(self, job: ScoringJob, org_id: str, rows: List[Dict[str, Any]],
+                 jd_text: str, skills: List[str]) -> List[Dict[str, Any]]:
+        """Keep the top_k rows by lexical score (all rows if top_k is 0 or covers the pool)."""
+        if not job.top_k or len(rows) <= job.top_k:
+            return rows
+        started = time.perf_counter()
+        index = get_org_index(org_id, [(row['id'], (row.get('parsed_data') or {}).get('text', '')) for row in rows])
+        keep = {r['id'] for r in index.rank(jd_text, skills, top_k=job.top_k)}
+        job.prerank_ms = round((time.perf_counter() - started) * 1000, 2)
+        job.prefiltered = len(rows) - len(keep)
+        return [row for row in rows if row['id'] in keep]
+
+    async def _fetch_resumes(self, org_id: str) -> List[Dict[str, Any]]:
+        """Page through the org's resumes (PostgREST caps a single response)."""
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            res = await asyncio.to_thread(
+                lambda start=offset: self.db.table('resumes').select('id, parsed_data, analyst_output').eq('org_id', org_id)
+                .is_('deleted_at', 'null').order('id')
+                .range(start, start + ATS_SCORING_PAGE_SIZE - 1).execute()
+            )
+            rows.extend(res.data or [])
+            if not res.data or len(res.data) < ATS_SCORING_PAGE_SIZE:
+                return rows
+            offset += ATS_SCORING_PAGE_SIZE
+
+    @staticmethod
+    def scored_row(row: Dict[str, Any], analysis: Dict[str, Any], jd_hash: str, resume_hash: str) -> Dict[str, Any]:
+        """Just the id and the new position score; apply_resume_scores merges it into analyst_output."""
+        return {
+            "id": row['id'],
+            "score": {
+                "match_score": analysis.get('match_score', 0),
+                "explanation": analysis.get('explanation'),
+                "jd_hash": jd_hash,
+                "resume_hash": resume_hash,
+                "scored_at": datetime.now().isoformat()
+            }
+        }
+
+    async def _flush(self, pending_writes: List[Dict[str, Any]], position_id: str):
+        """Write buffered scores with one RPC round-trip."""
+        if not pending_writes:
+            return
+        batch = pending_writes[:]
+        pending_writes.clear()
+        try:
+            res = await asyncio.to_thread(
+                lambda: self.db.rpc('apply_resume_scores', {'p_position_id': position_id, 'p_scores': batch}).execute()
+            )
+        except Exception as e:
+            logger.error(f"Bulk score update failed for {len(batch)} resume(s): {e}")
+            raise
+        if isinstance(res.data, int) and res.data < len(batch):
+            logger.info(f"{len(batch) - res.data} scored resume(s) were deleted during the job; not written")
+
+
+# Singleton
+_scoring_service = None
+
+def get_ats_scoring_service() -> ATSScoringService:
+    global _scoring_service
+    if _scoring_service is None:
+        _scoring_service = ATSScoringService()
+    return _scoring_service
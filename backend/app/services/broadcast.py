@@ -0,0 +1,260 @@
+"""
+Per-session WebSocket fan-out, pluggable between one worker and many.
+
+Every broadcast gets a per-session sequence number ("seq") and an "epoch" and
+is kept in a short replay log, so a client reconnecting with
+?last_seq=N&epoch=E receives the messages it missed. The epoch changes whenever
+the counter starts over (its key expired, or the in-process log was dropped);
+clients holding another epoch reset their last seq and get the whole log.
+Ephemeral types (streamed tokens, live typing) are fanned out without a seq and
+never logged: the next full message supersedes them, and they would otherwise
+push real messages out of the replay window.
+
+LocalBroadcast  single worker: sequence numbers and replay log kept in process
+RedisBroadcast  publishes to channel ws:{session_id}; each worker subscribes to
+                the sessions it holds sockets for and fans out locally.
+                seq/epoch = hash ws_counter:{session_id}; replay log = capped list ws_log:{session_id}
+
+Select with BROADCAST_BACKEND=redis|local. The Redis backend delivers a message
+it can't publish to this worker's sockets without a seq (clients always apply
+unsequenced messages), so a single worker keeps working while Redis is down.
+"""
+import os
+import json
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "redis").lower()
+# Messages kept per session for replay
+BROADCAST_REPLAY_SIZE = int(os.getenv("BROADCAST_REPLAY_SIZE", 200))
+BROADCAST_LOG_TTL = int(os.getenv("BROADCAST_LOG_TTL", 3600))
+# Sessions whose replay log LocalBroadcast keeps in memory
+BROADCAST_LOCAL_SESSIONS = int(os.getenv("BROADCAST_LOCAL_SESSIONS", 1000))
+
+CHANNEL_PREFIX = "ws:"
+SEQ_KEY_PREFIX = "ws_counter:"
+LOG_KEY_PREFIX = "ws_log:"
+# Published without a seq and kept out of the replay log
+EPHEMERAL_TYPES = frozenset({"swarm_token", "candidate_typing", "candidate_typing_diff"})
+
+Deliver = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+def new_epoch() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def is_missed(message: Dict[str, Any], epoch: Optional[str], last_seq: int) -> bool:
+    """Whether a client that saw last_seq of `epoch` still needs this message"""
+    if message.get("seq") is None:
+        return True
+    if epoch is not None and message.get("epoch") != epoch:
+        return True
+    return message["seq"] > last_seq
+
+
+class LocalBroadcast:
+    """In-process fan-out (one worker, or a fallback while Redis is unreachable)"""
+
+    name = "local"
+
+    def __init__(self, replay_size: int = BROADCAST_REPLAY_SIZE, max_sessions: int = BROADCAST_LOCAL_SESSIONS):
+        self.replay_size = replay_size
+        self.max_sessions = max_sessions
+        self._seq: Dict[str, Tuple[str, int]] = {}
+        self._logs: "OrderedDict[str, deque]" = OrderedDict()
+        self._deliver: Optional[Deliver] = None
+
+    def bind(self, deliver: Deliver):
+        """Set the callback that writes a message to this worker's sockets for a session"""
+        self._deliver = deliver
+
+    async def subscribe(self, session_id: str):
+        pass
+
+    async def unsubscribe(self, session_id: str):
+        pass
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        if message.get("type") in EPHEMERAL_TYPES:
+            envelope = dict(message)
+            if self._deliver:
+                await self._deliver(session_id, envelope)
+            return envelope
+        epoch, seq = self._seq.get(session_id) or (new_epoch(), 0)
+        self._seq[session_id] = (epoch, seq + 1)
+        envelope = {**message, "seq": seq + 1, "epoch": epoch}
+        log = self._logs.pop(session_id, None) or deque(maxlen=self.replay_size)
+        log.append(envelope)
+        self._logs[session_id] = log
+        while len(self._logs) > self.max_sessions:
+            evicted, _ = self._logs.popitem(last=False)
+            self._seq.pop(evicted, None)
+        if self._deliver:
+            await self._deliver(session_id, envelope)
+        return envelope
+
+    async def replay(self, session_id: str, after_seq: int, epoch: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [m for m in self._logs.get(session_id, ()) if is_missed(m, epoch, after_seq)]
+
+    async def close(self):
+        pass
+
+
+class RedisBroadcast:
+    """Cross-worker fan-out over Redis pub/sub, with a Redis-side replay log"""
+
+    name = "redis"
+
+    def __init__(self, client=None, replay_size: int = BROADCAST_REPLAY_SIZE, log_ttl: int = BROADCAST_LOG_TTL):
+        self._client = client
+        self.replay_size = replay_size
+        self.log_ttl = log_ttl
+        self._deliver: Optional[Deliver] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._channels: set = set()
+
+    @property
+    def client(self):
+        """redis.asyncio client (injected, or the shared pool while reachable)"""
+        if self._client is not None:
+            return self._client
+        from app.services.redis_service import get_async_redis_client
+        return get_async_redis_client().client
+
+    def bind(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        client = self.client
+        if client is None:
+            return await self._deliver_unsequenced(session_id, message)
+        try:
+            if message.get("type") in EPHEMERAL_TYPES:
+                await client.publish(CHANNEL_PREFIX + session_id, json.dumps(message, default=str))
+                return message
+            seq_key = SEQ_KEY_PREFIX + session_id
+            # A counter that expired starts over at 1 under a new epoch
+            counter = client.pipeline(transaction=True)
+            counter.hsetnx(seq_key, "epoch", new_epoch())
+            counter.hincrby(seq_key, "seq", 1)
+            counter.hget(seq_key, "epoch")
+            counter.expire(seq_key, self.log_ttl)
+            _, seq, epoch, _ = await counter.execute()
+            envelope = {**message, "seq": seq, "epoch": epoch}
+            payload = json.dumps(envelope, default=str)
+            log_key = LOG_KEY_PREFIX + session_id
+            pipe = client.pipeline(transaction=False)
+            pipe.rpush(log_key, payload)
+            pipe.ltrim(log_key, -self.replay_size, -1)
+            pipe.expire(log_key, self.log_ttl)
+            pipe.publish(CHANNEL_PREFIX + session_id, payload)
+            await pipe.execute()
+            return envelope
+        except Exception as e:
+            logger.error(f"Broadcast publish failed for {session_id}, delivering locally: {e}")
+            return await self._deliver_unsequenced(session_id, message)
+
+    async def subscribe(self, session_id: str):
+        self._channels.add(CHANNEL_PREFIX + session_id)
+        try:
+            if self._pubsub is None:
+                await self._connect()
+            else:
+                await self._pubsub.subscribe(CHANNEL_PREFIX + session_id)
+            if self._listener is None or self._listener.done():
+                self._listener = asyncio.create_task(self._listen())
+        except Exception as e:
+            # The listener resubscribes every channel once Redis is back
+            logger.error(f"Broadcast subscribe failed for {session_id}: {e}")
+            self._pubsub = None
+
+    async def unsubscribe(self, session_id: str):
+        self._channels.discard(CHANNEL_PREFIX + session_id)
+        try:
+            if self._pubsub:
+                await self._pubsub.unsubscribe(CHANNEL_PREFIX + session_id)
+        except Exception as e:
+            logger.error(f"Broadcast unsubscribe failed for {session_id}: {e}")
+
+    async def replay(self, session_id: str, after_seq: int, epoch: Optional[str] = None) -> List[Dict[str, Any]]:
+        client = self.client
+        if client is None:
+            return []
+        try:
+            raw = await client.lrange(LOG_KEY_PREFIX + session_id, 0, -1)
+        except Exception as e:
+            logger.error(f"Broadcast replay failed for {session_id}: {e}")
+            return []
+        # Concurrent publishers can append slightly out of order; seq is authoritative
+        missed = [m for m in (json.loads(item) for item in raw) if is_missed(m, epoch, after_seq)]
+        return sorted(missed, key=lambda m: m["seq"])
+
+    async def _deliver_unsequenced(self, session_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        envelope = dict(message)
+        if self._deliver:
+            await self._deliver(session_id, envelope)
+        return envelope
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    async def _connect(self):
+        """Fresh pub/sub connection subscribed to every channel this worker holds"""
+        client = self.client
+        if client is None or not self._channels:
+            return
+        pubsub = client.pubsub()
+        await pubsub.subscribe(*self._channels)
+        self._pubsub = pubsub
+
+    async def _listen(self):
+        """Fan messages from subscribed channels out to this worker's sockets"""
+        while True:
+            try:
+                if self._pubsub is None:
+                    # Lost the connection: resubscribe everything this worker holds
+                    await self._connect()
+                    if self._pubsub is None:
+                        await asyncio.sleep(1)
+                        continue
+                pubsub = self._pubsub
+                if not pubsub.subscribed:
+                    await asyncio.sleep(0.05)
+                    continue
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message or message.get("type") != "message":
+                    continue
+                session_id = message["channel"][len(CHANNEL_PREFIX):]
+                if self._deliver:
+                    await self._deliver(session_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Broadcast listener error, reconnecting: {e}")
+                self._pubsub = None
+                await asyncio.sleep(1)
+
+
+# Singleton
+_backend = None
+
+def get_broadcast_backend():
+    global _backend
+    if _backend is None:
+        _backend = RedisBroadcast() if BROADCAST_BACKEND == "redis" else LocalBroadcast()
+    return _backend
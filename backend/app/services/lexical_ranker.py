@@ -0,0 +1,151 @@
+"""
+Lexical pre-ranking of resumes against a JD (BM25 + skill coverage).
+
+Runs locally in milliseconds so bulk ATS scoring only spends LLM calls on the
+resumes that have a realistic chance of matching.
+"""
+
+import os
+import re
+import math
+import hashlib
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+# BM25 parameters (standard defaults)
+BM25_K1 = float(os.getenv("BM25_K1", 1.5))
+BM25_B = float(os.getenv("BM25_B", 0.75))
+# Weight of the BM25 component in the blended score; the rest is skill coverage
+LEXICAL_BM25_WEIGHT = float(os.getenv("LEXICAL_BM25_WEIGHT", 0.5))
+# Per-org indexes kept in memory
+LEXICAL_INDEX_CACHE_SIZE = int(os.getenv("LEXICAL_INDEX_CACHE_SIZE", 32))
+
+# Keeps tech tokens like c++, c#, node.js and ci/cd intact
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to
+was we were will with you your years year experience work working team strong ability skills
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in TOKEN_RE.findall((text or "").lower()):
+        token = token.rstrip("./-")
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def keyword_coverage(text: str, expected_keywords: List[str]) -> float:
+    """
+    Percentage of expected keywords present in the text (substring match, so
+    multi-word skills like "machine learning" count as one keyword).
+    Same semantics as ScoringAlgorithm.calculate_keyword_coverage in the evaluation suite.
+    """
+    if not expected_keywords:
+        return 100.0
+
+    text_lower = text.lower()
+    matched = sum(1 for keyword in expected_keywords if keyword.lower() in text_lower)
+    return (matched / len(expected_keywords)) * 100
+
+
+class ResumeIndex:
+    """
+    Inverted BM25 index over one org's resume corpus.
+    Scoring a query only touches the postings of its terms, so ranking thousands
+    of resumes costs a few dictionary lookups per query term.
+    """
+
+    def __init__(self, documents: List[Tuple[str, str]]):
+        self.doc_ids: List[str] = []
+        self.texts: List[str] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for doc_id, text in documents:
+            index = len(self.doc_ids)
+            terms = Counter(tokenize(text))
+            self.doc_ids.append(doc_id)
+            self.texts.append(text or "")
+            self.doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings.setdefault(term, []).append((index, tf))
+
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+        # Length normalisation depends only on the document; precompute it once
+        self._norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_length) if self.avg_length else BM25_K1
+            for length in self.doc_lengths
+        ]
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.doc_ids) - df + 0.5) / (df + 0.5))
+
+    def bm25(self, query_terms: List[str]) -> List[float]:
+        scores = [0.0] * len(self.doc_ids)
+        for term, qtf in Counter(query_terms).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            weight = self.idf(term) * qtf
+            for index, tf in postings:
+                scores[index] += weight * tf * (BM25_K1 + 1) / (tf + self._norms[index])
+        return scores
+
+    def rank(self, jd_text: str, skills: Optional[List[str]] = None,
+             top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rank every resume for a JD.
+
+        The query is the JD text plus the skill list (skills are repeated so they
+        outweigh boilerplate JD prose). The blended score is in [0, 100]:
+        BM25 normalised to the best resume, mixed with skill-list coverage.
+        """
+        skills = [s for s in (skills or []) if s and s.strip()]
+        query_terms = tokenize(jd_text)
+        for skill in skills:
+            query_terms.extend(tokenize(skill) * 2)
+
+        raw = self.bm25(query_terms)
+        best = max(raw) if raw else 0.0
+        ranked = []
+        for index, doc_id in enumerate(self.doc_ids):
+            bm25_norm = (raw[index] / best * 100) if best > 0 else 0.0
+            coverage = keyword_coverage(self.texts[index], skills) if skills else bm25_norm
+            score = LEXICAL_BM25_WEIGHT * bm25_norm + (1 - LEXICAL_BM25_WEIGHT) * coverage
+            ranked.append({
+                "id": doc_id,
+                "lexical_score": round(score, 2),
+                "bm25": round(raw[index], 4),
+                "skill_coverage": round(coverage, 1)
+            })
+        ranked.sort(key=lambda r: r["lexical_score"], reverse=True)
+        return ranked[:top_k] if top_k else ranked
+
+
+# Per-org index cache, invalidated when the corpus fingerprint changes
+_org_indexes: Dict[str, Tuple[str, ResumeIndex]] = {}
+
+def get_org_index(org_id: str, documents: List[Tuple[str, str]]) -> ResumeIndex:
+    """Reuse the org's index if its resumes are unchanged, otherwise rebuild it."""
+    digest = hashlib.sha256()
+    for doc_id, text in documents:
+        digest.update(f"{doc_id}:{len(text or '')}:{hash(text)}\n".encode("utf-8"))
+    fingerprint = digest.hexdigest()
+
+    cached = _org_indexes.get(org_id)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+
+    index = ResumeIndex(documents)
+    _org_indexes.pop(org_id, None)
+    _org_indexes[org_id] = (fingerprint, index)
+    while len(_org_indexes) > LEXICAL_INDEX_CACHE_SIZE:
+        _org_indexes.pop(next(iter(_org_indexes)))
+    return index
@@ -13,15 +13,15 @@ class IntelligenceDispatch:
     Ensures all responses are parsed into the standardized InferenceOutput format.
     """
     
-    def __init__(self):
-        self.router = get_llm_router()
+    def __init__(self, router=None):
+        self.router = router or get_llm_router()
 
     async def generate_structured(self, prompt: str, generation_config: Optional[Dict] = None) -> InferenceOutput:
         """
         Generates content and attempts to parse it into a structured InferenceOutput.
         """
         try:
-            response = self.router.generate_content(prompt, generation_config)
+            response = await self.router.generate_content_async(prompt, generation_config)
             raw_text = response.text.strip()
             
             # Try to parse as JSON
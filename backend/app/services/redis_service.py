@@ -1,7 +1,13 @@
 import redis
+import redis.asyncio as aioredis
 import json
 import os
+import time
 from typing import Optional, Any
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError, WatchError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,59 +16,284 @@ REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
+# Async pool size; callers beyond this wait up to REDIS_POOL_TIMEOUT for a free connection
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+# Retries (with exponential backoff) of a command that hit a dropped connection
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", 3))
+# While Redis is down, how often to try it again instead of failing fast
+REDIS_RECONNECT_INTERVAL = float(os.getenv("REDIS_RECONNECT_INTERVAL", 5))
+
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError)
+
+
+def _connection_kwargs() -> dict:
+    return dict(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=REDIS_DB,
+        password=REDIS_PASSWORD,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        retry_on_error=list(CONNECTION_ERRORS),
+        health_check_interval=30,
+        decode_responses=True
+    )
+
+
+class _Availability:
+    """
+    Up/down tracking shared by both clients. While down, `client` returns None so
+    callers fall back immediately; every REDIS_RECONNECT_INTERVAL one caller gets the
+    client back and its command doubles as the reconnect probe.
+    """
 
-class RedisClient:
     def __init__(self):
+        self._healthy = True
+        self._next_probe = 0.0
+
+    def _available(self) -> bool:
+        if self._healthy:
+            return True
+        if time.time() >= self._next_probe:
+            self._next_probe = time.time() + REDIS_RECONNECT_INTERVAL
+            return True
+        return False
+
+    @property
+    def healthy(self) -> bool:
+        """Last known state; unlike `client`, checking it doesn't use up a reconnect probe"""
+        return self._healthy
+
+    def _mark_up(self):
+        if not self._healthy:
+            logger.info(f"Reconnected to Redis at {REDIS_HOST}:{REDIS_PORT}")
+        self._healthy = True
+
+    def _mark_down(self, error: Exception):
+        if self._healthy:
+            logger.error(f"Redis unavailable, retrying every {REDIS_RECONNECT_INTERVAL:g}s: {error}")
+        self._healthy = False
+        self._next_probe = time.time() + REDIS_RECONNECT_INTERVAL
+
+
+class RedisClient(_Availability):
+    """Synchronous client for sync code paths (caches, leases)."""
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        super().__init__()
+        self._redis = client or redis.Redis(
+            retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), REDIS_RETRIES),
+            **_connection_kwargs()
+        )
         try:
-            self.client = redis.Redis(
-                host=REDIS_HOST,
-                port=REDIS_PORT,
-                db=REDIS_DB,
-                password=REDIS_PASSWORD,
-                decode_responses=True
-            )
             # Test connection
-            self.client.ping()
+            self._redis.ping()
             logger.info(f"Connected to Redis at {REDIS_HOST}:{REDIS_PORT}")
         except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            self.client = None
+            self._mark_down(e)
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """The redis.Redis connection while Redis is reachable, otherwise None"""
+        if not self._available():
+            return None
+        if not self._healthy:
+            try:
+                self._redis.ping()
+                self._mark_up()
+            except Exception as e:
+                self._mark_down(e)
+                return None
+        return self._redis
 
     def set(self, key: str, value: Any, expire: int = 3600):
-        if not self.client:
+        client = self.client
+        if not client:
             return False
         try:
-            self.client.set(key, json.dumps(value), ex=expire)
+            client.set(key, json.dumps(value), ex=expire)
             return True
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return False
         except Exception as e:
             logger.error(f"Redis set error: {e}")
             return False
 
     def get(self, key: str) -> Optional[Any]:
-        if not self.client:
+        client = self.client
+        if not client:
             return None
         try:
-            data = self.client.get(key)
+            data = client.get(key)
             return json.loads(data) if data else None
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return None
         except Exception as e:
             logger.error(f"Redis get error: {e}")
             return None
 
     def delete(self, key: str):
-        if not self.client:
+        client = self.client
+        if not client:
             return False
         try:
-            self.client.delete(key)
+            client.delete(key)
             return True
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return False
         except Exception as e:
             logger.error(f"Redis delete error: {e}")
             return False
 
-# Singleton
+
+class AsyncRedisClient(_Availability):
+    """
+    redis.asyncio client over a bounded, blocking connection pool, for the async
+    request paths (session save/load). Dropped connections are replaced by the pool
+    and failed commands retried with backoff; nothing here blocks the event loop.
+    """
+
+    def __init__(self, client: Optional[aioredis.Redis] = None):
+        super().__init__()
+        if client is None:
+            pool = aioredis.BlockingConnectionPool(
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                retry=AsyncRetry(ExponentialBackoff(cap=1.0, base=0.05), REDIS_RETRIES),
+                **_connection_kwargs()
+            )
+            client = aioredis.Redis(connection_pool=pool)
+        self._redis = client
+
+    @property
+    def client(self) -> Optional[aioredis.Redis]:
+        """The redis.asyncio connection while Redis is reachable (or due a reconnect probe), otherwise None"""
+        return self._redis if self._available() else None
+
+    def pipeline(self):
+        """Non-transactional pipeline (one round-trip for many keys), or None while Redis is down"""
+        client = self.client
+        return client.pipeline(transaction=False) if client else None
+
+    async def execute(self, pipe) -> Optional[list]:
+        """Run a pipeline from pipeline(); None if it failed"""
+        try:
+            replies = await pipe.execute()
+            self._mark_up()
+            return replies
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return None
+        except Exception as e:
+            logger.error(f"Redis pipeline error: {e}")
+            return None
+
+    async def ping(self) -> bool:
+        client = self.client
+        if not client:
+            return False
+        try:
+            await client.ping()
+            self._mark_up()
+            return True
+        except Exception as e:
+            self._mark_down(e)
+            return False
+
+    async def set(self, key: str, value: Any, expire: int = 3600):
+        client = self.client
+        if not client:
+            return False
+        try:
+            await client.set(key, json.dumps(value), ex=expire)
+            self._mark_up()
+            return True
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return False
+        except Exception as e:
+            logger.error(f"Redis set error: {e}")
+            return False
+
+    async def get(self, key: str) -> Optional[Any]:
+        client = self.client
+        if not client:
+            return None
+        try:
+            data = await client.get(key)
+            self._mark_up()
+            return json.loads(data) if data else None
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return None
+        except Exception as e:
+            logger.error(f"Redis get error: {e}")
+            return None
+
+    async def delete(self, key: str):
+        client = self.client
+        if not client:
+            return False
+        try:
+            await client.delete(key)
+            self._mark_up()
+            return True
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return False
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+            return False
+
+    async def compare_and_delete(self, key: str, expected: str) -> bool:
+        """Delete key only if it still holds `expected` (WATCH/MULTI, no Lua needed); False if not deleted"""
+        client = self.client
+        if not client:
+            return False
+        try:
+            async with client.pipeline() as pipe:
+                await pipe.watch(key)
+                if await pipe.get(key) != expected:
+                    await pipe.unwatch()
+                    self._mark_up()
+                    return False
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+            self._mark_up()
+            return True
+        except WatchError:
+            return False
+        except CONNECTION_ERRORS as e:
+            self._mark_down(e)
+            return False
+        except Exception as e:
+            logger.error(f"Redis compare-and-delete error: {e}")
+            return False
+
+    async def close(self):
+        try:
+            await self._redis.aclose()
+        except Exception as e:
+            logger.error(f"Redis close error: {e}")
+
+# Singletons
 _redis_client = None
+_async_redis_client = None
 
 def get_redis_client() -> RedisClient:
     global _redis_client
     if _redis_client is None:
         _redis_client = RedisClient()
     return _redis_client
+
+def get_async_redis_client() -> AsyncRedisClient:
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = AsyncRedisClient()
+    return _async_redis_client
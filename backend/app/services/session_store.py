@@ -0,0 +1,312 @@
+"""
+Delta persistence for interview sessions.
+
+Redis layout per session (keys share the session TTL):
+  session:{id}:state    HASH    one JSON value per scalar field / metadata key
+  session:{id}:history  LIST    one JSON turn per element, appended with RPUSH
+  session_blob:{sha256} STRING  large texts (JD, resume) stored once by content hash
+
+save() only sends hash fields whose encoding changed since the last save and
+turns appended (or amended) since then, so the bytes written per turn stay flat
+instead of growing with the length of the interview.
+"""
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .redis_service import AsyncRedisClient, get_redis_client, get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL = int(os.getenv("SESSION_TTL", 3600))
+SESSION_BLOB_TTL = int(os.getenv("SESSION_BLOB_TTL", 24 * 3600))
+# Hash fields holding large, rarely-changing texts that go to content-addressed blobs
+BLOB_FIELDS = frozenset({"meta:jd_text", "meta:resume_text"})
+# Blobs kept in process; many sessions share a JD, so loads rarely refetch it
+BLOB_CACHE_SIZE = int(os.getenv("SESSION_BLOB_CACHE_SIZE", 256))
+
+BLOB_KEY_PREFIX = "session_blob:"
+BLOB_REF = "$blob"
+
+_blob_cache: Dict[str, str] = {}
+
+
+def state_key(session_id: str) -> str:
+    return f"session:{session_id}:state"
+
+
+def history_key(session_id: str) -> str:
+    return f"session:{session_id}:history"
+
+
+def legacy_key(session_id: str) -> str:
+    """Single-blob format written before delta persistence"""
+    return f"session:{session_id}"
+
+
+def _remember_blob(sha: str, text: str):
+    _blob_cache.pop(sha, None)
+    _blob_cache[sha] = text
+    while len(_blob_cache) > BLOB_CACHE_SIZE:
+        _blob_cache.pop(next(iter(_blob_cache)))
+
+
+class SessionStore:
+    """
+    Tracks what has already been persisted for one session and writes only the delta.
+
+    save()/load() use the sync client, save_async()/load_async() the pooled async one
+    (through AsyncRedisClient, so they fail fast while Redis is marked down); both
+    send one pipeline per call. Explicit clients (raw redis.Redis /
+    redis.asyncio.Redis with decode_responses=True) override the shared ones.
+    Values are JSON-encoded exactly once here.
+    """
+
+    def __init__(self, session_id: str, client=None, aclient=None):
+        self.session_id = session_id
+        self.client = client
+        self.aclient = aclient
+        self._aredis = AsyncRedisClient(aclient) if aclient is not None else None
+        self._fields: Dict[str, str] = {}                    # field -> last persisted encoding
+        self._blob_refs: Dict[str, Tuple[str, str]] = {}     # field -> (text, sha) last hashed
+        self._blobs_written: set = set()
+        self._turns_persisted = 0
+        self.bytes_written = 0
+        self.saves = 0
+        # Turn, critique and summary saves overlap; the delta must be computed after the previous one committed
+        self._save_lock = asyncio.Lock()
+
+    def _sync_client(self):
+        return self.client or get_redis_client().client
+
+    def _async_redis(self) -> AsyncRedisClient:
+        return self._aredis or get_async_redis_client()
+
+    def save(self, fields: Dict[str, Any], history: List[Dict[str, Any]], amended: Iterable[int] = ()) -> bool:
+        """
+        Persist the changes since the last save.
+
+        fields: flat scalar state (metadata keys prefixed with "meta:")
+        amended: indexes of already-persisted history turns that were edited in place
+        """
+        client = self._sync_client()
+        if not client:
+            return False
+        try:
+            new_blobs = self._new_blobs(fields)
+            stored = set()
+            if new_blobs:
+                check = client.pipeline(transaction=False)
+                for sha in new_blobs:
+                    check.exists(BLOB_KEY_PREFIX + sha)
+                stored = {sha for sha, exists in zip(new_blobs, check.execute()) if exists}
+            pipe = client.pipeline(transaction=False)
+            plan = self._queue_delta(pipe, fields, history, amended, new_blobs, stored)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to persist session {self.session_id}: {e}")
+            return False
+        self._commit(*plan)
+        return True
+
+    async def save_async(self, fields: Dict[str, Any], history: List[Dict[str, Any]],
+                         amended: Iterable[int] = ()) -> bool:
+        """save() over the async connection pool (doesn't block the event loop); saves run one at a time."""
+        async with self._save_lock:
+            return await self._save_async(fields, history, amended)
+
+    async def _save_async(self, fields: Dict[str, Any], history: List[Dict[str, Any]], amended: Iterable[int]) -> bool:
+        redis = self._async_redis()
+        try:
+            new_blobs = self._new_blobs(fields)
+            stored = set()
+            if new_blobs:
+                check = redis.pipeline()
+                if check is None:
+                    return False
+                for sha in new_blobs:
+                    check.exists(BLOB_KEY_PREFIX + sha)
+                exists = await redis.execute(check)
+                if exists is None:
+                    return False
+                stored = {sha for sha, found in zip(new_blobs, exists) if found}
+            pipe = redis.pipeline()
+            if pipe is None:
+                return False
+            plan = self._queue_delta(pipe, fields, history, amended, new_blobs, stored)
+            if await redis.execute(pipe) is None:
+                return False
+        except Exception as e:
+            logger.error(f"Failed to persist session {self.session_id}: {e}")
+            return False
+        self._commit(*plan)
+        return True
+
+    def _new_blobs(self, fields: Dict[str, Any]) -> Dict[str, str]:
+        """sha -> text for blob fields this store hasn't written yet"""
+        blobs = {}
+        for name in BLOB_FIELDS:
+            value = fields.get(name)
+            if isinstance(value, str):
+                sha = self._blob_sha(name, value)
+                if sha not in self._blobs_written:
+                    blobs[sha] = value
+        return blobs
+
+    def _queue_delta(self, pipe, fields: Dict[str, Any], history: List[Dict[str, Any]], amended: Iterable[int],
+                     new_blobs: Dict[str, str], stored: set):
+        """Queue the delta on a (sync or async) pipeline; returns the bookkeeping for _commit."""
+        written = 0
+        for sha, text in new_blobs.items():
+            if sha not in stored:
+                pipe.set(BLOB_KEY_PREFIX + sha, text, ex=SESSION_BLOB_TTL)
+                written += len(BLOB_KEY_PREFIX + sha) + len(text.encode("utf-8"))
+
+        blob_keys = []
+        changed: Dict[str, str] = {}
+        for name, value in fields.items():
+            if name in BLOB_FIELDS and isinstance(value, str):
+                sha = self._blob_sha(name, value)
+                blob_keys.append(BLOB_KEY_PREFIX + sha)
+                encoded = json.dumps({BLOB_REF: sha})
+            else:
+                encoded = json.dumps(value, default=str)
+            if self._fields.get(name) != encoded:
+                changed[name] = encoded
+        removed = [name for name in self._fields if name not in fields]
+
+        skey, hkey = state_key(self.session_id), history_key(self.session_id)
+        if changed:
+            pipe.hset(skey, mapping=changed)
+            written += sum(len(k) + len(v.encode("utf-8")) for k, v in changed.items())
+        if removed:
+            pipe.hdel(skey, *removed)
+            written += sum(len(name) for name in removed)
+
+        persisted = self._turns_persisted
+        if len(history) < persisted:
+            # History was replaced or truncated; rewrite it
+            pipe.delete(hkey)
+            persisted = 0
+        for index in amended:
+            if index < persisted:
+                encoded_turn = json.dumps(history[index], default=str)
+                pipe.lset(hkey, index, encoded_turn)
+                written += len(encoded_turn.encode("utf-8"))
+        new_turns = [json.dumps(turn, default=str) for turn in history[persisted:]]
+        if new_turns:
+            pipe.rpush(hkey, *new_turns)
+            written += sum(len(t.encode("utf-8")) for t in new_turns)
+
+        for key in [skey, hkey]:
+            pipe.expire(key, SESSION_TTL)
+        for blob_key in blob_keys:
+            pipe.expire(blob_key, SESSION_BLOB_TTL)
+        return changed, removed, len(history), new_blobs, written
+
+    def _commit(self, changed: Dict[str, str], removed: List[str], history_len: int,
+                new_blobs: Dict[str, str], written: int):
+        self._fields.update(changed)
+        for name in removed:
+            self._fields.pop(name, None)
+        for sha, text in new_blobs.items():
+            _remember_blob(sha, text)
+            self._blobs_written.add(sha)
+        self._turns_persisted = history_len
+        self.bytes_written += written
+        self.saves += 1
+
+    def _blob_sha(self, name: str, text: str) -> str:
+        """Hash a blob field, skipping the hash while the field still holds the same string object"""
+        cached = self._blob_refs.get(name)
+        if cached and cached[0] is text:
+            return cached[1]
+        sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self._blob_refs[name] = (text, sha)
+        return sha
+
+    @classmethod
+    def load(cls, session_id: str, client=None) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], "SessionStore"]]:
+        """
+        Rebuild (fields, history, store) in one pipelined round-trip, plus one MGET
+        for blobs not already cached in this process. None if the session isn't stored.
+        """
+        store = cls(session_id, client=client)
+        client = store._sync_client()
+        if not client:
+            return None
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(state_key(session_id))
+        pipe.lrange(history_key(session_id), 0, -1)
+        raw_fields, raw_history = pipe.execute()
+        if not raw_fields:
+            return None
+        fields, blob_fields = cls._decode_fields(raw_fields)
+        missing = [sha for sha in set(blob_fields.values()) if sha not in _blob_cache]
+        if missing:
+            cls._cache_blobs(missing, client.mget([BLOB_KEY_PREFIX + sha for sha in missing]))
+        return store._restore(fields, blob_fields, raw_fields, raw_history)
+
+    @classmethod
+    async def load_async(cls, session_id: str, aclient=None) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], "SessionStore"]]:
+        """load() over the async connection pool; None also while Redis is unreachable."""
+        store = cls(session_id, aclient=aclient)
+        redis = store._async_redis()
+        pipe = redis.pipeline()
+        if pipe is None:
+            return None
+        pipe.hgetall(state_key(session_id))
+        pipe.lrange(history_key(session_id), 0, -1)
+        replies = await redis.execute(pipe)
+        if not replies or not replies[0]:
+            return None
+        raw_fields, raw_history = replies
+        fields, blob_fields = cls._decode_fields(raw_fields)
+        missing = [sha for sha in set(blob_fields.values()) if sha not in _blob_cache]
+        if missing:
+            fetch = redis.pipeline()
+            texts = None
+            if fetch is not None:
+                fetch.mget([BLOB_KEY_PREFIX + sha for sha in missing])
+                texts = await redis.execute(fetch)
+            if texts is None:
+                return None
+            cls._cache_blobs(missing, texts[0])
+        return store._restore(fields, blob_fields, raw_fields, raw_history)
+
+    @staticmethod
+    def _decode_fields(raw_fields: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        fields: Dict[str, Any] = {}
+        blob_fields: Dict[str, str] = {}
+        for name, encoded in raw_fields.items():
+            value = json.loads(encoded)
+            if isinstance(value, dict) and set(value) == {BLOB_REF}:
+                blob_fields[name] = value[BLOB_REF]
+            else:
+                fields[name] = value
+        return fields, blob_fields
+
+    @staticmethod
+    def _cache_blobs(shas: List[str], texts: List[Optional[str]]):
+        for sha, text in zip(shas, texts):
+            if text is not None:
+                _remember_blob(sha, text)
+
+    def _restore(self, fields: Dict[str, Any], blob_fields: Dict[str, str], raw_fields: Dict[str, str],
+                 raw_history: List[str]):
+        for name, sha in blob_fields.items():
+            text = _blob_cache.get(sha)
+            if text is None:
+                logger.warning(f"Session {self.session_id}: blob {sha[:12]} for {name} has expired")
+                continue
+            fields[name] = text
+            self._blob_refs[name] = (text, sha)
+            self._blobs_written.add(sha)
+
+        self._fields = dict(raw_fields)
+        self._turns_persisted = len(raw_history)
+        history = [json.loads(turn) for turn in raw_history]
+        return fields, history, self
@@ -0,0 +1,193 @@
+"""
+Debounced, diff-based candidate_typing stream for one session.
+
+The candidate's socket sends its whole answer on every keystroke pause. Instead
+of re-broadcasting that text to every viewer, the stream:
+
+  - debounces updates (TYPING_DEBOUNCE_MS after the last keystroke, but at most
+    TYPING_MAX_WAIT_MS after the first unsent one, so continuous typing still shows)
+  - caps what it publishes at TYPING_MAX_FRAMES_PER_SEC per session
+  - publishes the edit since the previous frame as one replace op:
+        {"type": "candidate_typing_diff",
+         "data": {"v": 7, "base": 6, "p": <pos>, "d": <chars deleted>, "i": <inserted text>}}
+    with a full-text keyframe ({"type": "candidate_typing", "data": {"text", "v"}})
+    first, after reset(), every TYPING_KEYFRAME_SECONDS, and whenever the op would
+    not be smaller than the text. Viewers apply an op only if they hold version
+    `base`; otherwise they wait for the next keyframe.
+
+Paste detection follows the activity tracker model (PasteEvent / TypingMetrics): an
+update inserting more than TYPING_PASTE_THRESHOLD chars at once counts as a paste
+and the next frame carries "paste": true.
+"""
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+TYPING_DEBOUNCE_MS = float(os.getenv("TYPING_DEBOUNCE_MS", 150))
+TYPING_MAX_WAIT_MS = float(os.getenv("TYPING_MAX_WAIT_MS", 500))
+TYPING_MAX_FRAMES_PER_SEC = float(os.getenv("TYPING_MAX_FRAMES_PER_SEC", 8))
+TYPING_KEYFRAME_SECONDS = float(os.getenv("TYPING_KEYFRAME_SECONDS", 5))
+TYPING_PASTE_THRESHOLD = int(os.getenv("TYPING_PASTE_THRESHOLD", 200))
+
+
+@dataclass
+class PasteEvent:
+    """A single update that inserted more than TYPING_PASTE_THRESHOLD chars"""
+    timestamp: float
+    chars_added: int
+    source: str = "external"
+
+
+@dataclass
+class TypingMetrics:
+    """Typing behaviour plus what the stream saved on the wire"""
+    chars_typed: int = 0
+    chars_pasted: int = 0
+    paste_ratio: float = 0
+    updates_received: int = 0
+    frames_published: int = 0
+    keyframes: int = 0
+    chars_published: int = 0
+    chars_full_text: int = 0  # what re-broadcasting the full text on every update would have sent
+
+
+def text_diff(old: str, new: str) -> Tuple[int, int, str]:
+    """Single replace op turning old into new: (position, chars deleted, inserted text)"""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, len(old) - prefix - suffix, new[prefix:len(new) - suffix]
+
+
+def apply_diff(text: str, position: int, deleted: int, inserted: str) -> str:
+    return text[:position] + inserted + text[position + deleted:]
+
+
+class TypingStream:
+    """Turns one candidate's typing updates into debounced, rate-capped diff frames"""
+
+    def __init__(self, publish: Callable[[Dict[str, Any]], Awaitable[None]],
+                 debounce_ms: float = TYPING_DEBOUNCE_MS, max_wait_ms: float = TYPING_MAX_WAIT_MS,
+                 max_frames_per_sec: float = TYPING_MAX_FRAMES_PER_SEC,
+                 keyframe_seconds: float = TYPING_KEYFRAME_SECONDS):
+        self._publish = publish
+        self.debounce = debounce_ms / 1000
+        self.max_wait = max_wait_ms / 1000
+        self.min_gap = 1 / max_frames_per_sec if max_frames_per_sec > 0 else 0
+        self.keyframe_seconds = keyframe_seconds
+        self._latest = ""           # newest text from the candidate
+        self._sent = ""             # text as of the last published frame
+        self._version = 0
+        self._needs_keyframe = True
+        self._last_keyframe = 0.0
+        self._first_pending: Optional[float] = None
+        self._last_update = 0.0
+        self._next_allowed = 0.0
+        self._paste_pending = False
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = TypingMetrics()
+        self.paste_events: List[PasteEvent] = []
+
+    def update(self, text: Optional[str]):
+        """Record the candidate's current text; publishing happens after the debounce window"""
+        text = text or ""
+        self._record(text)
+        self._latest = text
+        now = time.monotonic()
+        if self._first_pending is None:
+            self._first_pending = now
+        self._last_update = now
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_later())
+
+    def _record(self, text: str):
+        metrics = self.metrics
+        metrics.updates_received += 1
+        metrics.chars_full_text += len(text)
+        _, _, inserted = text_diff(self._latest, text)
+        if len(inserted) > TYPING_PASTE_THRESHOLD:
+            self.paste_events.append(PasteEvent(timestamp=time.time() * 1000, chars_added=len(inserted)))
+            metrics.chars_pasted += len(inserted)
+            self._paste_pending = True
+        else:
+            metrics.chars_typed += len(inserted)
+        total = metrics.chars_typed + metrics.chars_pasted
+        metrics.paste_ratio = metrics.chars_pasted / total if total else 0
+
+    async def _flush_later(self):
+        try:
+            while True:
+                due = min(self._last_update + self.debounce, self._first_pending + self.max_wait)
+                wait = max(due, self._next_allowed) - time.monotonic()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self._task = None
+            await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._task = None
+            logger.error(f"Typing stream flush failed: {e}")
+
+    def _frame(self) -> Optional[Dict[str, Any]]:
+        text = self._latest
+        if text == self._sent and not self._needs_keyframe:
+            return None
+        now = time.monotonic()
+        self._version += 1
+        position, deleted, inserted = text_diff(self._sent, text)
+        if self._needs_keyframe or now - self._last_keyframe >= self.keyframe_seconds or len(inserted) + 16 >= len(text):
+            frame = {"type": "candidate_typing", "data": {"text": text, "v": self._version}}
+            self._needs_keyframe = False
+            self._last_keyframe = now
+            self.metrics.keyframes += 1
+            self.metrics.chars_published += len(text)
+        else:
+            frame = {"type": "candidate_typing_diff",
+                     "data": {"v": self._version, "base": self._version - 1, "p": position, "d": deleted, "i": inserted}}
+            self.metrics.chars_published += len(inserted)
+        if self._paste_pending:
+            frame["data"]["paste"] = True
+            self._paste_pending = False
+        self._sent = text
+        return frame
+
+    def keyframe(self) -> Dict[str, Any]:
+        """Full text of the last published version, for a viewer joining mid-answer"""
+        return {"type": "candidate_typing", "data": {"text": self._sent, "v": self._version}}
+
+    async def flush(self):
+        """Publish whatever is pending now (skipping the debounce window)"""
+        self._first_pending = None
+        frame = self._frame()
+        if frame is None:
+            return
+        self._next_allowed = time.monotonic() + self.min_gap
+        self.metrics.frames_published += 1
+        await self._publish(frame)
+
+    def reset(self, text: str = ""):
+        """The answer was submitted (input cleared): drop pending typing; the next frame is a keyframe"""
+        self.close()
+        self._latest = self._sent = text
+        self._needs_keyframe = True
+        self._paste_pending = False
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._first_pending = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self.metrics), "version": self._version, "paste_events": len(self.paste_events)}
@@ -0,0 +1,50 @@
+"""
+Domain tagging for positions and resumes.
+
+Resumes are tagged once at ingest (stored in the indexed resumes.domain_tags
+column) so the candidate list can filter by domain in SQL instead of scanning
+every resume's text per request.
+"""
+from typing import List, Optional
+
+# Terms in a position title that place it in a domain
+POSITION_DOMAIN_TERMS = {
+    "engineering": ['engineer', 'dev', 'software', 'tech', 'data'],
+    "hr": ['hr', 'recruiter', 'people', 'talent', 'staffing'],
+    "marketing": ['marketing', 'brand', 'content'],
+    "sales": ['sales', 'account executive', 'business development'],
+}
+
+# Terms in a resume (name or text) that make it relevant to a domain.
+# Keep in sync with the backfill in archive/root_doc/migrations/013_resume_search_indexes.sql
+RESUME_DOMAIN_KEYWORDS = {
+    "engineering": ['engineer', 'developer', 'software', 'technical'],
+    "hr": ['hr', 'recruiter', 'human resources', 'talent'],
+    "marketing": ['marketing', 'content', 'seo', 'social media'],
+    "sales": ['sales', 'business development', 'account executive'],
+}
+
+
+def detect_position_domain(title: str) -> Optional[str]:
+    """
+    Domain of a position from its title, or None if it fits no known domain
+    (in which case candidates are not domain-filtered).
+    """
+    title_lower = (title or "").lower()
+    for domain, terms in POSITION_DOMAIN_TERMS.items():
+        if any(term in title_lower for term in terms):
+            return domain
+    return None
+
+
+def detect_resume_domains(resume_text: str, candidate_name: str = "") -> List[str]:
+    """
+    Every domain a resume is relevant to. A resume can carry several tags
+    (e.g. a technical recruiter), mirroring the old per-request check.
+    """
+    text_lower = (resume_text or "").lower()
+    name_lower = (candidate_name or "").lower()
+    return [
+        domain for domain, keywords in RESUME_DOMAIN_KEYWORDS.items()
+        if any(k in text_lower or k in name_lower for k in keywords)
+    ]
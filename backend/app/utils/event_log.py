@@ -0,0 +1,489 @@
+"""
+Append-only, segmented interview event log.
+
+Layout under EVENT_LOG_DIR:
+  segments/events-000001.jsonl   one JSON event per line, rolled at EVENT_LOG_SEGMENT_BYTES
+  sessions/{ab}/{session_id}.idx  per-session index: "<segment> <offset> <length>" per event
+  feedback.jsonl                 expert feedback projection (strategy, action, rating, texts)
+  events.lock                    flock'd around every append, so workers can share the log
+
+An event costs one appended line plus one index line, however large the log is.
+Segments are fsync'd in batches (every EVENT_LOG_FSYNC_EVERY events or
+EVENT_LOG_FSYNC_INTERVAL seconds); indexes and feedback.jsonl are derived data
+and can be rebuilt from the segments with rebuild_indexes(). Finished sessions are
+moved out into compressed archives by log_archive.LogCompactor.
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Collection, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LOGS_DIR = os.getenv("LOGS_DIR", os.path.join(BACKEND_DIR, "logs"))
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", os.path.join(LOGS_DIR, "events"))
+# Whole-file log.json written before the event log; imported once if present
+LEGACY_LOG_FILE = os.getenv("LOG_FILE", os.path.join(LOGS_DIR, "log.json"))
+EVENT_LOG_SEGMENT_BYTES = int(os.getenv("EVENT_LOG_SEGMENT_BYTES", 64 * 1024 * 1024))
+EVENT_LOG_FSYNC_EVERY = int(os.getenv("EVENT_LOG_FSYNC_EVERY", 100))
+EVENT_LOG_FSYNC_INTERVAL = float(os.getenv("EVENT_LOG_FSYNC_INTERVAL", 1.0))
+
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".jsonl"
+
+STRATEGY_COUNTERS = ("total_uses", "good_ratings", "bad_ratings", "edited_count", "overridden_count")
+
+
+def segment_name(number: int) -> str:
+    return f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+
+def fold_session(session_id: str, events: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Rebuild the session document (the shape log.json used to hold) from its events"""
+    session = None
+    questions: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        kind = event.get("type")
+        if kind == "session_started":
+            if session is None:
+                session = {
+                    "session_id": session_id,
+                    "detected_language": event.get("language"),
+                    "created_at": event.get("ts"),
+                    "questions": [],
+                    "strategy_performance": {},
+                    "expert_feedback": []
+                }
+                if event.get("jd_id"):
+                    session["jd_id"] = event["jd_id"]
+            continue
+        if session is None:
+            continue
+        if kind == "question":
+            entry = questions.get(event["question_id"])
+            if entry is None:
+                entry = {"question_id": event["question_id"], "round_number": event.get("round_number"),
+                         "question_text": event.get("question_text"), "question_type": event.get("question_type"),
+                         "category": event.get("category"), "topic": event.get("topic"),
+                         "timestamp": event.get("ts"), "responses": []}
+                questions[event["question_id"]] = entry
+                session["questions"].append(entry)
+            elif "question_text" not in entry:
+                # Created by an earlier response; fill in the question details
+                entry.update({"question_text": event.get("question_text"), "question_type": event.get("question_type"),
+                              "category": event.get("category"), "topic": event.get("topic"),
+                              "timestamp": event.get("ts")})
+        elif kind == "response":
+            entry = questions.get(event["question_id"])
+            if entry is None:
+                entry = {"question_id": event["question_id"], "round_number": len(session["questions"]) + 1,
+                         "responses": []}
+                questions[event["question_id"]] = entry
+                session["questions"].append(entry)
+            response = dict(event["response"])
+            response["response_number"] = len(entry["responses"])
+            entry["responses"].append(response)
+        elif kind == "followup_generated":
+            entry = questions.get(event["question_id"])
+            if entry and event["response_number"] < len(entry["responses"]):
+                entry["responses"][event["response_number"]]["followup_generated"] = event["followup"]
+        elif kind == "expert_feedback":
+            feedback = event["feedback"]
+            session["expert_feedback"].append(feedback)
+            original = feedback.get("original_followup")
+            if original and feedback.get("rating"):
+                add_feedback_to_stats(session["strategy_performance"], original.get("strategy_id", "unknown"),
+                                      feedback.get("action"), feedback.get("rating"))
+        elif kind == "email_event":
+            session.setdefault("email_events", []).append(event["data"])
+        elif kind == "resume_parse":
+            session.setdefault("resume_parse_events", []).append(event["data"])
+        elif kind == "session_finalized":
+            session["finalized_at"] = event.get("ts")
+    return session
+
+
+def add_feedback_to_stats(stats: Dict[str, Dict[str, int]], strategy_id: str, action: Optional[str],
+                          rating: Optional[str]):
+    """Count one rated piece of expert feedback against its strategy"""
+    perf = stats.setdefault(strategy_id, {name: 0 for name in STRATEGY_COUNTERS})
+    perf["total_uses"] += 1
+    if rating == "good":
+        perf["good_ratings"] += 1
+    elif rating == "bad":
+        perf["bad_ratings"] += 1
+    if action == "edited":
+        perf["edited_count"] += 1
+    elif action == "overridden":
+        perf["overridden_count"] += 1
+
+
+class EventLog:
+    """Shared writer/reader for the segmented log (one per process, see get_event_log())"""
+
+    def __init__(self, directory: str = EVENT_LOG_DIR, segment_bytes: int = EVENT_LOG_SEGMENT_BYTES,
+                 fsync_every: int = EVENT_LOG_FSYNC_EVERY, fsync_interval: float = EVENT_LOG_FSYNC_INTERVAL,
+                 legacy_file: Optional[str] = LEGACY_LOG_FILE):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.segments_dir = os.path.join(directory, "segments")
+        self.sessions_dir = os.path.join(directory, "sessions")
+        self.feedback_file = os.path.join(directory, "feedback.jsonl")
+        os.makedirs(self.segments_dir, exist_ok=True)
+        os.makedirs(self.sessions_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._lock_file = open(os.path.join(directory, "events.lock"), "a+")
+        self._flock = _FileLock(self._lock_file)
+        self._segment_number = self._latest_segment()
+        self._segment = None
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+        self.events_written = 0
+
+        if legacy_file and os.path.exists(legacy_file):
+            # Workers start together: only the first to take the lock finds the log empty
+            with self.locked():
+                self._segment_number = self._latest_segment()
+                if not self._has_events():
+                    self.import_legacy_log(legacy_file)
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------ writing
+
+    def append(self, session_id: str, event_type: str, ts: Optional[str] = None, **payload) -> Dict[str, Any]:
+        """Append one event and index it; returns the event as written (ts defaults to now)"""
+        event = {"ts": ts or datetime.now().isoformat(), "session_id": session_id, "type": event_type, **payload}
+        line = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock, self._file_lock():
+            segment = self._writable_segment(len(line))
+            offset = segment.seek(0, os.SEEK_END)
+            segment.write(line)
+            segment.flush()
+            with open(self._session_index_path(session_id, create=True), "a", encoding="utf-8") as index:
+                index.write(f"{self._segment_number} {offset} {len(line)}\n")
+            if event_type == "expert_feedback":
+                with open(self.feedback_file, "a", encoding="utf-8") as feedback:
+                    feedback.write(json.dumps(self.feedback_record(event), ensure_ascii=False, default=str) + "\n")
+            self.events_written += 1
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._fsync()
+        return event
+
+    def flush(self):
+        """fsync whatever the batch hasn't yet"""
+        with self._lock:
+            if self._unsynced:
+                self._fsync()
+
+    def close(self):
+        with self._lock:
+            if self._segment:
+                self.flush()
+                self._segment.close()
+                self._segment = None
+
+    def _fsync(self):
+        if self._segment:
+            os.fsync(self._segment.fileno())
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+
+    def _writable_segment(self, incoming: int):
+        """The current segment (called under the file lock); rolls to a new one when full"""
+        # Another worker may have rolled since we last looked
+        while os.path.exists(self._segment_path(self._segment_number + 1)):
+            self._open_segment(self._segment_number + 1)
+        if self._segment is None:
+            self._open_segment(self._segment_number)
+        size = self._segment.seek(0, os.SEEK_END)
+        if size and size + incoming > self.segment_bytes:
+            self._open_segment(self._segment_number + 1)
+        return self._segment
+
+    def _open_segment(self, number: int):
+        if self._segment:
+            if self._unsynced:
+                self._fsync()
+            self._segment.close()
+        self._segment_number = number
+        self._segment = open(self._segment_path(number), "ab")
+
+    def _file_lock(self):
+        return self._flock
+
+    @contextmanager
+    def locked(self):
+        """Hold off appends from every thread and worker (for consistent reads during rebuilds)"""
+        with self._lock, self._file_lock():
+            yield
+
+    # ------------------------------------------------------------------ reading
+
+    def session_exists(self, session_id: str) -> bool:
+        return os.path.exists(self._session_index_path(session_id))
+
+    def _read_index(self, session_id: str) -> List[Tuple[int, int, int]]:
+        try:
+            with open(self._session_index_path(session_id), "r", encoding="utf-8") as index:
+                return [tuple(int(field) for field in line.split()) for line in index if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def session_pointers(self, session_id: str) -> List[Tuple[int, int]]:
+        """(segment, offset) of each of a session's live events"""
+        return [(segment, offset) for segment, offset, _ in self._read_index(session_id)]
+
+    def session_events(self, session_id: str) -> List[Dict[str, Any]]:
+        """A session's events in order, read through its index (no scan of other sessions)"""
+        events = []
+        handles: Dict[int, Any] = {}
+        try:
+            for number, offset, length in self._read_index(session_id):
+                if number not in handles:
+                    handles[number] = open(self._segment_path(number), "rb")
+                handle = handles[number]
+                handle.seek(offset)
+                events.append(json.loads(handle.read(length)))
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return events
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return fold_session(session_id, self.session_events(session_id))
+
+    def session_ids(self) -> List[str]:
+        return [session_id for session_id, _ in self.session_index_paths()]
+
+    def session_index_paths(self) -> Iterator[Tuple[str, str]]:
+        """(session_id, index path) of every live (not archived) session"""
+        for shard in sorted(os.listdir(self.sessions_dir)):
+            shard_dir = os.path.join(self.sessions_dir, shard)
+            for name in sorted(os.listdir(shard_dir)):
+                if name.endswith(".idx"):
+                    yield name[:-4], os.path.join(shard_dir, name)
+
+    def segment_sessions(self, number: int) -> set:
+        """Sessions with events in one segment"""
+        return {event.get("session_id") for _, _, _, event in self._iter_segment(number)}
+
+    def sealed_segment_numbers(self) -> List[int]:
+        """Segments no longer appended to (every one but the newest)"""
+        return self._segment_numbers()[:-1]
+
+    def iter_events(self) -> Iterator[Tuple[int, int, int, Dict[str, Any]]]:
+        """Every event in log order as (segment, offset, length, event); for rebuilds and exports"""
+        for number in self._segment_numbers():
+            yield from self._iter_segment(number)
+
+    def _iter_segment(self, number: int) -> Iterator[Tuple[int, int, int, Dict[str, Any]]]:
+        with open(self._segment_path(number), "rb") as segment:
+            offset = 0
+            for line in segment:
+                if line.strip():
+                    try:
+                        yield number, offset, len(line), json.loads(line)
+                    except json.JSONDecodeError:
+                        pass  # torn final line from a crash before fsync
+                offset += len(line)
+
+    def read_feedback(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Feedback records appended after byte `offset` of feedback.jsonl, and the offset
+        to resume from. Readers keep their own offset and fold only what is new.
+        """
+        try:
+            with open(self.feedback_file, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        # Only whole lines; a concurrent writer may be mid-line
+        end = data.rfind(b"\n") + 1
+        records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return records, offset + end
+
+    def feedback_size(self) -> int:
+        try:
+            return os.path.getsize(self.feedback_file)
+        except FileNotFoundError:
+            return 0
+
+    def feedback_record(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """The feedback.jsonl projection of an expert_feedback event"""
+        feedback = event["feedback"]
+        original = feedback.get("original_followup") or {}
+        return {
+            "ts": event["ts"],
+            "session_id": event["session_id"],
+            "question_id": feedback.get("question_id"),
+            "question_logged": event.get("question_logged", False),
+            # Counted against a strategy only when there was an original follow-up (as before)
+            "has_original": bool(feedback.get("original_followup")),
+            "strategy_id": original.get("strategy_id"),
+            "action": feedback.get("action"),
+            "rating": feedback.get("rating"),
+            "ai_suggestion": original.get("text", ""),
+            "edited_text": feedback.get("edited_text"),
+            "custom_text": feedback.get("custom_text"),
+        }
+
+    # ------------------------------------------------------------------ maintenance
+
+    def rebuild_indexes(self, archived_events: Iterable[Dict[str, Any]] = (),
+                        archived_pointers: Collection[Tuple[int, int]] = ()):
+        """
+        Regenerate session indexes and feedback.jsonl from the segments (offline
+        maintenance: running workers' feedback readers should be restarted after it).
+        Archived sessions (see log_archive) contribute their feedback but get no index;
+        their events still in sealed segments are skipped.
+        """
+        with self._lock, self._file_lock():
+            pointers: Dict[str, List[str]] = {}
+            questions: Dict[str, set] = {}
+            feedback_lines = []
+            archived = ((None, None, None, event) for event in archived_events)
+            for number, offset, length, event in chain(archived, self.iter_events()):
+                if number is not None and (number, offset) in archived_pointers:
+                    continue
+                session_id = event.get("session_id")
+                if number is not None:
+                    pointers.setdefault(session_id, []).append(f"{number} {offset} {length}\n")
+                if event.get("type") == "question":
+                    questions.setdefault(session_id, set()).add(event.get("question_id"))
+                elif event.get("type") == "response":
+                    questions.setdefault(session_id, set()).add(event.get("question_id"))
+                elif event.get("type") == "expert_feedback":
+                    event.setdefault("question_logged",
+                                     event["feedback"].get("question_id") in questions.get(session_id, ()))
+                    feedback_lines.append(json.dumps(self.feedback_record(event), ensure_ascii=False, default=str) + "\n")
+            for session_id, lines in pointers.items():
+                with open(self._session_index_path(session_id, create=True), "w", encoding="utf-8") as index:
+                    index.writelines(lines)
+            with open(self.feedback_file, "w", encoding="utf-8") as feedback:
+                feedback.writelines(feedback_lines)
+
+    def delete_session_index(self, session_id: str):
+        """Drop a session from the live log (once archived); its segment lines stay until compacted"""
+        try:
+            os.remove(self._session_index_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def delete_segment(self, number: int):
+        """Remove a sealed segment nothing live points into"""
+        if number >= self._latest_segment():
+            raise ValueError(f"segment {number} is still being appended to")
+        os.remove(self._segment_path(number))
+
+    def import_legacy_log(self, path: str):
+        """Convert a whole-file log.json into events (once, when the event log is empty)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                sessions = json.load(f).get("interview_sessions", [])
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARN] Could not import legacy log {path}: {e}")
+            return
+        for session in sessions:
+            session_id = session.get("session_id")
+            if not session_id:
+                continue
+            # Events keep the times the legacy log recorded
+            created_at = session.get("created_at")
+            self.append(session_id, "session_started", ts=created_at, language=session.get("detected_language"),
+                        jd_id=session.get("jd_id"))
+            logged = set()
+            for question in session.get("questions", []):
+                asked_at = question.get("timestamp") or created_at
+                if "question_text" in question:
+                    self.append(session_id, "question", ts=asked_at, question_id=question["question_id"],
+                                question_text=question.get("question_text"), question_type=question.get("question_type"),
+                                round_number=question.get("round_number"), category=question.get("category"),
+                                topic=question.get("topic"))
+                logged.add(question["question_id"])
+                for response in question.get("responses", []):
+                    self.append(session_id, "response", ts=response.get("timestamp") or asked_at,
+                                question_id=question["question_id"], response=response)
+            for feedback in session.get("expert_feedback", []):
+                self.append(session_id, "expert_feedback", ts=feedback.get("timestamp") or created_at, feedback=feedback,
+                            question_logged=feedback.get("question_id") in logged)
+            for data in session.get("email_events", []):
+                self.append(session_id, "email_event", ts=data.get("timestamp") or created_at, data=data)
+            for data in session.get("resume_parse_events", []):
+                self.append(session_id, "resume_parse", ts=data.get("timestamp") or created_at, data=data)
+        self.flush()
+        print(f"[INFO] Imported {len(sessions)} sessions from {path} into the event log")
+
+    # ------------------------------------------------------------------ paths
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.segments_dir, segment_name(number))
+
+    def _segment_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.segments_dir):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                numbers.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+        return sorted(numbers)
+
+    def _latest_segment(self) -> int:
+        numbers = self._segment_numbers()
+        return numbers[-1] if numbers else 1
+
+    def _has_events(self) -> bool:
+        path = self._segment_path(self._segment_number)
+        return os.path.exists(path) and os.path.getsize(path) > 0
+
+    def _session_index_path(self, session_id: str, create: bool = False) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(session_id))
+        shard = os.path.join(self.sessions_dir, (safe[:2] or "__").ljust(2, "_"))
+        if create:
+            os.makedirs(shard, exist_ok=True)
+        return os.path.join(shard, f"{safe}.idx")
+
+
+class _FileLock:
+    """
+    Exclusive flock on the log's lock file for the duration of a with-block.
+    Re-entrant (an append inside locked() keeps the lock); always taken under the
+    log's thread lock, which guards the depth count.
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.depth = 0
+
+    def __enter__(self):
+        if fcntl and self.depth == 0:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+        if fcntl and self.depth == 0:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        return False
+
+
+# Singleton
+_event_log = None
+
+def get_event_log() -> EventLog:
+    global _event_log
+    if _event_log is None:
+        _event_log = EventLog()
+    return _event_log
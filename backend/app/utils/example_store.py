@@ -0,0 +1,144 @@
+"""
+In-memory index of expert-approved follow-up examples for few-shot prompts.
+
+Built from the event log's feedback projection (feedback.jsonl) and kept current
+by folding only the records appended since the last refresh. Examples are held in
+bounded, most-recent-last buckets keyed by strategy, by rating and by both, so a
+lookup touches at most one bucket of EXPERT_EXAMPLES_PER_KEY entries no matter
+how much feedback has been logged.
+"""
+import os
+import re
+import time
+import threading
+from collections import Counter, deque
+from typing import Dict, List, Any, Optional, Tuple
+
+from .event_log import EventLog, get_event_log
+
+# Most recent examples kept per strategy / rating bucket
+EXPERT_EXAMPLES_PER_KEY = int(os.getenv("EXPERT_EXAMPLES_PER_KEY", 50))
+# How often to pick up feedback written by other workers (this worker's own writes show up at once)
+EXPERT_EXAMPLES_REFRESH_SECONDS = float(os.getenv("EXPERT_EXAMPLES_REFRESH_SECONDS", 5))
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+ALL = None  # bucket key component meaning "any"
+
+
+def to_example(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    A successful example from one feedback record, or None. Successful means the
+    expert edited/overrode the AI's suggestion (not rated bad), or approved it and
+    rated it good.
+    """
+    rating = record.get("rating")
+    # Skip if rating is "bad" - we only want successful examples
+    if rating == "bad":
+        return None
+    action = record.get("action")
+    ai_suggestion = record.get("ai_suggestion") or ""
+    example = {
+        "strategy_id": record.get("strategy_id"),
+        "action": action,
+        "rating": rating,
+        "question_context": record.get("question_id") if record.get("question_logged") else None,
+    }
+    if action == "edited" and record.get("edited_text"):
+        # Expert improved the AI suggestion
+        example["ai_suggestion"] = ai_suggestion
+        example["expert_improvement"] = record["edited_text"]
+        example["learning"] = "Expert edited this to be better"
+    elif action == "overridden" and record.get("custom_text"):
+        # Expert replaced with their own - this is a gold standard example
+        example["ai_suggestion"] = ai_suggestion
+        example["expert_improvement"] = record["custom_text"]
+        example["learning"] = "Expert provided a better alternative"
+    elif action == "approved" and rating == "good":
+        # AI did well - this is also useful to reinforce
+        example["ai_suggestion"] = ai_suggestion
+        example["expert_improvement"] = ai_suggestion  # Same text
+        example["learning"] = "AI suggestion was rated good by expert"
+    else:
+        return None
+    return example
+
+
+def _terms(text: str) -> frozenset:
+    return frozenset(_WORD.findall(text.lower()))
+
+
+class ExampleStore:
+    """Expert examples indexed by (strategy_id, rating), refreshed incrementally from the event log"""
+
+    def __init__(self, events: Optional[EventLog] = None, per_key: int = EXPERT_EXAMPLES_PER_KEY,
+                 refresh_seconds: float = EXPERT_EXAMPLES_REFRESH_SECONDS):
+        self.events = events or get_event_log()
+        self.per_key = per_key
+        self.refresh_seconds = refresh_seconds
+        self._buckets: Dict[Tuple[Optional[str], Optional[str]], deque] = {}
+        self._offset = 0
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+        self.examples_indexed = 0
+
+    def refresh(self, force: bool = False):
+        """Index feedback appended since the last refresh (by any worker)"""
+        if not force and time.monotonic() < self._next_refresh:
+            return
+        with self._lock:
+            records, self._offset = self.events.read_feedback(self._offset)
+            for record in records:
+                self.add(record)
+            self._next_refresh = time.monotonic() + self.refresh_seconds
+
+    def add(self, record: Dict[str, Any]):
+        example = to_example(record)
+        if example is None:
+            return
+        # Precomputed once for similarity lookups; stripped from what callers get back
+        entry = (example, _terms(f"{example['ai_suggestion']} {example['expert_improvement']}"))
+        strategy_id, rating = example["strategy_id"], example["rating"]
+        for key in {(ALL, ALL), (strategy_id, ALL), (ALL, rating), (strategy_id, rating)}:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = deque(maxlen=self.per_key)
+            bucket.append(entry)
+        self.examples_indexed += 1
+
+    def get_examples(self, strategy_id: Optional[str] = None, rating: Optional[str] = None, limit: int = 3,
+                     query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        The `limit` most recent examples for a strategy and/or rating (None = any),
+        oldest first. With `query`, the bucket's examples sharing the most words with
+        it are chosen instead, words weighted by how rare they are in the bucket so
+        shared phrasing doesn't outweigh the topic (ties go to the more recent one).
+        """
+        self.refresh()
+        bucket = self._buckets.get((strategy_id or ALL, rating or ALL))
+        if not bucket or limit <= 0:
+            return []
+        entries = list(bucket)
+        if query:
+            terms = _terms(query)
+            frequency = Counter(term for _, entry_terms in entries for term in entry_terms & terms)
+            scores = [sum(1 / frequency[term] for term in terms & entry_terms) for _, entry_terms in entries]
+            ranked = sorted(range(len(entries)), key=lambda i: (scores[i], i), reverse=True)
+            entries = [entries[i] for i in sorted(ranked[:limit])]
+        else:
+            entries = entries[-limit:]
+        return [dict(example) for example, _ in entries]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"examples_indexed": self.examples_indexed, "buckets": len(self._buckets),
+                "feedback_offset": self._offset}
+
+
+# Singleton
+_example_store = None
+
+def get_example_store() -> ExampleStore:
+    global _example_store
+    if _example_store is None:
+        _example_store = ExampleStore()
+    return _example_store
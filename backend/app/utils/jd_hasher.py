@@ -22,6 +22,19 @@ def hash_jd(jd_text: str) -> str:
     # Create hash
     return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
+def hash_resume(resume_text: str) -> str:
+    """
+    Create a hash of the resume text so unchanged resumes can skip re-scoring
+    
+    Args:
+        resume_text: Parsed resume text
+        
+    Returns:
+        SHA256 hash of the normalized resume text
+    """
+    # Same normalization as JDs: formatting-only edits don't invalidate scores
+    return hash_jd(resume_text)
+
 def jd_changed(jd_text: str, cached_hash: str) -> bool:
     """
     Check if JD has changed since last analysis
@@ -0,0 +1,246 @@
+"""
+Background archival and compaction for the event log.
+
+Finished sessions (finalized and quiet for LOG_ARCHIVE_FINALIZED_MINUTES, or idle
+for LOG_ARCHIVE_IDLE_HOURS) are moved out of the live log into date-partitioned,
+gzip-compressed JSONL:
+
+  archive/2026-10-17/sessions-<run>.jsonl.gz   one gzip member per session:
+                                               {"session_id", "events": [...]}
+  archive/manifest.jsonl                       session_id -> file, byte offset and
+                                               length of its member (+ the segment
+                                               pointers it took over)
+
+Every member is a complete gzip stream, so a session is read back with one seek and
+one decompress (no scan), while each partition file still reads as ordinary .jsonl.gz.
+Once no live session points into a sealed segment, the segment is deleted.
+
+LogCompactor.start() runs this off the request path on the event loop's default
+executor; only one worker compacts at a time (compaction.lock).
+"""
+import os
+import gzip
+import json
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterator, Set, Tuple
+
+from .event_log import EventLog, get_event_log, fcntl
+
+LOG_ARCHIVE_IDLE_HOURS = float(os.getenv("LOG_ARCHIVE_IDLE_HOURS", 24))
+LOG_ARCHIVE_FINALIZED_MINUTES = float(os.getenv("LOG_ARCHIVE_FINALIZED_MINUTES", 10))
+LOG_COMPACTION_INTERVAL = float(os.getenv("LOG_COMPACTION_INTERVAL", 3600))
+# Sessions archived per run, so one run stays short
+LOG_ARCHIVE_BATCH = int(os.getenv("LOG_ARCHIVE_BATCH", 2000))
+
+
+class LogArchive:
+    """Reader/writer for the compressed archive and its manifest"""
+
+    def __init__(self, events: Optional[EventLog] = None):
+        self.events = events or get_event_log()
+        self.directory = os.path.join(self.events.directory, "archive")
+        self.manifest_file = os.path.join(self.directory, "manifest.jsonl")
+        os.makedirs(self.directory, exist_ok=True)
+        self._manifest: Dict[str, List[Dict[str, Any]]] = {}
+        self._manifest_offset = 0
+
+    def _refresh_manifest(self):
+        """Fold manifest entries appended (by whichever worker compacted) since the last read"""
+        try:
+            with open(self.manifest_file, "rb") as f:
+                f.seek(self._manifest_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                self._manifest.setdefault(entry["session_id"], []).append(entry)
+        self._manifest_offset += end
+
+    def is_archived(self, session_id: str) -> bool:
+        self._refresh_manifest()
+        return session_id in self._manifest
+
+    def session_ids(self) -> List[str]:
+        self._refresh_manifest()
+        return list(self._manifest)
+
+    def session_events(self, session_id: str) -> List[Dict[str, Any]]:
+        """Archived events of a session (possibly from several runs), oldest first"""
+        self._refresh_manifest()
+        events = []
+        for entry in self._manifest.get(session_id, []):
+            with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+                f.seek(entry["offset"])
+                member = f.read(entry["length"])
+            events += json.loads(gzip.decompress(member))["events"]
+        return events
+
+    def archived_pointers(self) -> Set[Tuple[int, int]]:
+        """(segment, offset) of every archived event, to skip when replaying the segments"""
+        self._refresh_manifest()
+        return {(segment, offset) for entries in self._manifest.values()
+                for entry in entries for segment, offset in entry.get("pointers", [])}
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Every archived event, partition by partition (for rebuilds)"""
+        for name in sorted(os.listdir(self.directory)):
+            partition = os.path.join(self.directory, name)
+            if not os.path.isdir(partition):
+                continue
+            for file_name in sorted(os.listdir(partition)):
+                if file_name.endswith(".jsonl.gz"):
+                    with gzip.open(os.path.join(partition, file_name), "rt", encoding="utf-8") as f:
+                        for line in f:
+                            if line.strip():
+                                yield from json.loads(line)["events"]
+
+    def write(self, partition_file: str, session_id: str, events: List[Dict[str, Any]],
+              pointers: List[Tuple[int, int]]) -> Dict[str, Any]:
+        """Append one session as a gzip member and record it in the manifest"""
+        member = gzip.compress((json.dumps({"session_id": session_id, "events": events},
+                                           ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+        path = os.path.join(self.directory, partition_file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+        entry = {"session_id": session_id, "file": partition_file, "offset": offset, "length": len(member),
+                 "created_at": events[0].get("ts") if events else None, "archived_at": datetime.now().isoformat(),
+                 "events": len(events), "pointers": pointers}
+        with open(self.manifest_file, "a", encoding="utf-8") as manifest:
+            manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+            os.fsync(manifest.fileno())
+        return entry
+
+
+class LogCompactor:
+    """Moves finished sessions into the archive and deletes segments nothing live points into"""
+
+    def __init__(self, events: Optional[EventLog] = None, archive: Optional[LogArchive] = None,
+                 idle_hours: float = LOG_ARCHIVE_IDLE_HOURS, finalized_minutes: float = LOG_ARCHIVE_FINALIZED_MINUTES,
+                 batch: int = LOG_ARCHIVE_BATCH, interval: float = LOG_COMPACTION_INTERVAL):
+        self.events = events or get_event_log()
+        self.archive = archive or LogArchive(self.events)
+        self.idle_seconds = idle_hours * 3600
+        self.finalized_seconds = finalized_minutes * 60
+        self.batch = batch
+        self.interval = interval
+        self._segment_sessions: Dict[int, Set[str]] = {}  # sealed segments are immutable
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    def run_once(self) -> Dict[str, Any]:
+        """One compaction pass; skipped if another worker is compacting"""
+        lock = open(os.path.join(self.events.directory, "compaction.lock"), "a+")
+        try:
+            if fcntl:
+                try:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return {"skipped": "another worker is compacting"}
+            start = time.time()
+            archived, archived_bytes = self._archive_finished(start)
+            deleted = self._delete_dead_segments()
+            self.last_run = {"archived_sessions": archived, "archived_bytes": archived_bytes,
+                             "deleted_segments": deleted, "seconds": round(time.time() - start, 3),
+                             "finished_at": datetime.now().isoformat()}
+            if archived or deleted:
+                print(f"[INFO] Log compaction: archived {archived} sessions, deleted {len(deleted)} segments")
+            return self.last_run
+        finally:
+            lock.close()
+
+    def _archive_finished(self, now: float) -> Tuple[int, int]:
+        run = datetime.now().strftime("%Y%m%dT%H%M%S")
+        archived = archived_bytes = 0
+        for session_id, index_path in self._candidates(now):
+            if archived >= self.batch:
+                break
+            with self.events.locked():
+                # Re-check under the lock: an event may have arrived since the scan
+                try:
+                    idle = now - os.path.getmtime(index_path)
+                except FileNotFoundError:
+                    continue
+                pointers = self.events.session_pointers(session_id)
+                events = self.events.session_events(session_id)
+                finalized = any(e.get("type") == "session_finalized" for e in events)
+                if idle < (self.finalized_seconds if finalized else self.idle_seconds):
+                    continue
+                date = self._session_date(events)
+                entry = self.archive.write(os.path.join(date, f"sessions-{run}-{os.getpid()}.jsonl.gz"),
+                                           session_id, events, pointers)
+                self.events.delete_session_index(session_id)
+            archived += 1
+            archived_bytes += entry["length"]
+        return archived, archived_bytes
+
+    def _candidates(self, now: float) -> Iterator[Tuple[str, str]]:
+        """Live sessions quiet for at least the finalized grace period (index mtime = last event)"""
+        for session_id, index_path in self.events.session_index_paths():
+            try:
+                if now - os.path.getmtime(index_path) >= self.finalized_seconds:
+                    yield session_id, index_path
+            except FileNotFoundError:
+                continue
+
+    @staticmethod
+    def _session_date(events: List[Dict[str, Any]]) -> str:
+        for event in events:
+            if event.get("ts"):
+                return event["ts"][:10]
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _delete_dead_segments(self) -> List[int]:
+        """Delete sealed segments whose sessions are all archived"""
+        deleted = []
+        with self.events.locked():
+            for number in self.events.sealed_segment_numbers():
+                sessions = self._segment_sessions.get(number)
+                if sessions is None:
+                    sessions = self._segment_sessions[number] = self.events.segment_sessions(number)
+                if not any(self.events.session_exists(session_id) for session_id in sessions):
+                    self.events.delete_segment(number)
+                    self._segment_sessions.pop(number, None)
+                    deleted.append(number)
+        return deleted
+
+    def start(self):
+        """Compact every interval in the background (idempotent)"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await loop.run_in_executor(None, self.run_once)
+            except Exception as e:
+                print(f"[ERROR] Log compaction failed: {e}")
+
+
+# Singletons
+_archive = None
+_compactor = None
+
+def get_log_archive() -> LogArchive:
+    global _archive
+    if _archive is None:
+        _archive = LogArchive()
+    return _archive
+
+def get_log_compactor() -> LogCompactor:
+    global _compactor
+    if _compactor is None:
+        _compactor = LogCompactor(archive=get_log_archive())
+    return _compactor
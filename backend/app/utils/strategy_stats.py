@@ -0,0 +1,150 @@
+"""
+Running per-strategy success-rate aggregates (a projector over expert feedback).
+
+StrategyStatsProjector folds each feedback record into its strategy's counters
+and recomputes that strategy's success_rate / quality_score, so an update is O(1)
+and a read is a copy of the current state. It consumes the event log's feedback
+projection (feedback.jsonl) from a byte offset, which picks up every worker's writes.
+
+State persists as a small snapshot (strategy_stats.json next to the log: counters
+plus the offset they cover), so a restart folds only feedback logged after it.
+rebuild() recomputes everything from the archive and the log segments, for recovery; see
+rebuild_strategy_stats.py.
+"""
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from .event_log import EventLog, get_event_log, add_feedback_to_stats, STRATEGY_COUNTERS
+from .log_archive import LogArchive
+
+# Write the snapshot after this many folded records (and on flush())
+STRATEGY_SNAPSHOT_EVERY = int(os.getenv("STRATEGY_SNAPSHOT_EVERY", 50))
+
+SNAPSHOT_FILE = "strategy_stats.json"
+
+
+def score(stats: Dict[str, Any]):
+    """Derive success_rate and quality_score from a strategy's counters"""
+    total_rated = stats["good_ratings"] + stats["bad_ratings"]
+    if total_rated > 0:
+        stats["success_rate"] = stats["good_ratings"] / total_rated
+        # Penalty for edits/overrides (expert had to fix it)
+        stats["quality_score"] = stats["success_rate"] - (0.1 * stats["edited_count"] / max(1, stats["total_uses"])) - (0.2 * stats["overridden_count"] / max(1, stats["total_uses"]))
+    else:
+        stats["success_rate"] = 0.5  # No data, assume neutral
+        stats["quality_score"] = 0.5
+
+
+class StrategyStatsProjector:
+    """Maintains strategy success-rate aggregates from expert feedback records"""
+
+    def __init__(self, events: Optional[EventLog] = None, snapshot_every: int = STRATEGY_SNAPSHOT_EVERY):
+        self.events = events or get_event_log()
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = os.path.join(self.events.directory, SNAPSHOT_FILE)
+        self.strategies: Dict[str, Dict[str, Any]] = {}
+        self.offset = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._load_snapshot()
+
+    def handle_event(self, event: Dict[str, Any]):
+        """Fold one event-log event (only expert_feedback matters)"""
+        if event.get("type") == "expert_feedback":
+            self.handle_feedback(self.events.feedback_record(event))
+
+    def handle_feedback(self, record: Dict[str, Any]):
+        """Fold one feedback record: O(1), touches only its strategy"""
+        # Counted against a strategy only when there was an original follow-up
+        if not (record.get("has_original") and record.get("rating")):
+            return
+        strategy_id = record.get("strategy_id") or "unknown"
+        add_feedback_to_stats(self.strategies, strategy_id, record.get("action"), record.get("rating"))
+        score(self.strategies[strategy_id])
+
+    def refresh(self):
+        """Fold feedback appended (by any worker) since the covered offset"""
+        with self._lock:
+            records, offset = self.events.read_feedback(self.offset)
+            for record in records:
+                self.handle_feedback(record)
+            self.offset = offset
+            self._unsaved += len(records)
+            if self._unsaved >= self.snapshot_every:
+                self._save_snapshot()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Current aggregates per strategy (a copy)"""
+        self.refresh()
+        return {strategy_id: dict(stats) for strategy_id, stats in self.strategies.items()}
+
+    def flush(self):
+        with self._lock:
+            if self._unsaved:
+                self._save_snapshot()
+
+    def rebuild(self):
+        """Recompute from the archive and log segments (the source of truth) and rewrite the snapshot"""
+        archive = LogArchive(self.events)
+        with self._lock, self.events.locked():
+            self.strategies = {}
+            for event in archive.iter_events():
+                self.handle_event(event)
+            archived = archive.archived_pointers()
+            for number, offset, _, event in self.events.iter_events():
+                if (number, offset) not in archived:
+                    self.handle_event(event)
+            # Appends hold the same lock, so feedback.jsonl's size matches what was folded
+            self.offset = self.events.feedback_size()
+            self._save_snapshot()
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARN] Ignoring unreadable strategy stats snapshot ({e}); refolding feedback")
+            return
+        if snapshot.get("offset", 0) > self.events.feedback_size():
+            # feedback.jsonl was rebuilt since the snapshot; offsets no longer line up
+            print("[WARN] Strategy stats snapshot is ahead of feedback.jsonl; refolding feedback")
+            return
+        self.strategies = {
+            strategy_id: {name: stats.get(name, 0) for name in STRATEGY_COUNTERS}
+            for strategy_id, stats in snapshot.get("strategies", {}).items()
+        }
+        for stats in self.strategies.values():
+            score(stats)
+        self.offset = snapshot.get("offset", 0)
+
+    def _save_snapshot(self):
+        snapshot = {
+            "offset": self.offset,
+            "updated_at": datetime.now().isoformat(),
+            "strategies": {strategy_id: {name: stats[name] for name in STRATEGY_COUNTERS}
+                           for strategy_id, stats in self.strategies.items()}
+        }
+        # Atomic replace: concurrent workers each write a consistent (offset, counters) pair
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+            self._unsaved = 0
+        except OSError as e:
+            print(f"[WARN] Could not write strategy stats snapshot: {e}")
+
+
+# Singleton
+_projector = None
+
+def get_strategy_stats() -> StrategyStatsProjector:
+    global _projector
+    if _projector is None:
+        _projector = StrategyStatsProjector()
+    return _projector
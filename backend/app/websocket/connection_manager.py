@@ -1,70 +1,52 @@
 """WebSocket connection management with channels"""
-from typing import Dict, Set, Optional
+from typing import Dict, Optional
 from fastapi import WebSocket
 
+from .outbound import OutboundConnection, fan_out
+
 class ConnectionManager:
     """Manages WebSocket connections with separate channels and tenant isolation"""
     
     def __init__(self):
-        # Format: {tenant_id: set(WebSocket)}
-        self.admin_connections: Dict[str, Set[WebSocket]] = {}
-        self.candidate_connections: Dict[str, Set[WebSocket]] = {}
+        # Format: {tenant_id: {WebSocket: OutboundConnection}}
+        self.admin_connections: Dict[str, Dict[WebSocket, OutboundConnection]] = {}
+        self.candidate_connections: Dict[str, Dict[WebSocket, OutboundConnection]] = {}
+    
+    def _channel(self, view: str) -> Dict[str, Dict[WebSocket, OutboundConnection]]:
+        # Expert view is treated as admin (receives all admin messages)
+        if view == "admin" or view == "expert":
+            return self.admin_connections
+        return self.candidate_connections
     
     async def connect(self, websocket: WebSocket, view: str, tenant_id: str = "global"):
         """Connect WebSocket to appropriate channel and tenant"""
         await websocket.accept()
         
-        # Initialize tenant sets if they don't exist
+        # Initialize tenant maps if they don't exist
         if tenant_id not in self.admin_connections:
-            self.admin_connections[tenant_id] = set()
+            self.admin_connections[tenant_id] = {}
         if tenant_id not in self.candidate_connections:
-            self.candidate_connections[tenant_id] = set()
-            
-        # Expert view is treated as admin (receives all admin messages)
-        if view == "admin" or view == "expert":
-            self.admin_connections[tenant_id].add(websocket)
-        else:
-            self.candidate_connections[tenant_id].add(websocket)
+            self.candidate_connections[tenant_id] = {}
+        
+        channel = self._channel(view)[tenant_id]
+        # Slow consumers are closed by their queue and removed here
+        outbound = OutboundConnection(websocket, on_close=lambda conn: channel.pop(conn.websocket, None))
+        outbound.start()
+        channel[websocket] = outbound
     
     def disconnect(self, websocket: WebSocket, view: str, tenant_id: str = "global"):
         """Disconnect WebSocket from channel and tenant"""
-        if tenant_id in self.admin_connections:
-            if view == "admin" or view == "expert":
-                self.admin_connections[tenant_id].discard(websocket)
-            else:
-                self.candidate_connections[tenant_id].discard(websocket)
+        outbound = self._channel(view).get(tenant_id, {}).pop(websocket, None)
+        if outbound:
+            outbound.close()
     
     async def send_to_candidate(self, message: Dict, tenant_id: str = "global"):
         """Send message to all candidate connections for a specific tenant"""
-        if tenant_id not in self.candidate_connections:
-            return
-            
-        disconnected = set()
-        for connection in list(self.candidate_connections[tenant_id]):
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.add(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            self.candidate_connections[tenant_id].discard(conn)
+        fan_out(self.candidate_connections.get(tenant_id, {}).values(), message)
     
     async def send_to_admin(self, message: Dict, tenant_id: str = "global"):
         """Send message to all admin connections for a specific tenant"""
-        if tenant_id not in self.admin_connections:
-            return
-            
-        disconnected = set()
-        for connection in list(self.admin_connections[tenant_id]):
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.add(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            self.admin_connections[tenant_id].discard(conn)
+        fan_out(self.admin_connections.get(tenant_id, {}).values(), message)
     
     async def broadcast(self, message: Dict, view: Optional[str] = None, tenant_id: str = "global"):
         """Broadcast message to connections for a specific tenant and optional view"""
@@ -76,4 +58,3 @@ class ConnectionManager:
             # Send to both
             await self.send_to_candidate(message, tenant_id)
             await self.send_to_admin(message, tenant_id)
-
@@ -0,0 +1,137 @@
+"""
+Per-connection outbound queues for WebSocket fan-out.
+
+A broadcast serializes its message once and enqueues the text on every
+connection; each connection has its own sender task, so one slow browser only
+ever delays itself. Policies:
+
+  coalescing     frames of a COALESCE_TYPES type replace the same type's frame
+                 still waiting in the queue (only the latest typing text matters)
+  bounded queue  a connection with WS_SEND_QUEUE_SIZE frames pending, or one
+                 whose send takes longer than WS_SEND_TIMEOUT, is closed with
+                 1013 (try again later); clients reconnect with ?last_seq and
+                 get what they missed from the replay log
+"""
+import os
+import json
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Iterable
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 256))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", 10))
+# Message types where only the newest pending frame is worth sending
+COALESCE_TYPES = frozenset({"candidate_typing"})
+
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def serialize(message: Dict[str, Any]) -> str:
+    """Encode a message once for every recipient"""
+    return json.dumps(message, default=str)
+
+
+class OutboundConnection:
+    """One socket's send queue and sender task"""
+
+    def __init__(self, websocket: WebSocket, on_close: Optional[Callable[["OutboundConnection"], None]] = None,
+                 max_queue: int = WS_SEND_QUEUE_SIZE, send_timeout: float = WS_SEND_TIMEOUT):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self._on_close = on_close
+        self._queue: deque = deque()           # (coalesce key or None, text)
+        self._wakeup = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.coalesced = 0
+
+    def start(self):
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._run())
+
+    def enqueue(self, text: str, message_type: Optional[str] = None, bounded: bool = True) -> bool:
+        """
+        Queue a serialized frame without waiting for the socket. Returns False if the
+        connection is closed or was just dropped as a slow consumer.
+        bounded=False is for replays, which may exceed the live queue bound.
+        """
+        if self.closed:
+            return False
+        key = message_type if message_type in COALESCE_TYPES else None
+        if key is not None:
+            for item in self._queue:
+                if item[0] == key:
+                    # Drop the stale frame; the new one goes to the back to keep ordering
+                    self._queue.remove(item)
+                    self.coalesced += 1
+                    break
+        if bounded and len(self._queue) >= self.max_queue:
+            logger.warning(f"Dropping slow WebSocket consumer ({len(self._queue)} frames pending)")
+            self._drop()
+            return False
+        self._queue.append((key, text))
+        self._wakeup.set()
+        return True
+
+    def send(self, message: Dict[str, Any], bounded: bool = True) -> bool:
+        """Queue a message for this socket only"""
+        return self.enqueue(serialize(message), message.get("type"), bounded)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    async def _run(self):
+        try:
+            while True:
+                while not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                _, text = self._queue.popleft()
+                await asyncio.wait_for(self.websocket.send_text(text), self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping WebSocket consumer: send took over {self.send_timeout:g}s")
+            self._drop()
+        except Exception as e:
+            logger.error(f"Error sending to connection: {e}")
+            self._drop(close_socket=False)
+
+    def _drop(self, close_socket: bool = True):
+        if self.closed:
+            return
+        self.close()
+        if close_socket:
+            asyncio.create_task(self._close_socket())
+        if self._on_close:
+            self._on_close(self)
+
+    async def _close_socket(self):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE), self.send_timeout)
+        except Exception:
+            pass
+
+    def close(self):
+        """Stop sending; frames still queued are discarded"""
+        self.closed = True
+        self._queue.clear()
+        if self._sender and self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        self._sender = None
+
+
+def fan_out(connections: Iterable[OutboundConnection], message: Dict[str, Any]) -> int:
+    """Serialize once and enqueue on every connection; returns how many accepted it"""
+    text = serialize(message)
+    message_type = message.get("type")
+    return sum(1 for connection in list(connections) if connection.enqueue(text, message_type))
@@ -0,0 +1,45 @@
+-- Migration: Resume Search Indexes
+-- Description: Move candidate filtering for /api/positions/{id}/candidates into the database.
+--   * domain_tags: domains detected at ingest (app/utils/domain_tags.py), GIN-indexed
+--   * search_vector: generated full-text vector over name + resume text, GIN-indexed
+--   * trigram index on candidate_name for fuzzy name search
+--   * keyset pagination index on (org_id, created_at DESC, id DESC) for live resumes
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 1. Domain tags precomputed at ingest
+ALTER TABLE public.resumes ADD COLUMN IF NOT EXISTS domain_tags TEXT[] NOT NULL DEFAULT '{}';
+
+-- Backfill existing rows (same keyword lists as RESUME_DOMAIN_KEYWORDS)
+UPDATE public.resumes r
+SET domain_tags = ARRAY(
+    SELECT d.domain
+    FROM (VALUES
+        ('engineering', ARRAY['engineer', 'developer', 'software', 'technical']),
+        ('hr',          ARRAY['hr', 'recruiter', 'human resources', 'talent']),
+        ('marketing',   ARRAY['marketing', 'content', 'seo', 'social media']),
+        ('sales',       ARRAY['sales', 'business development', 'account executive'])
+    ) AS d(domain, keywords)
+    WHERE EXISTS (
+        SELECT 1 FROM unnest(d.keywords) AS k
+        WHERE lower(coalesce(r.parsed_data->>'text', '')) LIKE '%' || k || '%'
+           OR lower(coalesce(r.candidate_name, '')) LIKE '%' || k || '%'
+    )
+);
+
+CREATE INDEX IF NOT EXISTS idx_resumes_domain_tags ON public.resumes USING GIN (domain_tags);
+
+-- 2. Full-text search over name + resume text
+ALTER TABLE public.resumes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('english', coalesce(candidate_name, '') || ' ' || coalesce(parsed_data->>'text', ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_resumes_search_vector ON public.resumes USING GIN (search_vector);
+
+-- 3. Fuzzy name search
+CREATE INDEX IF NOT EXISTS idx_resumes_candidate_name_trgm ON public.resumes USING GIN (candidate_name gin_trgm_ops);
+
+-- 4. Keyset pagination for an org's live resumes
+CREATE INDEX IF NOT EXISTS idx_resumes_org_keyset ON public.resumes (org_id, created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
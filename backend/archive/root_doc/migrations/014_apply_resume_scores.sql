@@ -0,0 +1,30 @@
+-- Migration: Apply Resume Scores
+-- Description: Write bulk ATS scores (app/services/ats_scoring.py) without touching the rest of the row.
+--   * merges each score into analyst_output: top-level match_score/explanation (latest score)
+--     plus position_scores->{position_id}; other analyst_output keys and all other columns are kept
+--   * resumes soft-deleted since the job read them are left alone
+--   * returns the number of rows updated
+
+CREATE OR REPLACE FUNCTION public.apply_resume_scores(p_position_id UUID, p_scores JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH scores AS (
+        SELECT (e->>'id')::UUID AS id, e->'score' AS score
+        FROM jsonb_array_elements(p_scores) AS e
+    ),
+    updated AS (
+        UPDATE public.resumes r
+        SET analyst_output = coalesce(r.analyst_output, '{}'::JSONB)
+            || jsonb_build_object(
+                'match_score', s.score->'match_score',
+                'explanation', s.score->'explanation',
+                'position_scores', coalesce(r.analyst_output->'position_scores', '{}'::JSONB)
+                    || jsonb_build_object(p_position_id::TEXT, s.score)
+            )
+        FROM scores s
+        WHERE r.id = s.id AND r.deleted_at IS NULL
+        RETURNING r.id
+    )
+    SELECT count(*)::INTEGER FROM updated;
+$$;
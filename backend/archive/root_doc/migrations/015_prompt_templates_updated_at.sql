@@ -0,0 +1,21 @@
+-- Migration: Prompt Templates updated_at
+-- Description: PromptService (app/prompts/prompt_service.py) polls prompt_templates for rows with
+--   updated_at >= its last watermark, so every edit must bump updated_at.
+--   * BEFORE UPDATE trigger setting updated_at = NOW() (the other tables already have one)
+--   * index on updated_at for the watermark query
+
+ALTER TABLE public.prompt_templates ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = NOW();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS update_prompt_templates_updated_at ON public.prompt_templates;
+CREATE TRIGGER update_prompt_templates_updated_at BEFORE UPDATE ON public.prompt_templates
+  FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE INDEX IF NOT EXISTS idx_prompt_templates_updated_at ON public.prompt_templates(updated_at);
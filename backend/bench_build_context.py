@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import tracemalloc
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.protocol.base import AgentContext
+
+CALLS_PER_TURN = 7          # monitor, observer, evaluator, strategy, executioner, critique + report/greeting
+JD_CHARS = 20_000
+RESUME_CHARS = 30_000
+ROUNDS = 5000               # timing repetitions per history length
+
+
+def session_context(turns):
+    context = AgentContext(session_id="bench", metadata={
+        "jd_text": "Senior backend engineer, distributed systems. " * (JD_CHARS // 46),
+        "resume_text": "Built payment pipelines in Go and Python. " * (RESUME_CHARS // 42),
+        "start_time": "2026-10-17T10:00:00",
+        "rounds_completed": turns // 2,
+        "interview_config": {"milestones": ["APIs", "Storage", "Scaling"], "difficulty": "Hard"},
+    })
+    for n in range(turns):
+        context.history.append({"role": "candidate" if n % 2 == 0 else "interviewer",
+                                "text": f"Turn {n}: " + "an answer about indexes and caches " * 10,
+                                "timestamp": "2026-10-17T10:00:00"})
+    return context
+
+
+def copying(context, overrides):
+    """What _build_context did before: merged metadata dict + a validated AgentContext"""
+    return AgentContext(session_id=context.session_id, metadata={**context.metadata, **overrides},
+                        history=context.history, window=context.window)
+
+
+def viewing(context, overrides):
+    return context.view(overrides)
+
+
+def measure(build, context):
+    overrides = {"evaluator_task": "evaluate_response", "last_answer": "short answer"}
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        built = build(context, overrides)
+        built.metadata.get("jd_text")
+        built.metadata.get("evaluator_task")
+    per_call = (time.perf_counter() - start) / ROUNDS
+    tracemalloc.start()
+    kept = [build(context, overrides) for _ in range(CALLS_PER_TURN)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, allocated, kept
+
+
+def main():
+    print(f"{CALLS_PER_TURN} contexts per turn, {JD_CHARS // 1000}KB JD + {RESUME_CHARS // 1000}KB resume in metadata")
+    ok = True
+    results = {}
+    for turns in (10, 100, 400):
+        context = session_context(turns)
+        old_time, old_bytes, old = measure(copying, context)
+        new_time, new_bytes, new = measure(viewing, context)
+        results[turns] = (old_time, old_bytes, new_time, new_bytes)
+        print(f"[{turns:>3} turns]  AgentContext {old_time * CALLS_PER_TURN * 1e6:>7.0f}us {old_bytes / 1024:>7.1f}KB per turn"
+              f"  ->  view {new_time * CALLS_PER_TURN * 1e6:>5.1f}us {new_bytes / 1024:>5.1f}KB per turn")
+        ok &= all(dict(o.metadata) == dict(n.metadata) and o.history == n.history for o, n in zip(old, new))
+
+    ok = report(ok, "views expose the same metadata and history as the copied contexts")
+    ok &= report(results[400][2] < results[10][2] * 2 and results[400][3] <= results[10][3] * 1.1,
+                 "view cost independent of interview length")
+    ok &= report(all(new_time < old_time and new_bytes < old_bytes for old_time, old_bytes, new_time, new_bytes in results.values()),
+                 "view cheaper than AgentContext construction at every length")
+    view = session_context(4).view({"x": 1})
+    try:
+        view.metadata["x"] = 2
+        immutable = False
+    except TypeError:
+        immutable = True
+    ok &= report(immutable, "view metadata is read-only")
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
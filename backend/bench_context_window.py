@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.llm.llm_router import LLMRouter
+from app.engine.intelligence import dispatch as dispatch_module
+from app.engine.intelligence.dispatch import IntelligenceDispatch
+from app.engine.protocol.base import AgentContext
+from app.engine.protocol.context_window import ContextWindow, estimate_tokens, CONTEXT_RECENT_TURNS
+
+TURNS = 60   # candidate + interviewer turns in the simulated interview
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeProvider:
+    """Answers summary prompts with a short summary; counts the calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls += 1
+        return FakeResponse("Candidate covered caching, indexing and queue design; solid on trade-offs, "
+                            "vague on failure handling. No integrity concerns so far.")
+
+
+def make_turn(n):
+    if n % 2 == 0:
+        return {"role": "candidate", "timestamp": "2026-10-17T10:00:00",
+                "text": f"Answer {n}: I'd put a write-through cache in front of the orders table, " * 12}
+    return {"role": "interviewer", "timestamp": "2026-10-17T10:00:30",
+            "text": f"Question {n}: how would you handle cache invalidation when two writers race?"}
+
+
+async def main():
+    provider = FakeProvider()
+    dispatch_module._dispatch = IntelligenceDispatch(
+        router=LLMRouter(clients=[{"client": provider, "name": "fake", "provider": "Local Fake", "priority": 1}]))
+    from app.engine.agents.evaluator import get_evaluator_agent
+    from app.engine.agents.monitor import get_monitor_agent
+    from app.engine.agents.observer import get_observer_agent
+    evaluator, monitor, observer = get_evaluator_agent(), get_monitor_agent(), get_observer_agent()
+
+    async def generate(prompt):
+        return await dispatch_module._dispatch.generate_text(prompt, cache_category="context_summary")
+
+    context = AgentContext(session_id="bench")
+    old_tokens, new_tokens, sizes = 0, 0, []
+    build_time = 0.0
+    for n in range(TURNS):
+        context.add_turn(make_turn(n))
+        if context.window.summary_due(context.history):
+            await context.window.summarize(context.history, generate)
+        start = time.perf_counter()
+        prompts = [evaluator._build_synthesis_prompt(context), monitor._build_audit_prompt(context),
+                   observer._build_observer_prompt(context)]
+        build_time += time.perf_counter() - start
+        # What the three builders sent before: the full history repr each
+        old = [f"You are the Evaluator Agent. Synthesize the entire interview and provide a final report.\nHistory: {context.history}",
+               f"Audit the interview history: {context.history}",
+               f"Analyze behavioral patterns and technical consistency.\nHistory: {context.history}"]
+        old_tokens += sum(estimate_tokens(p) for p in old)
+        new_tokens += sum(estimate_tokens(p) for p in prompts)
+        sizes.append((sum(estimate_tokens(p) for p in old), sum(estimate_tokens(p) for p in prompts)))
+
+    stats = context.window.stats()
+    print(f"{TURNS} turns, 3 history prompts per turn")
+    for turn in (10, 30, 60):
+        old, new = sizes[turn - 1]
+        print(f"[turn {turn:>2}]    full history {old:>6} tokens -> windowed {new:>5} tokens")
+    print(f"[total]      {old_tokens} -> {new_tokens} prompt tokens ({100 * (1 - new_tokens / old_tokens):.0f}% saved); "
+          f"{stats['summaries_generated']} summaries for {TURNS} turns, {build_time / (TURNS * 3) * 1e6:.0f}us per prompt")
+
+    restored = ContextWindow(**context.window.model_dump())
+    ok = True
+    ok &= report(max(new for _, new in sizes[20:]) <= max(new for _, new in sizes[:20]) * 1.5,
+                 "windowed prompt size stays flat as the interview grows")
+    ok &= report(all(estimate_tokens(AgentContext(session_id="b", history=context.history, window=restored)
+                                     .history_for_prompt(budget)) <= budget for budget in (50, 200, 800)),
+                 "history section respects the token budget")
+    ok &= report(context.history[-1]["text"] in prompts[0] and "Earlier (summary)" in prompts[0],
+                 "newest turn kept verbatim, older ones summarized")
+    ok &= report(stats["summaries_generated"] == provider.calls == (TURNS - CONTEXT_RECENT_TURNS) // 4,
+                 "summary regenerated only every CONTEXT_SUMMARY_EVERY turns")
+    ok &= report(stats["prompt_tokens_saved"] > 0 and restored.summary == context.window.summary,
+                 "tokens-saved metric reported and window state round-trips")
+    ok &= report(context.window.history_tokens == sum(estimate_tokens(str(turn)) for turn in context.history),
+                 "full-history size counted once per appended turn, not per prompt")
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
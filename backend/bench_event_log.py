@@ -0,0 +1,140 @@
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.event_log import EventLog
+from app.utils.logger import Logger
+
+SESSIONS = 10000
+QUESTIONS = 3          # per session; each gets a response and a follow-up record
+FEEDBACK_EVERY = 4     # one expert feedback event every N sessions
+WORKERS = 4
+
+
+class Strategy:
+    def __init__(self, i):
+        self.i = i
+
+    def get_strategy_id(self):
+        return f"strategy_{self.i % 6}"
+
+    def get_strategy_name(self):
+        return "Probe deeper"
+
+    def get_parameters(self):
+        return {"depth": self.i % 3}
+
+
+def make_logger(directory):
+    return Logger(EventLog(directory, legacy_file=None))
+
+
+def run_session(logger, n):
+    session_id = f"session-{n:06d}"
+    logger.initialize_session(session_id, "python")
+    for q in range(QUESTIONS):
+        question_id = f"q{q}"
+        logger.log_question(session_id, question_id, f"Explain topic {q} " * 8, "technical", q + 1, "backend", "apis")
+        logger.log_response(session_id, question_id, "The candidate's answer ... " * 20, "main", 0,
+                            {"overall_score": random.randint(0, 100)}, Strategy(n))
+        logger.update_followup_generated(session_id, question_id, 0, {"text": "Could you go deeper?", "strategy_id": f"strategy_{n % 6}"})
+    if n % FEEDBACK_EVERY == 0:
+        logger.log_expert_feedback(session_id, "q0", {"strategy_id": f"strategy_{n % 6}", "text": "AI follow-up"},
+                                   ["approved", "edited", "overridden"][n % 3], ["good", "bad"][n % 2],
+                                   edited_text="Expert version", custom_text="Expert question")
+
+
+def worker(directory, start, stop):
+    logger = make_logger(directory)
+    for n in range(start, stop):
+        run_session(logger, n)
+    logger.events.flush()
+
+
+def whole_file_rewrite_cost(sessions):
+    """What the previous Logger paid per event: load log.json, then dump it back"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "log.json")
+    logger = make_logger(os.path.join(directory, "events"))
+    for n in range(sessions):
+        run_session(logger, n)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(logger.get_log_data(), f, indent=2, ensure_ascii=False)
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    shutil.rmtree(directory)
+    return elapsed, size
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    events_per_session = 1 + QUESTIONS * 3
+    print(f"{SESSIONS} sessions, ~{events_per_session} events each, {WORKERS} worker processes sharing one log")
+
+    start = time.perf_counter()
+    chunk = SESSIONS // WORKERS
+    processes = [multiprocessing.Process(target=worker, args=(directory, i * chunk, SESSIONS if i == WORKERS - 1 else (i + 1) * chunk))
+                 for i in range(WORKERS)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    logger = make_logger(directory)
+    total_events = sum(1 for _ in logger.events.iter_events())
+    print(f"\n[append]     {total_events} events in {elapsed:.1f}s ({total_events / elapsed:.0f} events/s, "
+          f"{elapsed / total_events * 1e6:.0f}us each across {WORKERS} workers)")
+
+    sample = random.Random(1).sample(range(SESSIONS), 200)
+    start = time.perf_counter()
+    sessions = [logger.get_session_log(f"session-{n:06d}") for n in sample]
+    per_session = (time.perf_counter() - start) / len(sample)
+    print(f"[read]       get_session_log {per_session * 1000:.2f}ms")
+
+    start = time.perf_counter()
+    rates = logger.get_strategy_success_rate()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    logger.get_strategy_success_rate()
+    examples = logger.get_successful_examples("strategy_0", limit=2)
+    warm = time.perf_counter() - start
+    print(f"[aggregates] strategy success rates {first * 1000:.1f}ms first call, "
+          f"{warm * 1000:.2f}ms after (+ examples), {len(rates)} strategies")
+
+    for sessions_in_log in (1000, 10000):
+        cost, size = whole_file_rewrite_cost(sessions_in_log)
+        print(f"[previous]   one event with {sessions_in_log} sessions in log.json ({size / 1e6:.1f}MB): "
+              f"{cost * 1000:.0f}ms to load + rewrite")
+
+    ok = True
+    ok &= report(total_events == SESSIONS * events_per_session + len(range(0, SESSIONS, FEEDBACK_EVERY)),
+                 "no events lost with concurrent writers")
+    ok &= report(all(s and len(s["questions"]) == QUESTIONS and all(len(q["responses"]) == 1 for q in s["questions"])
+                     for s in sessions), "sessions fold back to complete documents")
+    ok &= report(sum(r["total_uses"] for r in rates.values()) == len(range(0, SESSIONS, FEEDBACK_EVERY)) and len(examples) == 2,
+                 "feedback projection counts every rating")
+    shutil.rmtree(directory)
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.event_log import EventLog
+from app.utils.example_store import ExampleStore, to_example
+from app.utils.logger import Logger
+
+FEEDBACK = 50000
+STRATEGIES = 12
+LOOKUPS = 2000
+TOPICS = ["database indexing", "cache invalidation", "rest api design", "python generators",
+          "kubernetes scaling", "react state", "sql joins", "message queues"]
+
+
+def linear_scan(events, strategy_id, limit):
+    """The previous lookup: read every feedback record and filter"""
+    records, _ = events.read_feedback(0)
+    examples = [e for e in map(to_example, records) if e and (not strategy_id or e["strategy_id"] == strategy_id)]
+    return examples[-limit:]
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    events = EventLog(directory, fsync_every=10000, legacy_file=None)
+    logger = Logger(events)
+    rng = random.Random(5)
+
+    start = time.perf_counter()
+    for n in range(FEEDBACK):
+        session_id = f"session-{n // 20:05d}"
+        if n % 20 == 0:
+            logger.initialize_session(session_id, "python")
+            logger.log_question(session_id, "q0", "Tell me about your project", "technical", 1)
+        topic = rng.choice(TOPICS)
+        logger.log_expert_feedback(session_id, "q0",
+                                   {"strategy_id": f"strategy_{n % STRATEGIES}", "text": f"How did you approach {topic}?"},
+                                   rng.choice(["approved", "edited", "overridden"]), rng.choice(["good", "good", "bad"]),
+                                   edited_text=f"Walk me through a {topic} trade-off you made",
+                                   custom_text=f"What broke first in your {topic} setup?")
+    write = time.perf_counter() - start
+    events.flush()
+    print(f"{FEEDBACK} expert feedback events logged in {write:.1f}s "
+          f"({write / FEEDBACK * 1e6:.0f}us each, example store refreshed after every one)")
+
+    strategies = [f"strategy_{rng.randrange(STRATEGIES)}" for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    for strategy_id in strategies[:50]:
+        linear_scan(events, strategy_id, 2)
+    scan = (time.perf_counter() - start) / 50
+
+    fresh = ExampleStore(events)
+    start = time.perf_counter()
+    fresh.refresh(force=True)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for strategy_id in strategies:
+        fresh.get_examples(strategy_id, limit=2)
+    lookup = (time.perf_counter() - start) / LOOKUPS
+
+    start = time.perf_counter()
+    for strategy_id in strategies:
+        fresh.get_examples(strategy_id, limit=2, query=f"Candidate described {rng.choice(TOPICS)} in detail")
+    similar = (time.perf_counter() - start) / LOOKUPS
+
+    print(f"\n[linear scan]   {scan * 1000:.1f}ms per lookup")
+    print(f"[example store] built from the log in {build * 1000:.0f}ms, then {lookup * 1e6:.1f}us per lookup, "
+          f"{similar * 1e6:.1f}us with similarity ranking")
+
+    ok = True
+    ok &= report(all(fresh.get_examples(s, limit=2) == linear_scan(events, s, 2) for s in set(strategies[:STRATEGIES * 3])),
+                 "indexed lookups match the linear scan")
+    query = "What broke first in your kubernetes scaling setup?"
+    picked = fresh.get_examples("strategy_3", limit=2, query=query)
+    ok &= report(all("kubernetes" in e["expert_improvement"] or "kubernetes" in e["ai_suggestion"] for e in picked),
+                 "similarity ranking picks examples about the current topic")
+    ok &= report(lookup * 100 < scan, "lookup is over 100x faster than scanning")
+    shutil.rmtree(directory)
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.lexical_ranker import ResumeIndex
+
+RESUMES = 2000
+TOP_K = 100
+CONCURRENCY = 8
+LLM_LATENCY = 0.02        # simulated seconds per audit_match call (kept small so the bench is quick)
+REAL_LLM_LATENCY = 3.0    # typical real audit_match round-trip, used for the extrapolated numbers
+
+DOMAINS = {
+    "backend": ["python", "django", "fastapi", "postgresql", "redis", "docker", "kubernetes", "aws",
+                "microservices", "rest api", "celery", "kafka", "grpc", "ci/cd", "terraform"],
+    "frontend": ["react", "typescript", "javascript", "next.js", "css", "html", "redux", "webpack",
+                 "tailwind", "jest", "graphql", "figma", "accessibility", "vite", "storybook"],
+    "data": ["python", "pandas", "spark", "sql", "airflow", "dbt", "machine learning", "pytorch",
+             "tensorflow", "statistics", "snowflake", "etl", "kafka", "tableau", "numpy"],
+    "hr": ["recruiting", "talent acquisition", "onboarding", "payroll", "employee relations",
+           "hris", "workday", "compensation", "sourcing", "interviewing", "benefits", "compliance"],
+    "sales": ["salesforce", "account executive", "pipeline", "negotiation", "crm", "quota",
+              "business development", "cold calling", "saas", "forecasting", "hubspot", "lead generation"],
+}
+FILLER = ("delivered projects collaborated stakeholders responsible for owned initiatives led improved "
+          "processes across multiple teams mentored junior members drove results in fast paced environment").split()
+
+JD_SKILLS = ["python", "fastapi", "postgresql", "redis", "docker", "kubernetes", "aws", "microservices"]
+JD_TEXT = ("Senior Backend Engineer. You will design and build Python microservices with FastAPI, "
+           "PostgreSQL and Redis, deploy them with Docker and Kubernetes on AWS, and own reliability.")
+
+
+def make_corpus(rng: random.Random):
+    """Synthetic resumes; relevance = how many JD skills the candidate really has (the 'LLM truth')."""
+    documents, relevance = [], {}
+    for i in range(RESUMES):
+        domain = rng.choice(list(DOMAINS))
+        skills = rng.sample(DOMAINS[domain], k=rng.randint(3, 9))
+        # Some candidates from other domains list a couple of backend tools too
+        if domain != "backend" and rng.random() < 0.3:
+            skills += rng.sample(DOMAINS["backend"], k=2)
+        words = skills + rng.choices(FILLER, k=rng.randint(40, 160))
+        rng.shuffle(words)
+        doc_id = f"r{i}"
+        documents.append((doc_id, f"{domain} professional. " + " ".join(words)))
+        relevance[doc_id] = sum(1 for s in JD_SKILLS if s in skills)
+    return documents, relevance
+
+
+def ndcg_at_k(ranked_ids, relevance, k):
+    dcg = sum((2 ** relevance[doc_id] - 1) / math.log2(pos + 2) for pos, doc_id in enumerate(ranked_ids[:k]))
+    ideal = sorted(relevance.values(), reverse=True)[:k]
+    idcg = sum((2 ** rel - 1) / math.log2(pos + 2) for pos, rel in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+async def fake_audit_match(doc_id, relevance, semaphore):
+    async with semaphore:
+        await asyncio.sleep(LLM_LATENCY)
+        return relevance[doc_id] / len(JD_SKILLS) * 100
+
+
+async def llm_path(doc_ids, relevance):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    start = time.perf_counter()
+    scores = await asyncio.gather(*(fake_audit_match(d, relevance, semaphore) for d in doc_ids))
+    elapsed = time.perf_counter() - start
+    ranked = [d for _, d in sorted(zip(scores, doc_ids), key=lambda x: x[0], reverse=True)]
+    return ranked, elapsed
+
+
+async def main():
+    rng = random.Random(7)
+    documents, relevance = make_corpus(rng)
+    print(f"Corpus: {RESUMES} resumes, JD skills: {len(JD_SKILLS)}, top-K: {TOP_K}")
+
+    start = time.perf_counter()
+    index = ResumeIndex(documents)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    lexical = index.rank(JD_TEXT, JD_SKILLS)
+    rank_ms = (time.perf_counter() - start) * 1000
+    lexical_ids = [r["id"] for r in lexical]
+
+    all_ranked, all_elapsed = await llm_path([d for d, _ in documents], relevance)
+    hybrid_ranked, hybrid_elapsed = await llm_path(lexical_ids[:TOP_K], relevance)
+
+    # Recall of the truly best candidates: everyone tied with the K-th best relevance counts
+    cutoff = sorted(relevance.values(), reverse=True)[TOP_K - 1]
+    truly_top = {d for d, rel in relevance.items() if rel > cutoff}
+    recall = len(truly_top & set(lexical_ids[:TOP_K])) / len(truly_top) if truly_top else 1.0
+
+    print(f"\n[lexical] index build {build_ms:.1f}ms, rank all {rank_ms:.1f}ms")
+    print(f"  NDCG@{TOP_K} lexical only: {ndcg_at_k(lexical_ids, relevance, TOP_K):.3f}")
+    print(f"  recall of strictly-better-than-K-th candidates in lexical top-{TOP_K}: {recall:.1%}")
+
+    scale = REAL_LLM_LATENCY / LLM_LATENCY
+    print(f"\n[all-LLM]     {RESUMES} calls, NDCG@{TOP_K} {ndcg_at_k(all_ranked, relevance, TOP_K):.3f}, "
+          f"wall {all_elapsed:.2f}s (~{all_elapsed * scale / 60:.1f} min at {REAL_LLM_LATENCY:.0f}s/call)")
+    print(f"[lexical+LLM] {TOP_K} calls, NDCG@{TOP_K} {ndcg_at_k(hybrid_ranked, relevance, TOP_K):.3f}, "
+          f"wall {(hybrid_elapsed + rank_ms / 1000):.2f}s (~{hybrid_elapsed * scale / 60:.1f} min at {REAL_LLM_LATENCY:.0f}s/call)")
+
+    ok = rank_ms < 200 and recall >= 0.9
+    print("\n✅ pre-ranking keeps the best candidates at a fraction of the LLM cost" if ok
+          else "\n❌ pre-ranking lost too many strong candidates or was too slow")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.event_log import EventLog, fcntl
+from app.utils.log_archive import LogArchive, LogCompactor
+from app.utils.logger import Logger
+from app.utils.strategy_stats import StrategyStatsProjector
+
+SESSIONS = 3000
+LIVE = 300                   # the newest sessions are still running (not finalized)
+SEGMENT_BYTES = 512 * 1024   # small segments so whole ones become compactable
+QUESTIONS = 3
+FEEDBACK_EVERY = 4
+
+
+def run_session(logger, n):
+    session_id = f"session-{n:06d}"
+    logger.initialize_session(session_id, "python")
+    for q in range(QUESTIONS):
+        question_id = f"q{q}"
+        logger.log_question(session_id, question_id, f"Explain topic {q} " * 8, "technical", q + 1, "backend", "apis")
+        logger.events.append(session_id, "response", question_id=question_id,
+                             response={"candidate_response": "The candidate's answer ... " * 20,
+                                       "evaluation": {"overall_score": n % 100}})
+    if n % FEEDBACK_EVERY == 0:
+        logger.log_expert_feedback(session_id, "q0", {"strategy_id": f"strategy_{n % 6}", "text": "AI follow-up"},
+                                   ["approved", "edited", "overridden"][n % 3], ["good", "bad"][n % 2],
+                                   edited_text="Expert version", custom_text="Expert question")
+    if n < SESSIONS - LIVE:
+        logger.finalize_session(session_id)
+
+
+def disk_usage(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    events = EventLog(directory, segment_bytes=SEGMENT_BYTES, legacy_file=None)
+    logger = Logger(events)
+    for n in range(SESSIONS):
+        run_session(logger, n)
+    events.flush()
+
+    ids = [f"session-{n:06d}" for n in range(SESSIONS)]
+    before = {session_id: logger.get_session_log(session_id) for session_id in ids}
+    rates_before = logger.get_strategy_success_rate()
+    segments_before = len(events._segment_numbers())
+    size_before = disk_usage(directory)
+    print(f"{SESSIONS} sessions ({SESSIONS - LIVE} finalized), {segments_before} segments, {size_before / 1e6:.1f}MB on disk")
+
+    # Finalized sessions are eligible straight away; unfinalized ones only after a day idle
+    compactor = LogCompactor(events, LogArchive(events), idle_hours=24, finalized_minutes=0, batch=SESSIONS)
+    start = time.perf_counter()
+    result = compactor.run_once()
+    elapsed = time.perf_counter() - start
+    size_after = disk_usage(directory)
+    print(f"\n[compact]    archived {result['archived_sessions']} sessions, deleted {len(result['deleted_segments'])} "
+          f"segments in {elapsed:.2f}s; {size_after / 1e6:.1f}MB on disk afterwards")
+
+    reader = Logger(events)  # fresh manifest, as another worker would see it
+    sample = random.Random(1).sample(ids[:SESSIONS - LIVE], 200)
+    start = time.perf_counter()
+    for session_id in sample:
+        reader.get_session_log(session_id)
+    archived_read = (time.perf_counter() - start) / len(sample)
+    start = time.perf_counter()
+    for session_id in ids[-LIVE:][:200]:
+        reader.get_session_log(session_id)
+    live_read = (time.perf_counter() - start) / 200
+    print(f"[read]       get_session_log {archived_read * 1000:.2f}ms archived, {live_read * 1000:.2f}ms live")
+
+    second = compactor.run_once()
+    lock = open(os.path.join(directory, "compaction.lock"), "a+")
+    if fcntl:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+    contended = LogCompactor(events, idle_hours=24, finalized_minutes=0).run_once()
+    lock.close()
+
+    projector = StrategyStatsProjector(events)
+    projector.rebuild()
+    feedback_before = events.feedback_size()
+    archive = LogArchive(events)
+    events.rebuild_indexes(archive.iter_events(), archive.archived_pointers())
+
+    ok = True
+    ok &= report(result["archived_sessions"] == SESSIONS - LIVE and events.session_ids() == ids[-LIVE:],
+                 "finalized sessions moved to the archive, running ones left live")
+    ok &= report(all(reader.get_session_log(session_id) == before[session_id] for session_id in ids),
+                 "every session reads back identically after compaction")
+    ok &= report(len(result["deleted_segments"]) > 0 and size_after < size_before,
+                 "segments with only archived sessions deleted")
+    ok &= report(second["archived_sessions"] == 0 and not second["deleted_segments"] and "skipped" in contended,
+                 "re-runs are no-ops and only one worker compacts at a time")
+    ok &= report(projector.get_stats() == rates_before and reader.get_strategy_success_rate() == rates_before,
+                 "strategy stats unchanged, and rebuildable from archive + segments")
+    ok &= report(events.feedback_size() == feedback_before and events.session_ids() == ids[-LIVE:],
+                 "rebuild_indexes keeps archived feedback without re-indexing archived sessions")
+    shutil.rmtree(directory)
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import asyncio
+import copy
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.prompts.prompt_service import PromptService
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "prompts", "templates")
+ROUND_TRIP = 0.02      # simulated Supabase latency per query
+LOOKUPS = 300
+
+
+class FakeQuery:
+    """The slice of the supabase-py query builder PromptService uses, over in-memory rows"""
+
+    def __init__(self, table):
+        self.table = table
+        self.filters = []
+        self.ordering = None
+        self.limit_to = None
+
+    def select(self, *columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def order(self, column, desc=False):
+        self.ordering = (column, desc)
+        return self
+
+    def limit(self, count):
+        self.limit_to = count
+        return self
+
+    def execute(self):
+        time.sleep(ROUND_TRIP)
+        self.table.queries += 1
+        rows = [copy.deepcopy(row) for row in self.table.rows.values() if all(f(row) for f in self.filters)]
+        if self.ordering:
+            rows.sort(key=lambda row: row[self.ordering[0]], reverse=self.ordering[1])
+        if self.limit_to:
+            rows = rows[:self.limit_to]
+        return type("Response", (), {"data": rows})()
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.rows = {}
+        self.queries = 0
+        self.clock = datetime(2026, 10, 17, 9, 0, 0)
+
+    def table(self, name):
+        return FakeQuery(self)
+
+    def upsert(self, row):
+        self.clock += timedelta(seconds=1)
+        row = {**row, "updated_at": self.clock.isoformat()}
+        self.rows[row["id"]] = row
+
+
+def seed(db):
+    keys = []
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, "*", "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        db.upsert({**data, "status": "active", "version": "1.0.0"})
+        keys.append((data["category"], data["variant"]))
+    return keys
+
+
+def main():
+    db = FakeSupabase()
+    keys = seed(db)
+
+    # Before: every get_prompt was a query
+    uncached = PromptService(admin=db)
+    start = time.perf_counter()
+    for n in range(20):
+        uncached._query_prompt(*keys[n % len(keys)], None)
+    uncached_time = (time.perf_counter() - start) / 20
+
+    service = PromptService(admin=db, poll_interval=0.05, full_reload_interval=3600)
+    queries_before = db.queries
+
+    async def scenario():
+        service.start_refresher()
+        while not service._preloaded:
+            await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        for n in range(LOOKUPS):
+            service.get_prompt(*keys[n % len(keys)])
+            service.get_prompt("evaluation", "missing_variant")
+        cached_time = (time.perf_counter() - start) / (LOOKUPS * 2)
+
+        # Publish a new version, edit another template and deprecate a third
+        category, variant = keys[0]
+        old = service.get_prompt(category, variant)
+        db.upsert({**db.rows[old.id], "id": f"{old.id}_v2", "version": "1.1.0", "template": "v2 {question}"})
+        edited = service.get_prompt(*keys[1])
+        db.upsert({**db.rows[edited.id], "template": "edited {response}"})
+        deprecated = service.get_prompt(*keys[2])
+        db.upsert({**db.rows[deprecated.id], "status": "deprecated"})
+        db.upsert({"id": "brand_new", "name": "New", "category": "evaluation", "variant": "missing_variant",
+                   "template": "new", "variables": [], "generation_config": {}, "knobs": {}, "status": "active",
+                   "version": "1.0.0"})
+        await asyncio.sleep(0.3)   # a few poll cycles
+        service._task.cancel()
+        return cached_time, old, edited, deprecated
+
+    cached_time, old, edited, deprecated = asyncio.run(scenario())
+    render = service.render(edited.id, {"response": "hello"})
+
+    print(f"{len(keys)} templates, {ROUND_TRIP * 1000:.0f}ms simulated Supabase round-trip")
+    print(f"[before]     get_prompt {uncached_time * 1000:.1f}ms (one query per lookup)")
+    print(f"[cached]     get_prompt {cached_time * 1e6:.1f}us; {db.queries - queries_before} queries for "
+          f"{LOOKUPS * 2} lookups plus preload and polling")
+
+    ok = True
+    ok &= report(service.get_prompt(*keys[0]).version == "1.1.0" and service.get_prompt(*keys[0], version="1.0.0").id == old.id,
+                 "new version becomes latest after a poll; pinned version still served")
+    ok &= report(render and render["rendered_prompt"] == "edited hello", "edited template re-compiled and rendered")
+    ok &= report(service.get_prompt(*keys[2]) is None and service.get_prompt("evaluation", "missing_variant").id == "brand_new",
+                 "deprecated template dropped, newly added one (cached as missing) picked up")
+    stale = PromptService(admin=db, ttl=0.05)
+    stale.preload()
+    queries = db.queries
+    stale.get_prompt(*keys[3])
+    time.sleep(0.06)
+    stale.get_prompt(*keys[3])
+    ok &= report(db.queries == queries + 1, "without the refresher, entries past the TTL are re-queried")
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.prompts.models import Prompt
+from app.prompts.prompt_service import PromptService
+from app.prompts.template_plan import compile_prompt, truncation_limits
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "prompts", "templates")
+RENDERS = 20000
+
+
+def load_prompts():
+    prompts = []
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, "*", "*.json"))):
+        prompt = Prompt.from_json_file(path)
+        prompt.id = os.path.relpath(path, TEMPLATES_DIR)
+        prompts.append(prompt)
+    return prompts
+
+
+def sample_variables(prompt, variant):
+    """Values for every declared variable: long strings, objects, lists, some missing or None"""
+    values = {}
+    for i, var in enumerate(prompt.variables):
+        if variant == 1 and i % 3 == 2:
+            continue  # not provided: declared default or placeholder fallback
+        if variant == 2 and i % 2 == 1:
+            values[var.name] = None
+        elif var.type.value == "object":
+            values[var.name] = {"accuracy": 72, "depth": 64, "signals": ["caching", "indexes"]}
+        elif var.type.value == "int":
+            values[var.name] = 3
+        elif var.name in ("required_skills", "previous_topics") and variant == 0:
+            values[var.name] = ["python", "postgres", "kafka"]
+        else:
+            values[var.name] = f"{var.name} value " * 60
+    values["unused_extra"] = "ignored"
+    return values
+
+
+def regex_render(service, prompt, variables, knobs):
+    return service._interpolate(prompt.template, service._process_variables(variables, prompt.variables, knobs))
+
+
+def main():
+    service = PromptService.__new__(PromptService)  # no Supabase: prompts come from the template files
+    service._cache = {}
+    prompts = load_prompts()
+    for prompt in prompts:
+        service._cache[prompt.id] = prompt
+
+    ok = True
+    mismatches = []
+    overrides = {"truncate_question_length": 40, "truncate_response_length": None}
+    with contextlib.redirect_stdout(io.StringIO()):  # required-variable warnings
+        for prompt in prompts:
+            for variant in range(3):
+                variables = sample_variables(prompt, variant)
+                for knob_overrides in (None, overrides):
+                    knobs = prompt.knobs.merge(knob_overrides) if knob_overrides else prompt.knobs
+                    expected = regex_render(service, prompt, variables, knobs)
+                    got = service.render(prompt.id, variables, knob_overrides=knob_overrides)["rendered_prompt"]
+                    if got != expected:
+                        mismatches.append((prompt.id, variant, knob_overrides))
+    ok &= report(not mismatches, f"compiled plans render identically to the regex path ({len(prompts)} templates x 6 cases)"
+                 + (f"; mismatches: {mismatches[:3]}" if mismatches else ""))
+
+    work = [(prompt, sample_variables(prompt, 0)) for prompt in prompts]
+    start = time.perf_counter()
+    for n in range(RENDERS):
+        prompt, variables = work[n % len(work)]
+        regex_render(service, prompt, variables, prompt.knobs)
+    regex_time = (time.perf_counter() - start) / RENDERS
+    start = time.perf_counter()
+    for n in range(RENDERS):
+        prompt, variables = work[n % len(work)]
+        compile_prompt(prompt).render(variables)
+    plan_time = (time.perf_counter() - start) / RENDERS
+    start = time.perf_counter()
+    for n in range(RENDERS):
+        prompt, variables = work[n % len(work)]
+        service.render(prompt.id, variables)
+    service_time = (time.perf_counter() - start) / RENDERS
+
+    start = time.perf_counter()
+    for prompt in prompts:
+        prompt.render_plan = None
+        compile_prompt(prompt)
+    compile_time = (time.perf_counter() - start) / len(prompts)
+
+    print(f"\n{len(prompts)} templates, {RENDERS} renders each way")
+    print(f"[regex]      {regex_time * 1e6:.1f}us per render ({1 / regex_time:,.0f}/s)")
+    print(f"[compiled]   {plan_time * 1e6:.1f}us per render ({1 / plan_time:,.0f}/s), {regex_time / plan_time:.1f}x; "
+          f"compile once {compile_time * 1e6:.0f}us")
+    print(f"[render()]   {service_time * 1e6:.1f}us per PromptService.render call (cache hit + configs + plan)")
+    ok &= report(plan_time < regex_time, "compiled render faster than the regex path")
+    plan = compile_prompt(prompts[0])
+    ok &= report(compile_prompt(prompts[0]) is plan and plan.limits == truncation_limits(prompts[0].variables, prompts[0].knobs),
+                 "plan compiled once and cached on the Prompt")
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
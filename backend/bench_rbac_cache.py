@@ -0,0 +1,133 @@
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# The bench talks to an in-memory table set, never to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench")
+
+import app.middleware.rbac as rbac
+import app.middleware.rbac_cache as rbac_cache
+from app.middleware.rbac import get_current_user, check_permission, Permission
+
+REQUESTS = 2000
+USERS = 40
+SESSIONS = 200
+DB_LATENCY = 0.002  # simulated seconds per Supabase round-trip
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class Query:
+    def __init__(self, db, table):
+        self.db, self.table, self.filters, self.single_row = db, table, [], False
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def execute(self):
+        self.db.round_trips += 1
+        time.sleep(DB_LATENCY)
+        rows = [r for r in self.db.tables[self.table] if all(r.get(c) == v for c, v in self.filters)]
+        if self.single_row:
+            return Result(rows[0] if rows else None)
+        return Result(rows)
+
+
+class FakeDB:
+    """Counts every query; stands in for supabase_admin"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.round_trips = 0
+
+    def table(self, name):
+        return Query(self, name)
+
+
+class FakeRequest:
+    def __init__(self, user_id):
+        self.headers = {"X-User-ID": user_id}
+
+
+def make_tables(rng):
+    tables = {"profiles": [], "user_tenant_roles": [], "user_account_assignments": [],
+              "accounts": [{"id": f"acc{i}", "tenant_id": f"t{i % 2}"} for i in range(4)],
+              "positions": [{"id": f"pos{i}", "account_id": f"acc{i % 4}"} for i in range(10)],
+              "interview_sessions": []}
+    for i in range(USERS):
+        uid = f"u{i}"
+        role = ["tenant_admin", "account_admin", "HITL_expert"][i % 3]
+        tables["profiles"].append({"id": uid, "is_super_admin": False})
+        tables["user_tenant_roles"].append({"user_id": uid, "tenant_id": f"t{i % 2}", "role": role})
+        if role == "account_admin":
+            tables["user_account_assignments"].append({"user_id": uid, "account_id": f"acc{i % 4}"})
+    for i in range(SESSIONS):
+        tables["interview_sessions"].append({"id": f"s{i}", "position_id": f"pos{rng.randrange(10)}",
+                                             "candidate_id": None, "expert_id": f"u{rng.randrange(USERS)}"})
+    return tables
+
+
+async def run(cache_enabled: bool):
+    rng = random.Random(11)
+    db = FakeDB(make_tables(rng))
+    rbac.supabase_admin = db
+    rbac_cache._rbac_cache = rbac_cache.RBACCache(use_redis=False, enabled=cache_enabled)
+
+    granted = 0
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        user = await get_current_user(FakeRequest(f"u{rng.randrange(USERS)}"))
+        if await check_permission(user, Permission.VIEW_SESSION, f"s{rng.randrange(SESSIONS)}", "session"):
+            granted += 1
+    elapsed = time.perf_counter() - start
+    return db, granted, elapsed
+
+
+async def main():
+    print(f"{REQUESTS} requests, {USERS} users, {SESSIONS} sessions, {DB_LATENCY * 1000:.0f}ms per DB round-trip")
+
+    db_before, granted_before, elapsed_before = await run(cache_enabled=False)
+    print(f"\n[no cache] {db_before.round_trips / REQUESTS:.2f} DB round-trips/request, "
+          f"{elapsed_before / REQUESTS * 1000:.2f}ms/request")
+
+    db_after, granted_after, elapsed_after = await run(cache_enabled=True)
+    cache = rbac_cache.get_rbac_cache()
+    print(f"[cached]   {db_after.round_trips / REQUESTS:.2f} DB round-trips/request, "
+          f"{elapsed_after / REQUESTS * 1000:.2f}ms/request, hit rate {cache.stats()['hit_rate']:.1%}")
+
+    same_decisions = granted_before == granted_after
+    print(f"\n{'✅' if same_decisions else '❌'} same access decisions with and without cache "
+          f"({granted_after}/{REQUESTS} granted)")
+
+    # A role change followed by the invalidation hook must be visible on the next request
+    role_row = next(r for r in db_after.tables["user_tenant_roles"] if r["user_id"] == "u0")
+    role_row["role"] = "member"
+    cache.invalidate_user("u0")
+    user = await get_current_user(FakeRequest("u0"))
+    invalidated = user.get("role") == "member"
+    print(f"{'✅' if invalidated else '❌'} role change visible after invalidate_user")
+
+    ok = same_decisions and invalidated and db_after.round_trips < db_before.round_trips / 5
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import fakeredis
+except ImportError:
+    print("❌ fakeredis is required for this benchmark (pip install fakeredis)")
+    sys.exit(1)
+
+from app.services.session_store import SessionStore
+
+SESSIONS = 50
+TURNS = 5
+RTT = 0.002  # simulated network round-trip per command / pipeline, seconds
+
+
+class SlowRedis(fakeredis.FakeRedis):
+    """fakeredis with a blocking network round-trip per command and per pipeline"""
+
+    round_trips = 0
+
+    def execute_command(self, *args, **kwargs):
+        SlowRedis.round_trips += 1
+        time.sleep(RTT)
+        return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def slow_execute(raise_on_error=True):
+            SlowRedis.round_trips += 1
+            time.sleep(RTT)
+            return execute(raise_on_error)
+        pipe.execute = slow_execute
+        return pipe
+
+
+class SlowAsyncRedis(fakeredis.FakeAsyncRedis):
+    """Same round-trip cost, paid with asyncio.sleep like a real socket wait"""
+
+    round_trips = 0
+
+    async def execute_command(self, *args, **kwargs):
+        SlowAsyncRedis.round_trips += 1
+        await asyncio.sleep(RTT)
+        return await super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        async def slow_execute(raise_on_error=True):
+            SlowAsyncRedis.round_trips += 1
+            await asyncio.sleep(RTT)
+            return await execute(raise_on_error)
+        pipe.execute = slow_execute
+        return pipe
+
+
+async def loop_lag_monitor(samples, stop):
+    """Records how late a 1ms timer fires; a blocked event loop shows up as lag"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        samples.append(time.perf_counter() - start - 0.001)
+
+
+def session_state(i, turn):
+    fields = {"current_phase": "General Tech", "rounds_completed": turn,
+              "meta:jd_text": f"JD {i % 5} " * 500, "meta:resume_text": f"Resume {i} " * 800,
+              "last_response": {"response": f"Question {turn}", "evaluation": {"score": turn}}}
+    history = []
+    for t in range(turn):
+        history += [{"role": "candidate", "text": f"answer {t}"}, {"role": "interviewer", "text": f"question {t}"}]
+    return fields, history
+
+
+async def run_sessions(save):
+    """SESSIONS concurrent interviews, each persisting TURNS turns"""
+    samples, stop = [], asyncio.Event()
+    monitor = asyncio.create_task(loop_lag_monitor(samples, stop))
+
+    async def interview(i):
+        for turn in range(1, TURNS + 1):
+            await asyncio.sleep(0)  # the rest of the turn (LLM calls) yields to the loop
+            fields, history = session_state(i, turn)
+            await save(i, fields, history)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(interview(i) for i in range(SESSIONS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return elapsed, max(samples) if samples else 0.0
+
+
+async def main():
+    print(f"{SESSIONS} concurrent sessions x {TURNS} turns, {RTT * 1000:.0f}ms simulated RTT")
+
+    server = fakeredis.FakeServer()
+    sync_client = SlowRedis(server=server, decode_responses=True)
+    sync_stores = {i: SessionStore(f"sync-{i}", client=sync_client) for i in range(SESSIONS)}
+
+    async def save_sync(i, fields, history):
+        sync_stores[i].save(fields, history)
+
+    sync_elapsed, sync_lag = await run_sessions(save_sync)
+    sync_trips = SlowRedis.round_trips
+
+    async_client = SlowAsyncRedis(server=server, decode_responses=True)
+    async_stores = {i: SessionStore(f"async-{i}", aclient=async_client) for i in range(SESSIONS)}
+
+    async def save_async(i, fields, history):
+        await async_stores[i].save_async(fields, history)
+
+    async_elapsed, async_lag = await run_sessions(save_async)
+    async_trips = SlowAsyncRedis.round_trips
+
+    saves = SESSIONS * TURNS
+    print(f"\n[sync client]  wall {sync_elapsed * 1000:.0f}ms, max event-loop stall {sync_lag * 1000:.1f}ms, "
+          f"{sync_trips / saves:.2f} round-trips/save")
+    print(f"[async client] wall {async_elapsed * 1000:.0f}ms, max event-loop stall {async_lag * 1000:.1f}ms, "
+          f"{async_trips / saves:.2f} round-trips/save")
+
+    # One load = HGETALL + LRANGE in one pipeline (+ MGET for blobs not cached in process)
+    SlowAsyncRedis.round_trips = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(SessionStore.load_async(f"async-{i}", aclient=async_client) for i in range(SESSIONS)))
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"[async load]   {SESSIONS} sessions in {load_ms:.0f}ms, {SlowAsyncRedis.round_trips / SESSIONS:.2f} round-trips/load")
+
+    ok = async_lag < sync_lag and async_elapsed < sync_elapsed
+    print("\n✅ async pool keeps the event loop responsive under concurrent saves" if ok
+          else "\n❌ async path did not beat the blocking client")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
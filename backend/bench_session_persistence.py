@@ -0,0 +1,110 @@
+import json
+import os
+import random
+import sys
+from datetime import datetime
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import fakeredis
+except ImportError:
+    print("❌ fakeredis is required for this benchmark (pip install fakeredis)")
+    sys.exit(1)
+
+from app.services.session_store import SessionStore
+
+TURNS = 30
+SESSION_ID = "bench-session"
+
+WORDS = ("python distributed systems latency cache consistency design tradeoff queue worker "
+         "database index replication failover metrics alerting team project ownership").split()
+
+
+def sentence(rng, low, high):
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + "."
+
+
+def initial_state(rng):
+    metadata = {
+        "jd_text": " ".join(sentence(rng, 12, 20) for _ in range(60)),        # ~6KB
+        "resume_text": " ".join(sentence(rng, 12, 20) for _ in range(120)),   # ~12KB
+        "start_time": datetime.now().isoformat(),
+        "rounds_completed": 0,
+        "interview_config": {"focus_areas": rng.sample(WORDS, 5), "difficulty": "senior", "rounds": 5},
+    }
+    scalars = {
+        "session_id": SESSION_ID, "current_phase": "General Tech", "rounds_completed": 0,
+        "total_rounds": 5, "start_time": metadata["start_time"], "last_response": None,
+        "last_candidate_answer": None,
+    }
+    return scalars, metadata
+
+
+def fields_of(scalars, metadata):
+    """Same flattening as SwarmOrchestrator._state_fields"""
+    fields = dict(scalars)
+    for key, value in metadata.items():
+        fields[f"meta:{key}"] = value
+    return fields
+
+
+def legacy_bytes(scalars, metadata, history):
+    """What the old save_state sent: the whole state, JSON-encoded twice"""
+    state = dict(scalars, context=metadata, history=history)
+    return len(json.dumps(json.dumps(state)).encode("utf-8"))
+
+
+def main():
+    rng = random.Random(3)
+    client = fakeredis.FakeRedis(decode_responses=True)
+    store = SessionStore(SESSION_ID, client)
+
+    scalars, metadata = initial_state(rng)
+    history = []
+    store.save(fields_of(scalars, metadata), history)
+    legacy_per_turn, delta_per_turn = [], []
+
+    for turn in range(1, TURNS + 1):
+        answer = " ".join(sentence(rng, 10, 25) for _ in range(rng.randint(2, 5)))
+        reply = sentence(rng, 15, 30)
+        history.append({"role": "candidate", "text": answer, "timestamp": datetime.now().isoformat()})
+        history.append({"role": "interviewer", "text": reply, "timestamp": datetime.now().isoformat()})
+        scalars.update(
+            rounds_completed=turn,
+            current_phase=rng.choice(["General Tech", "System Design", "Behavioral"]),
+            last_candidate_answer=answer,
+            last_response={"response": reply, "evaluation": {"score": rng.randint(1, 10)},
+                           "stage_timings": {"evaluator": round(rng.random(), 3)}},
+        )
+        before = store.bytes_written
+        store.save(fields_of(scalars, metadata), history)
+        delta_per_turn.append(store.bytes_written - before)
+        legacy_per_turn.append(legacy_bytes(scalars, metadata, history))
+
+    # Speculative critique amends the last interviewer turn in place
+    history[-1]["text"] = "Corrected: " + history[-1]["text"]
+    history[-1]["corrected"] = True
+    store.save(fields_of(scalars, metadata), history, amended=[len(history) - 1])
+
+    print(f"{TURNS}-turn interview, JD {len(metadata['jd_text'])}B, resume {len(metadata['resume_text'])}B")
+    print(f"\n{'turn':>5} {'legacy bytes':>14} {'delta bytes':>12}")
+    for turn in (1, 10, 20, 30):
+        print(f"{turn:>5} {legacy_per_turn[turn - 1]:>14,} {delta_per_turn[turn - 1]:>12,}")
+    legacy_total, delta_total = sum(legacy_per_turn), sum(delta_per_turn)
+    print(f"\ntotal over {TURNS} turns: legacy {legacy_total:,}B, delta {delta_total:,}B "
+          f"({legacy_total / delta_total:.0f}x less)")
+
+    loaded = SessionStore.load(SESSION_ID, client)
+    fields, loaded_history, _ = loaded
+    round_trip = fields == json.loads(json.dumps(fields_of(scalars, metadata))) and loaded_history == history
+    print(f"\n{'✅' if round_trip else '❌'} reloaded state matches the in-memory session")
+
+    flat = max(delta_per_turn[1:]) < 3 * min(delta_per_turn[1:])
+    print(f"{'✅' if flat else '❌'} bytes per turn stay flat as the interview grows")
+    sys.exit(0 if round_trip and flat else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.typing_stream import TypingStream, apply_diff
+
+KEYSTROKES = 600
+KEYSTROKE_GAP = 0.005   # 200 updates/s: a fast typist with no client-side debounce
+VIEWERS = 50
+PASTE = "def solve(nums):\n    seen = {}\n    for i, n in enumerate(nums):\n" * 6
+
+
+def edits(rng):
+    """Appends, backspaces, a mid-text correction and one large paste"""
+    text = ""
+    for n in range(KEYSTROKES):
+        roll = rng.random()
+        if n == KEYSTROKES // 2:
+            text += PASTE
+        elif roll < 0.08 and text:
+            text = text[:-1]
+        elif roll < 0.10 and len(text) > 20:
+            pos = rng.randrange(len(text) - 10)
+            text = text[:pos] + rng.choice("abcdefgh") + text[pos + 1:]
+        else:
+            text += rng.choice("abcdefghijklmnopqrstuvwxyz     .,\n")
+        yield text
+
+
+async def main():
+    frames = []
+
+    async def publish(frame):
+        frames.append((time.perf_counter(), frame))
+
+    stream = TypingStream(publish)
+    full_bytes = 0
+    start = time.perf_counter()
+    final = ""
+    for text in edits(random.Random(7)):
+        # The previous server re-broadcast {"type": "candidate_typing", "data": {"text": ...}} every update
+        full_bytes += len(json.dumps({"type": "candidate_typing", "data": {"text": text}}))
+        stream.update(text)
+        final = text
+        await asyncio.sleep(KEYSTROKE_GAP)
+    await asyncio.sleep(1)
+    elapsed = time.perf_counter() - start
+
+    # A viewer rebuilding the text from the frames
+    viewer, version, applied = None, None, True
+    for _, frame in frames:
+        data = frame["data"]
+        if frame["type"] == "candidate_typing":
+            viewer, version = data["text"], data["v"]
+        elif version == data["base"]:
+            viewer, version = apply_diff(viewer, data["p"], data["d"], data["i"]), data["v"]
+        else:
+            applied = False
+
+    stream_bytes = sum(len(json.dumps(frame)) for _, frame in frames)
+    gaps = [b[0] - a[0] for a, b in zip(frames, frames[1:])]
+    stats = stream.stats()
+    print(f"{KEYSTROKES} typing updates in {elapsed:.1f}s, fanned out to {VIEWERS} viewers")
+    print(f"\n[full text per update]  {KEYSTROKES} frames, {full_bytes * VIEWERS / 1024:.0f} KiB sent")
+    print(f"[debounced diffs]       {len(frames)} frames ({stats['keyframes']} keyframes), "
+          f"{stream_bytes * VIEWERS / 1024:.0f} KiB sent, min gap {min(gaps) * 1000:.0f}ms")
+    print(f"                        pastes detected: {stats['paste_events']}, paste ratio {stats['paste_ratio']:.2f}")
+
+    ok = True
+    ok &= report(applied and viewer == final, "viewer rebuilt the exact final text from keyframes + diffs")
+    ok &= report(min(gaps) >= stream.min_gap - 0.002, f"publish rate stays under {1 / stream.min_gap:.0f} frames/s")
+    ok &= report(stats["paste_events"] == 1 and any(f["data"].get("paste") for _, f in frames), "the paste was flagged")
+    ok &= report(stream_bytes * 10 < full_bytes, "at least 10x fewer bytes on the wire")
+    sys.exit(0 if ok else 1)
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
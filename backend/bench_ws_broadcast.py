@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Single worker, in-process backend; a small queue bound so slow consumers hit it
+os.environ.setdefault("BROADCAST_BACKEND", "local")
+os.environ.setdefault("WS_SEND_QUEUE_SIZE", "8")
+for var in ("SUPABASE_URL", "SUPABASE_ANON_KEY", "SUPABASE_SERVICE_ROLE_KEY"):
+    os.environ.setdefault(var, "http://localhost" if var == "SUPABASE_URL" else "bench")
+
+import logging
+logging.disable(logging.WARNING)
+
+from app.main import ConnectionManager
+from app.services.broadcast import LocalBroadcast
+from app.services.typing_stream import TYPING_DEBOUNCE_MS, apply_diff
+
+SESSIONS = 4
+SOCKETS_PER_SESSION = 300
+SLOW_PER_SESSION = 3
+MESSAGES = 20
+TYPING_BURST = 200      # keystrokes per session, one every 2ms
+FAST_SEND = 0.0002      # seconds per frame for a healthy browser
+SLOW_SEND = 0.1         # seconds per frame for a stalled browser
+
+
+class FakeSocket:
+    def __init__(self, delay):
+        self.delay = delay
+        self.received = {}
+        self.typing = 0
+        self.typing_bytes = 0
+        # What a viewer shows: keyframes set it, diffs apply only on top of version `base`
+        self.typed = None
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        message = json.loads(text)
+        if message["type"] in ("candidate_typing", "candidate_typing_diff"):
+            self.typing += 1
+            self.typing_bytes += len(text)
+            self.apply_typing(message)
+        else:
+            self.received[message["data"]["i"]] = time.perf_counter()
+
+    def apply_typing(self, message):
+        data = message["data"]
+        if message["type"] == "candidate_typing":
+            self.typed = (data["v"], data["text"])
+        elif self.typed and self.typed[0] == data["base"]:
+            self.typed = (data["v"], apply_diff(self.typed[1], data["p"], data["d"], data["i"]))
+
+    async def send_json(self, message):
+        await self.send_text(json.dumps(message))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def make_sockets():
+    return {f"s{s}": [FakeSocket(SLOW_SEND if i < SLOW_PER_SESSION else FAST_SEND * random.uniform(0.5, 1.5))
+                      for i in range(SOCKETS_PER_SESSION)] for s in range(SESSIONS)}
+
+
+def latencies(sockets, sent_at):
+    samples = []
+    for session_sockets in sockets.values():
+        for socket in session_sockets[SLOW_PER_SESSION:]:
+            samples += [socket.received[i] - sent_at[i] for i in socket.received]
+    samples.sort()
+    return samples
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000 if samples else float("nan")
+
+
+async def run_serial():
+    """The previous broadcast: await each send_json in turn"""
+    sockets = make_sockets()
+    sent_at = {}
+
+    async def broadcast(session_id, message):
+        for socket in sockets[session_id]:
+            await socket.send_json(message)
+
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        sent_at[i] = time.perf_counter()
+        await asyncio.gather(*(broadcast(s, {"type": "swarm_token", "data": {"i": i}}) for s in sockets))
+    return sockets, sent_at, time.perf_counter() - start
+
+
+async def run_queued():
+    sockets = make_sockets()
+    manager = ConnectionManager(backend=LocalBroadcast())
+    for session_id, session_sockets in sockets.items():
+        for socket in session_sockets:
+            await manager.connect(socket, session_id)
+
+    async def typist(session_id):
+        for n in range(TYPING_BURST):
+            manager.typing_stream(session_id).update("x" * n)
+            await asyncio.sleep(0.002)
+
+    sent_at = {}
+    start = time.perf_counter()
+    typists = [asyncio.create_task(typist(s)) for s in sockets]
+    for i in range(MESSAGES):
+        sent_at[i] = time.perf_counter()
+        await asyncio.gather(*(manager.broadcast({"type": "swarm_token", "data": {"i": i}}, s) for s in sockets))
+        await asyncio.sleep(0.005)
+    await asyncio.gather(*typists)
+    # Let healthy sockets drain their queues
+    while any(o.pending for c in manager.active_connections.values() for o in c.values() if o.websocket.delay < SLOW_SEND):
+        await asyncio.sleep(0.005)
+    # Let the last typing frame out of its debounce window, then drain it
+    await asyncio.sleep(TYPING_DEBOUNCE_MS / 1000 + 0.05)
+    while any(o.pending for c in manager.active_connections.values() for o in c.values() if o.websocket.delay < SLOW_SEND):
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    stats = manager.stats()
+    for session_id, session_sockets in sockets.items():
+        for socket in session_sockets:
+            await manager.disconnect(socket, session_id)
+    return sockets, sent_at, elapsed, stats
+
+
+async def main():
+    total = SESSIONS * SOCKETS_PER_SESSION
+    print(f"{SESSIONS} sessions x {SOCKETS_PER_SESSION} sockets ({SLOW_PER_SESSION} slow per session), "
+          f"{MESSAGES} broadcasts per session")
+
+    sockets, sent_at, elapsed = await run_serial()
+    serial = latencies(sockets, sent_at)
+    print(f"\n[serial send_json]  {elapsed * 1000:.0f}ms total, healthy-socket latency "
+          f"p50 {percentile(serial, 0.5):.1f}ms  p99 {percentile(serial, 0.99):.1f}ms")
+
+    sockets, sent_at, elapsed, stats = await run_queued()
+    queued = latencies(sockets, sent_at)
+    dropped = sum(1 for s in sockets.values() for socket in s if socket.closed_with == 1013)
+    typing_frames = sum(socket.typing for s in sockets.values() for socket in s[SLOW_PER_SESSION:])
+    typing_per_socket = typing_frames / (total - SESSIONS * SLOW_PER_SESSION)
+    typing_bytes = sum(socket.typing_bytes for s in sockets.values() for socket in s[SLOW_PER_SESSION:])
+    full_text_bytes = sum(len(json.dumps({"type": "candidate_typing", "data": {"text": "x" * n}}))
+                          for n in range(TYPING_BURST)) * (total - SESSIONS * SLOW_PER_SESSION)
+    final_text = "x" * (TYPING_BURST - 1)
+    rebuilt = all(socket.typed and socket.typed[1] == final_text for s in sockets.values() for socket in s[SLOW_PER_SESSION:])
+    diffs = sum(t["frames_published"] - t["keyframes"] for t in stats["typing"].values())
+    print(f"[outbound queues]    {elapsed * 1000:.0f}ms total, healthy-socket latency "
+          f"p50 {percentile(queued, 0.5):.1f}ms  p99 {percentile(queued, 0.99):.1f}ms")
+    print(f"                     slow consumers dropped: {dropped}/{SESSIONS * SLOW_PER_SESSION}, "
+          f"typing frames per socket: {typing_per_socket:.0f} of {TYPING_BURST} keystrokes "
+          f"({diffs // SESSIONS} diffs per session), coalesced: {stats['coalesced_frames']}")
+    print(f"                     typing bytes to healthy sockets: {typing_bytes / 1024:.0f}KB "
+          f"(full text per keystroke: {full_text_bytes / 1024:.0f}KB), final text rebuilt: {rebuilt}")
+
+    complete = all(len(socket.received) == MESSAGES for s in sockets.values() for socket in s[SLOW_PER_SESSION:])
+    ok = (complete and percentile(queued, 0.99) < percentile(serial, 0.5) and typing_per_socket < TYPING_BURST
+          and rebuilt and typing_bytes < full_text_bytes)
+    print("\n✅ healthy sockets no longer wait on slow ones" if ok
+          else "\n❌ queued broadcast did not isolate slow consumers")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""
+Recover the strategy success-rate snapshot (and optionally the log's indexes)
+from the log archive and event log segments.
+
+    python rebuild_strategy_stats.py             # strategy_stats.json only
+    python rebuild_strategy_stats.py --indexes   # also session indexes + feedback.jsonl
+
+Restart the API workers afterwards so they reload from the rebuilt files.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.event_log import get_event_log
+from app.utils.log_archive import LogArchive
+from app.utils.strategy_stats import StrategyStatsProjector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--indexes", action="store_true", help="also rebuild session indexes and feedback.jsonl")
+    args = parser.parse_args()
+
+    events = get_event_log()
+    print(f"Event log: {events.directory}")
+    if args.indexes:
+        start = time.perf_counter()
+        archive = LogArchive(events)
+        events.rebuild_indexes(archive.iter_events(), archive.archived_pointers())
+        print(f"✅ Session indexes and feedback.jsonl rebuilt in {time.perf_counter() - start:.1f}s")
+
+    projector = StrategyStatsProjector(events)
+    before = projector.get_stats()
+    start = time.perf_counter()
+    projector.rebuild()
+    after = projector.get_stats()
+    print(f"✅ {projector.snapshot_path} rebuilt in {time.perf_counter() - start:.1f}s "
+          f"({len(after)} strategies, feedback offset {projector.offset})")
+
+    for strategy_id in sorted(set(before) | set(after)):
+        old, new = before.get(strategy_id, {}), after.get(strategy_id, {})
+        if old.get("total_uses") != new.get("total_uses") or old.get("good_ratings") != new.get("good_ratings"):
+            print(f"   {strategy_id}: {old.get('total_uses', 0)} -> {new.get('total_uses', 0)} uses, "
+                  f"success rate {old.get('success_rate', 0.5):.2f} -> {new.get('success_rate', 0.5):.2f}")
+
+
+if __name__ == "__main__":
+    main()
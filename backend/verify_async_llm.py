@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.llm.llm_router import LLMRouter
+from app.engine.intelligence.dispatch import IntelligenceDispatch
+
+SESSIONS = 50
+TURNS_PER_SESSION = 3
+PROVIDER_LATENCY = 0.2  # seconds per simulated LLM round-trip
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeAsyncProvider:
+    """Local provider with a native async API (like HuggingFaceClient / GeminiClient)."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(PROVIDER_LATENCY)
+        finally:
+            self.in_flight -= 1
+        return FakeResponse(json.dumps({"thought": "ok", "action_type": "speak", "action_data": {"text": prompt[-20:]}}))
+
+    def generate_content(self, prompt, generation_config=None):
+        raise RuntimeError("sync path must not be used by async callers")
+
+
+class FakeBlockingProvider:
+    """Local provider with only a blocking API; must be routed through the LLM executor."""
+
+    def generate_content(self, prompt, generation_config=None):
+        time.sleep(PROVIDER_LATENCY)
+        return FakeResponse(json.dumps({"thought": "ok", "action_type": "speak", "action_data": {"text": "blocking"}}))
+
+
+async def run_session(dispatch: IntelligenceDispatch, session_no: int, progress: list):
+    for turn in range(TURNS_PER_SESSION):
+        await dispatch.generate_structured(f"session {session_no} turn {turn}")
+        progress[session_no] += 1
+
+
+async def heartbeat(stop: asyncio.Event, gaps: list):
+    """Measures how long the event loop is blocked between ticks."""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def run_scenario(label: str, provider) -> bool:
+    router = LLMRouter(clients=[{"client": provider, "name": label, "provider": "Local Fake", "priority": 1}])
+    dispatch = IntelligenceDispatch(router=router)
+    progress = [0] * SESSIONS
+    gaps = []
+    stop = asyncio.Event()
+
+    beat = asyncio.create_task(heartbeat(stop, gaps))
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(dispatch, i, progress) for i in range(SESSIONS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+
+    serial_time = SESSIONS * TURNS_PER_SESSION * PROVIDER_LATENCY
+    max_gap = max(gaps) if gaps else 0.0
+    print(f"\n[{label}] {SESSIONS} sessions x {TURNS_PER_SESSION} turns")
+    print(f"  wall clock: {elapsed:.2f}s (serial would be {serial_time:.1f}s)")
+    print(f"  longest event-loop stall: {max_gap * 1000:.1f}ms")
+    if hasattr(provider, "peak_in_flight"):
+        print(f"  peak concurrent provider calls: {provider.peak_in_flight}")
+
+    ok = all(p == TURNS_PER_SESSION for p in progress) and elapsed < serial_time / 5 and max_gap < PROVIDER_LATENCY
+    print("  ✅ sessions progressed in parallel" if ok else "  ❌ sessions were serialized")
+    return ok
+
+
+async def main():
+    print("Verifying non-blocking LLM execution path...")
+    results = [
+        await run_scenario("async-native", FakeAsyncProvider()),
+        await run_scenario("blocking-via-executor", FakeBlockingProvider()),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
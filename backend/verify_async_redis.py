@@ -0,0 +1,109 @@
+import asyncio
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import fakeredis
+except ImportError:
+    print("❌ fakeredis is required for this check (pip install fakeredis)")
+    sys.exit(1)
+
+import app.services.redis_service as redis_service
+from app.services.redis_service import RedisClient, AsyncRedisClient
+from app.services.session_store import SessionStore
+
+# Short reconnect interval so the outage scenario runs quickly
+redis_service.REDIS_RECONNECT_INTERVAL = 0.2
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+async def check_basic_ops(server):
+    client = AsyncRedisClient(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    await client.set("verify:key", {"a": [1, 2]}, expire=60)
+    value = await client.get("verify:key")
+    raw = await client.client.get("verify:key")
+    await client.delete("verify:key")
+    gone = await client.get("verify:key") is None
+    return report(value == {"a": [1, 2]} and raw == '{"a": [1, 2]}' and gone,
+                  "async set/get/delete round-trip, value JSON-encoded once")
+
+
+async def check_pipeline(server):
+    client = AsyncRedisClient(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    pipe = client.pipeline()
+    for i in range(20):
+        pipe.set(f"verify:pipe:{i}", i)
+    pipe.mget([f"verify:pipe:{i}" for i in range(20)])
+    replies = await client.execute(pipe)
+    return report(replies is not None and replies[-1] == [str(i) for i in range(20)],
+                  "21 commands sent as one pipeline")
+
+
+async def check_session_store(server):
+    aclient = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    sclient = fakeredis.FakeRedis(server=server, decode_responses=True)
+    fields = {"current_phase": "System Design", "rounds_completed": 2,
+              "meta:jd_text": "Backend engineer " * 200, "meta:resume_text": "Python developer " * 300}
+    history = [{"role": "candidate", "text": "hello"}, {"role": "interviewer", "text": "tell me about X"}]
+
+    store = SessionStore("verify-async", aclient=aclient)
+    saved = await store.save_async(fields, history)
+    history.append({"role": "candidate", "text": "X is ..."})
+    fields["rounds_completed"] = 3
+    before = store.bytes_written
+    await store.save_async(fields, history)
+    delta = store.bytes_written - before
+
+    async_loaded = await SessionStore.load_async("verify-async", aclient=aclient)
+    sync_loaded = SessionStore.load("verify-async", client=sclient)
+    ok = (saved and async_loaded and sync_loaded
+          and async_loaded[0] == fields and async_loaded[1] == history
+          and sync_loaded[0] == fields and sync_loaded[1] == history)
+    ok = report(ok, "SessionStore async save/load matches the sync format") and ok
+    return report(delta < 200, f"second async save sent only the delta ({delta}B)") and ok
+
+
+async def check_async_reconnect(server):
+    client = AsyncRedisClient(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    server.connected = False
+    failed = not await client.set("verify:reconnect", 1)
+    fast_fail = client.client is None  # within the reconnect interval callers skip Redis
+    server.connected = True
+    await asyncio.sleep(0.25)
+    recovered = await client.set("verify:reconnect", 1) and await client.get("verify:reconnect") == 1
+    return report(failed and fast_fail and recovered,
+                  "async client fails fast while Redis is down and reconnects afterwards")
+
+
+def check_sync_reconnect(server):
+    server.connected = False
+    client = RedisClient(fakeredis.FakeRedis(server=server, decode_responses=True))
+    down = client.client is None
+    server.connected = True
+    time.sleep(0.25)
+    recovered = client.client is not None and client.set("verify:sync", 1) and client.get("verify:sync") == 1
+    return report(down and recovered, "sync client started during an outage reconnects (no permanent dead client)")
+
+
+async def main():
+    server = fakeredis.FakeServer()
+    results = [
+        await check_basic_ops(server),
+        await check_pipeline(server),
+        await check_session_store(server),
+        await check_async_reconnect(server),
+        check_sync_reconnect(server),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
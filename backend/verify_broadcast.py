@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import fakeredis
+except ImportError:
+    print("❌ fakeredis is required for this check (pip install fakeredis)")
+    sys.exit(1)
+
+from app.services.broadcast import RedisBroadcast, LocalBroadcast
+
+
+def report(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return ok
+
+
+class Worker:
+    """One uvicorn worker: a backend plus the messages its local sockets received"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.received = {}
+        backend.bind(self.deliver)
+
+    async def deliver(self, session_id, message):
+        self.received.setdefault(session_id, []).append(message)
+
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def check_cross_worker(server):
+    candidate_worker = Worker(RedisBroadcast(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)))
+    expert_worker = Worker(RedisBroadcast(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)))
+    await candidate_worker.backend.subscribe("s1")
+    await expert_worker.backend.subscribe("s1")
+
+    await candidate_worker.backend.publish("s1", {"type": "candidate_answer", "data": {"text": "hi"}})
+    await expert_worker.backend.publish("s1", {"type": "swarm_response", "data": {"response": "next"}})
+    both = await wait_for(lambda: all(len(w.received.get("s1", [])) == 2 for w in (candidate_worker, expert_worker)))
+    seqs = [m["seq"] for m in expert_worker.received.get("s1", [])]
+    ok = report(both and sorted(seqs) == [1, 2],
+                "messages published on either worker reach sockets on both, with seq 1, 2")
+
+    await expert_worker.backend.unsubscribe("s1")
+    await candidate_worker.backend.publish("s1", {"type": "candidate_answer", "data": {"text": "h"}})
+    await wait_for(lambda: len(candidate_worker.received["s1"]) == 3)
+    await asyncio.sleep(0.1)
+    ok = report(len(expert_worker.received["s1"]) == 2, "unsubscribed worker stops receiving the session") and ok
+
+    for worker in (candidate_worker, expert_worker):
+        await worker.backend.close()
+    return ok, candidate_worker
+
+
+async def check_replay(server):
+    worker = Worker(RedisBroadcast(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), replay_size=5))
+    for i in range(8):
+        await worker.backend.publish("s2", {"type": "swarm_correction", "data": {"text": str(i)}})
+    missed = await worker.backend.replay("s2", 5)
+    capped = await worker.backend.replay("s2", 0)
+    ok = report([m["seq"] for m in missed] == [6, 7, 8], "replay after seq 5 returns 6, 7, 8 in order")
+    return report([m["seq"] for m in capped] == [4, 5, 6, 7, 8], "replay log keeps the last replay_size messages") and ok
+
+
+async def check_local():
+    worker = Worker(LocalBroadcast(replay_size=3))
+    for i in range(4):
+        await worker.backend.publish("s3", {"type": "swarm_response", "data": {"response": str(i)}})
+    missed = await worker.backend.replay("s3", 2)
+    return report([m["seq"] for m in worker.received["s3"]] == [1, 2, 3, 4] and [m["seq"] for m in missed] == [3, 4],
+                  "local backend sequences, delivers and replays in process")
+
+
+async def check_ephemeral(server):
+    worker = Worker(RedisBroadcast(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)))
+    await worker.backend.subscribe("s5")
+    await worker.backend.publish("s5", {"type": "candidate_answer", "data": {"text": "a"}})
+    for i in range(50):
+        await worker.backend.publish("s5", {"type": "swarm_token", "data": {"text": str(i), "index": i}})
+    await worker.backend.publish("s5", {"type": "candidate_typing_diff", "data": {"v": 2, "base": 1}})
+    await worker.backend.publish("s5", {"type": "swarm_response", "data": {}})
+    await wait_for(lambda: len(worker.received.get("s5", [])) == 53)
+    received = worker.received.get("s5", [])
+    logged = await worker.backend.replay("s5", 0)
+    await worker.backend.close()
+    ok = report(len(received) == 53 and [m.get("seq") for m in received if "seq" in m] == [1, 2],
+                "tokens and typing frames are delivered without a seq and don't advance it")
+    return report([m["type"] for m in logged] == ["candidate_answer", "swarm_response"],
+                  "replay log holds only sequenced messages") and ok
+
+
+async def check_epoch(server):
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    worker = Worker(RedisBroadcast(client))
+    first = [await worker.backend.publish("s6", {"type": "swarm_response", "data": {"n": i}}) for i in range(3)]
+    await client.delete("ws_counter:s6", "ws_log:s6")  # counter and log expired
+    second = await worker.backend.publish("s6", {"type": "swarm_response", "data": {"n": 3}})
+    ok = report(second["seq"] == 1 and second["epoch"] != first[-1]["epoch"],
+                "counter that expired restarts under a new epoch")
+    stale = await worker.backend.replay("s6", first[-1]["seq"], first[-1]["epoch"])
+    current = await worker.backend.replay("s6", 1, second["epoch"])
+    ok = report([m["seq"] for m in stale] == [1] and current == [],
+                "client holding an old epoch gets the whole log; one on the current epoch only what it missed") and ok
+
+    local = Worker(LocalBroadcast(max_sessions=1))
+    before = await local.backend.publish("s7", {"type": "swarm_response", "data": {}})
+    await local.backend.publish("s8", {"type": "swarm_response", "data": {}})
+    after = await local.backend.publish("s7", {"type": "swarm_response", "data": {}})
+    return report(after["seq"] == 1 and after["epoch"] != before["epoch"],
+                  "local backend starts a new epoch for a session it dropped") and ok
+
+
+async def check_redis_down(server):
+    worker = Worker(RedisBroadcast(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)))
+    server.connected = False
+    await worker.backend.publish("s4", {"type": "swarm_response", "data": {}})
+    server.connected = True
+    delivered = worker.received.get("s4", [])
+    return report(len(delivered) == 1 and "seq" not in delivered[0],
+                  "Redis down: message still delivered to local sockets (unsequenced)")
+
+
+async def main():
+    server = fakeredis.FakeServer()
+    cross_ok, _ = await check_cross_worker(server)
+    results = [cross_ok, await check_replay(server), await check_local(), await check_ephemeral(server),
+               await check_epoch(server), await check_redis_down(server)]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
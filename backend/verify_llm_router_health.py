@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.llm.llm_router import LLMRouter
+from app.llm.response_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeClient:
+    """Local provider with scripted latency; fails while `failing` is set."""
+
+    def __init__(self, name: str, latency: float, failing: bool = False, fail_latency: float = None):
+        self.name = name
+        self.latency = latency
+        self.failing = failing
+        self.fail_latency = latency if fail_latency is None else fail_latency
+        self.calls = 0
+        self.slow_every = 0  # every Nth call takes slow_latency (tail latency)
+        self.slow_latency = 0.0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls += 1
+        if self.failing:
+            await asyncio.sleep(self.fail_latency)
+            raise RuntimeError(f"{self.name} rate limited")
+        delay = self.latency
+        if self.slow_every and self.calls % self.slow_every == 0:
+            delay = self.slow_latency
+        await asyncio.sleep(delay)
+        return FakeResponse(f"{self.name}: {prompt}")
+
+
+def build_router(*clients) -> LLMRouter:
+    entries = [
+        {"client": c, "name": c.name, "provider": "Local Fake", "priority": i + 1}
+        for i, c in enumerate(clients)
+    ]
+    # Caching would hide provider behaviour; the harness measures routing only
+    router = LLMRouter(clients=entries, cache=ResponseCache(use_redis=False, enabled=False))
+    for health in router.health.values():
+        health.cooldown_seconds = 0.5
+    return router
+
+
+async def timed(router: LLMRouter, prompt: str):
+    start = time.perf_counter()
+    response = await router.generate_content_async(prompt)
+    return time.perf_counter() - start, response.text
+
+
+async def scenario_circuit_breaker() -> bool:
+    print("\n[1] Failing primary trips its breaker, then recovers through a half-open probe")
+    primary = FakeClient("primary", latency=0.02, failing=True, fail_latency=0.3)
+    backup = FakeClient("backup", latency=0.05)
+    router = build_router(primary, backup)
+    # Pin the primary first so the breaker, not error-rate reordering, is what is measured
+    router.health["backup"].error_ewma = 0.9
+
+    for i in range(5):
+        await timed(router, f"q{i}")
+    tripped_calls = primary.calls
+    elapsed, _ = await timed(router, "after-trip")
+    print(f"  primary attempts before skip: {tripped_calls}, call latency with open circuit: {elapsed * 1000:.0f}ms")
+    ok = tripped_calls == 3 and elapsed < 0.2 and router.health["primary"].state == "open"
+
+    primary.failing = False
+    await asyncio.sleep(0.6)
+    await timed(router, "probe")
+    state = router.health["primary"].state
+    print(f"  after cooldown + probe: primary state = {state}")
+    ok = ok and state == "closed"
+    print("  ✅ breaker opened and closed as expected" if ok else "  ❌ breaker misbehaved")
+    return ok
+
+
+async def scenario_reordering() -> bool:
+    print("\n[2] Slow primary is demoted once latency history exists")
+    slow = FakeClient("slow-primary", latency=0.15)
+    fast = FakeClient("fast-backup", latency=0.02)
+    router = build_router(slow, fast)
+    # Give both providers a latency history
+    for _ in range(6):
+        await router._call_async(router.clients[0], "warmup", None)
+        await router._call_async(router.clients[1], "warmup", None)
+
+    status = router.get_provider_status()
+    order = [p["name"] for p in status["providers"]]
+    _, text = await timed(router, "routed")
+    print(f"  routing order: {order}, answered by: {text.split(':')[0]}")
+    ok = order[0] == "fast-backup" and text.startswith("fast-backup")
+    print("  ✅ providers re-ranked by latency" if ok else "  ❌ static order still used")
+    return ok
+
+
+async def scenario_hedging() -> bool:
+    print("\n[3] Hedged requests cut tail latency")
+    results = {}
+    for hedging in (False, True):
+        primary = FakeClient("primary", latency=0.02)
+        primary.slow_every, primary.slow_latency = 25, 0.5
+        backup = FakeClient("backup", latency=0.04)
+        router = build_router(primary, backup)
+        # Pin the primary first so hedging, not reordering, is what is measured
+        router.health["backup"].error_ewma = 0.9
+        router.hedging = hedging
+
+        latencies = []
+        for i in range(100):
+            elapsed, _ = await timed(router, f"q{i}")
+            latencies.append(elapsed)
+        latencies.sort()
+        results[hedging] = latencies[-1]
+        print(f"  hedging={hedging}: p50 {latencies[len(latencies) // 2] * 1000:.0f}ms, "
+              f"max {latencies[-1] * 1000:.0f}ms, hedges fired {router.hedges_fired}, won by backup {router.hedges_won}")
+
+    ok = results[True] < results[False] / 2
+    print("  ✅ hedging removed the slow tail" if ok else "  ❌ hedging did not help")
+    return ok
+
+
+async def main():
+    print("Verifying health-aware LLM routing...")
+    results = [
+        await scenario_circuit_breaker(),
+        await scenario_reordering(),
+        await scenario_hedging(),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
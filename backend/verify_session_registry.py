@@ -0,0 +1,161 @@
+import asyncio
+import os
+import sys
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import fakeredis
+except ImportError:
+    print("❌ fakeredis is required for this check (pip install fakeredis)")
+    sys.exit(1)
+
+from app.core.session_registry import SessionRegistry, lease_key
+
+
+class FakeSession:
+    """Stands in for SwarmOrchestrator: state is a counter persisted to Redis on save_state_async()"""
+
+    def __init__(self, session_id, client, turns=0, registry=None):
+        self.session_id = session_id
+        self.client = client
+        self.turns = turns
+        self.registry = registry
+
+    async def save_state_async(self):
+        # Fenced like SwarmOrchestrator.save_state_async
+        if self.registry and not await self.registry.owns(self.session_id):
+            return
+        await self.client.set(f"fake_state:{self.session_id}", self.turns)
+
+    def memory_footprint(self):
+        return 1000 + self.turns * 100
+
+    @classmethod
+    def loader(cls, client):
+        async def load(session_id):
+            turns = await client.get(f"fake_state:{session_id}")
+            return cls(session_id, client, int(turns)) if turns is not None else None
+        return load
+
+
+def worker(server, name, **kwargs):
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    return SessionRegistry(client=client, worker_id=name, **kwargs), client
+
+
+async def check_bounds(server):
+    registry, client = worker(server, "w-bounds", max_sessions=3, idle_ttl=0.3)
+    for i in range(5):
+        await registry.put(FakeSession(f"lru{i}", client, turns=i))
+    lru_ok = len(registry) == 3 and "lru0" not in registry and await client.get("fake_state:lru0") == "0"
+    lru_ok = lru_ok and await client.get(lease_key("lru0")) is None and await client.get(lease_key("lru4")) == "w-bounds"
+    print(f"{'✅' if lru_ok else '❌'} LRU bound: 3 of 5 sessions kept, evicted ones flushed and released")
+
+    await asyncio.sleep(0.4)
+    await registry.tick()
+    idle_ok = len(registry) == 0 and await client.get("fake_state:lru4") == "4"
+    print(f"{'✅' if idle_ok else '❌'} idle sessions flushed to Redis and evicted")
+    return lru_ok and idle_ok
+
+
+async def check_handoff(server):
+    owner, owner_client = worker(server, "w-owner", renew_interval=0.05)
+    other, other_client = worker(server, "w-other", renew_interval=0.05, handoff_timeout=2)
+    session = FakeSession("live", owner_client)
+    await owner.put(session)
+    session.turns = 7  # state the owner hasn't flushed yet
+
+    owner.start_sweeper()
+    started = time.perf_counter()
+    taken = await other.acquire("live", FakeSession.loader(other_client))
+    elapsed = time.perf_counter() - started
+    owner._sweeper.cancel()
+
+    ok = (taken is not None and taken.turns == 7 and "live" not in owner
+          and await other_client.get(lease_key("live")) == "w-other")
+    print(f"{'✅' if ok else '❌'} handoff: owner flushed and released, other worker loaded fresh state "
+          f"({elapsed * 1000:.0f}ms)")
+    return ok
+
+
+async def check_takeover(server):
+    stuck, stuck_client = worker(server, "w-stuck")
+    rescuer, rescuer_client = worker(server, "w-rescuer", handoff_timeout=0.3)
+    await stuck.put(FakeSession("orphan", stuck_client, turns=3))
+    await stuck["orphan"].save_state_async()
+
+    taken = await rescuer.acquire("orphan", FakeSession.loader(rescuer_client))
+    await stuck.tick()  # the unresponsive owner finally wakes up
+    ok = (taken is not None and rescuer.stats()["counters"]["forced_takeovers"] == 1
+          and "orphan" not in stuck and stuck.stats()["counters"]["lost_ownership"] == 1)
+    print(f"{'✅' if ok else '❌'} unresponsive owner: lease taken over, old owner drops its copy")
+    return ok
+
+
+async def check_turn_in_flight(server):
+    owner, owner_client = worker(server, "w-busy", renew_interval=0.05)
+    other, other_client = worker(server, "w-waiting", renew_interval=0.05, handoff_timeout=0.3)
+    session = FakeSession("busy", owner_client, turns=1, registry=owner)
+    await owner.put(session)
+    await session.save_state_async()
+
+    owner.start_sweeper()
+    with owner.in_turn("busy"):
+        # Handoff requested mid-turn: the owner keeps the session until the turn ends,
+        # and the requester (taking over after its timeout) must not be overwritten
+        taken = await other.acquire("busy", FakeSession.loader(other_client))
+        kept = "busy" in owner
+        taken.turns = 5
+        await other_client.set("fake_state:busy", 5)
+        session.turns = 2
+        await session.save_state_async()  # the stale copy finishes its turn
+    owner._sweeper.cancel()
+
+    ok = kept and await owner_client.get("fake_state:busy") == "5" and not await owner.owns("busy")
+    print(f"{'✅' if ok else '❌'} turn in flight: not handed over mid-turn; the stale copy's save is refused after a takeover")
+    return ok
+
+
+async def check_redis_down(server):
+    registry, client = worker(server, "w-outage", handoff_timeout=5)
+    await registry.put(FakeSession("held", client))
+    server.connected = False
+    started = time.perf_counter()
+    taken = await registry.acquire("new", lambda session_id: FakeSession(session_id, client))
+    owns = await registry.owns("held")
+    elapsed = time.perf_counter() - started
+    server.connected = True
+    ok = taken is not None and owns and elapsed < 1 and registry.stats()["ownership"] == "local_only"
+    print(f"{'✅' if ok else '❌'} Redis down: sessions acquired with local-only ownership ({elapsed * 1000:.0f}ms)")
+    return ok
+
+
+async def check_metrics(server):
+    registry, client = worker(server, "w-metrics")
+    for i in range(4):
+        await registry.put(FakeSession(f"m{i}", client, turns=i))
+    stats = registry.stats()
+    ok = stats["sessions"] == 4 and stats["approx_bytes_total"] == 4000 + 600 and len(stats["per_session"]) == 4
+    print(f"{'✅' if ok else '❌'} memory metrics: {stats['approx_bytes_per_session']}B/session, "
+          f"{stats['approx_bytes_total']}B total")
+    return ok
+
+
+async def main():
+    server = fakeredis.FakeServer()
+    results = [
+        await check_bounds(server),
+        await check_handoff(server),
+        await check_takeover(server),
+        await check_turn_in_flight(server),
+        await check_redis_down(server),
+        await check_metrics(server),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -49,6 +49,9 @@ export default function CandidateSelector({
   const [loading, setLoading] = useState(false)
   const [positionTitle, setPositionTitle] = useState('')
   const [detailCandidateId, setDetailCandidateId] = useState<string | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [totalMatches, setTotalMatches] = useState<number | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   // Extract tenant from URL for RBAC header
   const params = typeof window !== 'undefined' ? window.location.pathname.split('/') : []
@@ -59,20 +62,48 @@ export default function CandidateSelector({
     [candidates, detailCandidateId]
   )
 
+  // Candidates are keyset-paginated server-side; the first page also carries the total
+  const fetchCandidatePage = (posId: string, cursor?: string | null) => {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '?with_total=true'
+    return fetch(apiUrl(`api/positions/${posId}/candidates${query}`), {
+      headers: getHeaders(userId || undefined)
+    }).then(res => res.json())
+  }
+
+  const loadMoreCandidates = () => {
+    if (!positionId || !nextCursor || loadingMore) return
+    setLoadingMore(true)
+    fetchCandidatePage(positionId, nextCursor)
+      .then(data => {
+        const pageCandidates: Candidate[] = data.candidates || []
+        setCandidates(prev => [...prev, ...pageCandidates])
+        setNextCursor(data.next_cursor || null)
+        setLoadingMore(false)
+        if (pageCandidates.some(c => c.status === 'pending')) {
+          requestAsyncScoring(pageCandidates, positionId)
+        }
+      })
+      .catch(err => {
+        console.error('Error loading more candidates:', err)
+        setLoadingMore(false)
+      })
+  }
+
   useEffect(() => {
     if (!positionId) {
       setCandidates([])
+      setNextCursor(null)
+      setTotalMatches(null)
       return
     }
 
     setLoading(true)
-    fetch(apiUrl(`api/positions/${positionId}/candidates`), {
-      headers: getHeaders(userId || undefined)
-    })
-      .then(res => res.json())
+    fetchCandidatePage(positionId)
       .then(data => {
         const fetchedCandidates = data.candidates || []
         setCandidates(fetchedCandidates)
+        setNextCursor(data.next_cursor || null)
+        setTotalMatches(typeof data.total === 'number' ? data.total : null)
         setPositionTitle(data.position_title || '')
         setLoading(false)
 
@@ -110,7 +141,7 @@ export default function CandidateSelector({
           fetch(apiUrl(`api/candidates/${candidate.id}/score`), {
             method: 'POST',
             headers: getHeaders(userId || undefined),
-            body: JSON.stringify({ jd_text: jdText })
+            body: JSON.stringify({ jd_text: jdText, position_id: posId })
           })
             .then(res => res.json())
             .then(scoreData => {
@@ -199,7 +230,7 @@ export default function CandidateSelector({
             </button>
           )}
           <span className="text-[10px] font-bold text-zinc-400 bg-zinc-100 px-2 py-0.5 rounded-md border border-zinc-200 uppercase">
-            {candidates.length} Match{candidates.length !== 1 ? 'es' : ''}
+            {totalMatches ?? candidates.length} Match{(totalMatches ?? candidates.length) !== 1 ? 'es' : ''}
           </span>
         </div>
       </div>
@@ -288,6 +319,15 @@ export default function CandidateSelector({
               )}
             </button>
           ))}
+          {nextCursor && (
+            <button
+              onClick={loadMoreCandidates}
+              disabled={loadingMore}
+              className="w-full py-2 text-[11px] font-bold uppercase tracking-wider text-zinc-500 hover:text-[#FF6B35] border border-dashed border-zinc-200 rounded-xl disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more candidates'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -26,6 +26,10 @@ export default function CandidateView({ sessionId, language }: CandidateViewProp
   const router = useRouter()
   const [ws, setWs] = useState<WebSocket | null>(null)
   const wsRef = useRef<WebSocket | null>(null)
+  // seq of the last broadcast applied; sent on reconnect so the server replays what we missed
+  const lastSeqRef = useRef<number | null>(null)
+  // Epoch of lastSeqRef; the server restarts seq under a new epoch
+  const epochRef = useRef<string | null>(null)
   const [currentQuestion, setCurrentQuestion] = useState<string>('')
   const [questionNumber, setQuestionNumber] = useState(1)
   const [progress, setProgress] = useState({
@@ -72,18 +76,37 @@ export default function CandidateView({ sessionId, language }: CandidateViewProp
   useEffect(() => {
     if (!sessionId) return
 
+    let closed = false
+
     const connect = () => {
       setConnectionStatus('connecting')
-      const websocket = new WebSocket(wsUrl(`ws/swarm/${sessionId}`))
+      const query = lastSeqRef.current !== null
+        ? `?last_seq=${lastSeqRef.current}&epoch=${epochRef.current}`
+        : ''
+      const websocket = new WebSocket(wsUrl(`ws/swarm/${sessionId}${query}`))
       wsRef.current = websocket
 
       websocket.onopen = () => {
         setConnectionStatus('connected')
       }
 
+      websocket.onclose = () => {
+        if (closed) return
+        setConnectionStatus('disconnected')
+        setTimeout(connect, 2000)
+      }
+
       websocket.onmessage = (event) => {
         try {
           const message = JSON.parse(event.data)
+          if (typeof message.seq === 'number') {
+            if (message.epoch !== epochRef.current) {
+              epochRef.current = message.epoch
+              lastSeqRef.current = null
+            }
+            if (lastSeqRef.current !== null && message.seq <= lastSeqRef.current) return
+            lastSeqRef.current = message.seq
+          }
           if (message.type === 'greeting') {
             setCurrentQuestion(message.data?.text || '')
             setQuestionNumber(1)
@@ -91,6 +114,17 @@ export default function CandidateView({ sessionId, language }: CandidateViewProp
             return
           }
 
+          if (message.type === 'swarm_token') {
+            const chunk = message.data?.text || ''
+            setCurrentQuestion(prev => (message.data?.index === 0 ? chunk : prev + chunk))
+            return
+          }
+
+          if (message.type === 'swarm_correction') {
+            setCurrentQuestion(message.data?.text || '')
+            return
+          }
+
           if (message.type === 'swarm_response') {
             setIsSubmitting(false)
             const data = message.data || {}
@@ -115,7 +149,10 @@ export default function CandidateView({ sessionId, language }: CandidateViewProp
     }
 
     connect()
-    return () => wsRef.current?.close()
+    return () => {
+      closed = true
+      wsRef.current?.close()
+    }
   }, [sessionId])
 
   const triggerSwarmPulse = (agents: string[]) => {
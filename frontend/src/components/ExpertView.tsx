@@ -40,12 +40,21 @@ export default function ExpertView({ sessionId, language }: ExpertViewProps) {
   const [isEndingInterview, setIsEndingInterview] = useState(false)
   const [selectedAgentForProof, setSelectedAgentForProof] = useState<string | null>(null)
   const wsRef = useRef<WebSocket | null>(null)
+  // seq of the last broadcast applied; sent on reconnect so the server replays what we missed
+  const lastSeqRef = useRef<number | null>(null)
+  // Epoch of lastSeqRef; the server restarts seq under a new epoch
+  const epochRef = useRef<string | null>(null)
+  // Live typing: full-text keyframes set it, diffs apply only on top of version `base`
+  const typingRef = useRef<{ v: number; text: string } | null>(null)
 
   useEffect(() => {
     if (!sessionId) return
 
     const connect = () => {
-      const websocket = new WebSocket(wsUrl(`ws/swarm/${sessionId}`))
+      const query = lastSeqRef.current !== null
+        ? `?last_seq=${lastSeqRef.current}&epoch=${epochRef.current}`
+        : ''
+      const websocket = new WebSocket(wsUrl(`ws/swarm/${sessionId}${query}`))
       wsRef.current = websocket
 
       websocket.onopen = () => setConnectionStatus('connected')
@@ -53,6 +62,14 @@ export default function ExpertView({ sessionId, language }: ExpertViewProps) {
       websocket.onmessage = (event) => {
         try {
           const message = JSON.parse(event.data)
+          if (typeof message.seq === 'number') {
+            if (message.epoch !== epochRef.current) {
+              epochRef.current = message.epoch
+              lastSeqRef.current = null
+            }
+            if (lastSeqRef.current !== null && message.seq <= lastSeqRef.current) return
+            lastSeqRef.current = message.seq
+          }
           if (message.type === 'greeting') {
             setCurrentQuestion(message.data?.text || '')
             triggerSwarmPulse(['Executioner', 'Guardian'])
@@ -60,12 +77,26 @@ export default function ExpertView({ sessionId, language }: ExpertViewProps) {
           }
 
           if (message.type === 'candidate_answer') {
+            typingRef.current = null
             setCandidateAnswer(message.data?.text || '')
             return
           }
 
           if (message.type === 'candidate_typing') {
-            setCandidateAnswer(message.data?.text || '')
+            const text = message.data?.text || ''
+            typingRef.current = typeof message.data?.v === 'number' ? { v: message.data.v, text } : null
+            setCandidateAnswer(text)
+            return
+          }
+
+          if (message.type === 'candidate_typing_diff') {
+            const { v, base, p, d, i } = message.data || {}
+            const current = typingRef.current
+            // Missed a frame: wait for the next keyframe
+            if (!current || current.v !== base) return
+            const text = current.text.slice(0, p) + (i || '') + current.text.slice(p + d)
+            typingRef.current = { v, text }
+            setCandidateAnswer(text)
             return
           }
 
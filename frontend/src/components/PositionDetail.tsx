@@ -85,11 +85,11 @@ export default function PositionDetail({
     setLoading(true)
     Promise.all([
       fetch(apiUrl(`api/positions/${positionId}`)).then(res => res.json()),
-      fetch(apiUrl(`api/positions/${positionId}/candidates`)).then(res => res.json()).catch(() => ({ candidates: [] }))
+      fetch(apiUrl(`api/positions/${positionId}/candidates?limit=1&with_total=true`)).then(res => res.json()).catch(() => ({ candidates: [] }))
     ])
       .then(([positionData, candidatesData]) => {
         setPosition(positionData)
-        setCandidateCount(candidatesData.candidates?.length || 0)
+        setCandidateCount(candidatesData.total ?? candidatesData.candidates?.length ?? 0)
         setEditTitle(positionData.title || '')
         setEditStatus(positionData.status || 'open')
         setEditJdText(positionData.jd_text || '')
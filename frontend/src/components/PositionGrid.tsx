@@ -112,11 +112,10 @@ export default function PositionGrid({
       const counts: Record<string, number> = {}
       for (const position of positions) {
         try {
-          const res = await fetch(apiUrl(`api/positions/${position.id}/candidates`))
+          // Only count candidates with meaningful match (score >= 30%); counted server-side
+          const res = await fetch(apiUrl(`api/positions/${position.id}/candidates?min_score=30&limit=1&with_total=true`))
           const data = await res.json()
-          // Only count candidates with meaningful match (score >= 30%)
-          const matchedCount = data.candidates?.filter((c: { match_score: number }) => c.match_score >= 30).length || 0
-          counts[position.id] = matchedCount
+          counts[position.id] = data.total || 0
         } catch {
           counts[position.id] = 0
         }
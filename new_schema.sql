@@ -200,6 +200,9 @@ CREATE TRIGGER update_organizations_updated_at BEFORE UPDATE ON public.organizat
 CREATE TRIGGER update_profiles_updated_at BEFORE UPDATE ON public.profiles FOR EACH ROW EXECUTE PROCEDURE update_updated_at_column();
 CREATE TRIGGER update_requirements_updated_at BEFORE UPDATE ON public.requirements FOR EACH ROW EXECUTE PROCEDURE update_updated_at_column();
 CREATE TRIGGER update_interactions_updated_at BEFORE UPDATE ON public.interactions FOR EACH ROW EXECUTE PROCEDURE update_updated_at_column();
+-- PromptService polls prompt_templates by updated_at watermark, so edits must bump it
+CREATE TRIGGER update_prompt_templates_updated_at BEFORE UPDATE ON public.prompt_templates FOR EACH ROW EXECUTE PROCEDURE update_updated_at_column();
+CREATE INDEX IF NOT EXISTS idx_prompt_templates_updated_at ON public.prompt_templates(updated_at);
 -- 12. AUTOMATIC PROFILE CREATION
 CREATE OR REPLACE FUNCTION public.handle_new_user()
 RETURNS TRIGGER AS $$